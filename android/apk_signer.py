@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+"""
+Firma APK Signature Scheme v2/v3 en Python puro para TheCookFlow
+Inserta el APK Signing Block entre las entradas y el directorio central sin
+tocar las entradas: solo se reescriben el bloque, el directorio central y
+el EOCD al final del archivo. Si el artefacto ya estaba firmado, el bloque
+anterior se sustituye.
+
+El digest de contenido se calcula en chunks de 1 MiB (entradas, directorio
+central y EOCD, como exige el esquema) en varios hilos sobre un mmap del
+archivo: hashlib libera el GIL, así que firmar una release grande escala
+con los núcleos. Leyendo de stdin ("-"), los chunks se digieren según llegan
+por el pipe, en paralelo con el empaquetado. La firma es RSASSA-PKCS1-v1_5
+con SHA-256 (algoritmo 0x0103) implementada con aritmética entera.
+
+La clave se lee de un PEM (clave privada RSA + certificado). Para el
+keystore de generate_keystore.sh:
+    keytool -importkeystore -srckeystore app/thecookflow-release-key.keystore \\
+        -destkeystore release.p12 -deststoretype PKCS12
+    openssl pkcs12 -in release.p12 -nodes -out app/thecookflow-release-key.pem
+Sin PEM se usa una clave de depuración desechable que se genera una vez en
+~/.android/cookflow-debug.pem (como el debug.keystore de Android Studio).
+
+Google Play exige además la firma JAR (v1) en los .aab subidos; aquí solo
+se implementan v2/v3.
+
+Uso:
+    python android/apk_signer.py app-debug.apk -j 0
+    python android/apk_signer.py --key app/thecookflow-release-key.pem app-release.aab
+    python android/apk_signer.py --verify app-debug.apk
+    python android/packager.py --aab - --apk "" | python android/apk_signer.py - -o app-release.aab
+"""
+import argparse
+import base64
+import datetime
+import hashlib
+import mmap
+import os
+import re
+import secrets
+import struct
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bundle_inspector import _find_end_record
+from bundle_writer import _END_RECORD, ZIP64_COUNT_LIMIT, ZIP64_LIMIT
+from tracing import phase
+
+CHUNK_SIZE = 1024 * 1024
+
+APK_SIG_BLOCK_MAGIC = b"APK Sig Block 42"
+APK_SIGNATURE_SCHEME_V2_ID = 0x7109871A
+APK_SIGNATURE_SCHEME_V3_ID = 0xF05368C0
+# Atributo de v2 que impide quitar la firma v3 para degradar a v2
+STRIPPING_PROTECTION_ID = 0xBEEFF00D
+RSA_PKCS1_V1_5_WITH_SHA256 = 0x0103
+# v3 solo lo leen Android 9 (API 28) y posteriores
+V3_MIN_SDK = 28
+V3_MAX_SDK = 0x7FFFFFFF
+
+RELEASE_KEY_PEM = os.path.join("app", "thecookflow-release-key.pem")
+DEBUG_KEY_PEM = os.path.join(os.path.expanduser("~"), ".android", "cookflow-debug.pem")
+
+# DigestInfo DER de SHA-256 (prefijo de EMSA-PKCS1-v1_5)
+_SHA256_DIGEST_INFO = bytes.fromhex("3031300d060960864801650304020105000420")
+_OID_RSA_ENCRYPTION = "1.2.840.113549.1.1.1"
+_OID_SHA256_WITH_RSA = "1.2.840.113549.1.1.11"
+_OID_COMMON_NAME = "2.5.4.3"
+_PEM_BLOCK = re.compile(rb"-----BEGIN ([A-Z ]+)-----(.+?)-----END \1-----", re.S)
+_SMALL_PRIMES = [p for p in range(3, 2000) if all(p % d for d in range(2, int(p ** 0.5) + 1))]
+
+
+class SigningError(Exception):
+    """Artefacto que no se puede firmar o firma inválida"""
+
+
+# --- DER mínimo (certificado X.509, claves PKCS#1/PKCS#8) ---
+
+def _der(tag, content):
+    length = len(content)
+    if length < 0x80:
+        return bytes([tag, length]) + content
+    size = (length.bit_length() + 7) // 8
+    return bytes([tag, 0x80 | size]) + length.to_bytes(size, "big") + content
+
+
+def _der_integer(value):
+    return _der(0x02, value.to_bytes(value.bit_length() // 8 + 1, "big"))
+
+
+def _der_oid(oid):
+    parts = [int(part) for part in oid.split(".")]
+    body = bytearray([parts[0] * 40 + parts[1]])
+    for part in parts[2:]:
+        chunk = [part & 0x7F]
+        part >>= 7
+        while part:
+            chunk.append(0x80 | (part & 0x7F))
+            part >>= 7
+        body += bytes(reversed(chunk))
+    return _der(0x06, bytes(body))
+
+
+def _der_sequence(*items):
+    return _der(0x30, b"".join(items))
+
+
+def _der_time(moment):
+    if moment.year < 2050:
+        return _der(0x17, moment.strftime("%y%m%d%H%M%SZ").encode("ascii"))
+    return _der(0x18, moment.strftime("%Y%m%d%H%M%SZ").encode("ascii"))
+
+
+def _der_items(data):
+    """[(tag, contenido, TLV completo)] de una secuencia de elementos DER"""
+    items = []
+    position = 0
+    while position < len(data):
+        tag = data[position]
+        length = data[position + 1]
+        start = position + 2
+        if length & 0x80:
+            size = length & 0x7F
+            length = int.from_bytes(data[start:start + size], "big")
+            start += size
+        items.append((tag, data[start:start + length], data[position:start + length]))
+        position = start + length
+    return items
+
+
+def _der_content(data):
+    """Contenido del único elemento DER de data"""
+    return _der_items(data)[0][1]
+
+
+class SigningKey:
+    """Clave RSA con su certificado X.509 (DER)"""
+
+    def __init__(self, n, e, d, p, q, certificate):
+        self.n = n
+        self.e = e
+        self.d = d
+        self.p = p
+        self.q = q
+        self.certificate = certificate
+
+    @property
+    def public_key(self):
+        """SubjectPublicKeyInfo DER de la clave"""
+        return _subject_public_key_info(self.n, self.e)
+
+    def sign(self, data):
+        """Firma RSASSA-PKCS1-v1_5 con SHA-256 (con CRT)"""
+        message = _emsa_pkcs1_v1_5(data, (self.n.bit_length() + 7) // 8)
+        m1 = pow(message, self.d % (self.p - 1), self.p)
+        m2 = pow(message, self.d % (self.q - 1), self.q)
+        h = (pow(self.q, -1, self.p) * (m1 - m2)) % self.p
+        return (m2 + h * self.q).to_bytes((self.n.bit_length() + 7) // 8, "big")
+
+    def to_pem(self):
+        """Clave PKCS#1 y certificado en un único PEM"""
+        private_key = _der_sequence(*(_der_integer(value) for value in (
+            0, self.n, self.e, self.d, self.p, self.q, self.d % (self.p - 1),
+            self.d % (self.q - 1), pow(self.q, -1, self.p))))
+        return _pem("RSA PRIVATE KEY", private_key) + _pem("CERTIFICATE", self.certificate)
+
+
+def _pem(label, der):
+    body = base64.encodebytes(der).decode("ascii")
+    return f"-----BEGIN {label}-----\n{body}-----END {label}-----\n"
+
+
+def _subject_public_key_info(n, e):
+    algorithm = _der_sequence(_der_oid(_OID_RSA_ENCRYPTION), _der(0x05, b""))
+    return _der_sequence(algorithm, _der(0x03, b"\0" + _der_sequence(_der_integer(n),
+                                                                      _der_integer(e))))
+
+
+def _emsa_pkcs1_v1_5(data, length):
+    digest_info = _SHA256_DIGEST_INFO + hashlib.sha256(data).digest()
+    padded = b"\x00\x01" + b"\xff" * (length - len(digest_info) - 3) + b"\x00" + digest_info
+    return int.from_bytes(padded, "big")
+
+
+def _is_probable_prime(candidate, rounds=32):
+    """Miller-Rabin tras una criba con primos pequeños"""
+    if any(candidate % prime == 0 for prime in _SMALL_PRIMES):
+        return candidate in _SMALL_PRIMES
+    d = candidate - 1
+    shift = 0
+    while d % 2 == 0:
+        d //= 2
+        shift += 1
+    for _ in range(rounds):
+        x = pow(secrets.randbelow(candidate - 3) + 2, d, candidate)
+        if x in (1, candidate - 1):
+            continue
+        for _ in range(shift - 1):
+            x = pow(x, 2, candidate)
+            if x == candidate - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _random_prime(bits):
+    while True:
+        # Los dos bits altos a 1 garantizan que n = p * q mida bits * 2
+        candidate = secrets.randbits(bits) | (0b11 << (bits - 2)) | 1
+        if _is_probable_prime(candidate):
+            return candidate
+
+
+def generate_signing_key(bits=2048, common_name="TheCookFlow Debug", years=30):
+    """Clave RSA nueva con un certificado autofirmado (para pruebas locales)"""
+    e = 65537
+    while True:
+        p, q = _random_prime(bits // 2), _random_prime(bits // 2)
+        phi = (p - 1) * (q - 1)
+        if p != q and phi % e:
+            break
+    n = p * q
+    d = pow(e, -1, phi)
+    now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+    name = _der_sequence(_der(0x31, _der_sequence(_der_oid(_OID_COMMON_NAME),
+                                                  _der(0x0C, common_name.encode("utf-8")))))
+    algorithm = _der_sequence(_der_oid(_OID_SHA256_WITH_RSA), _der(0x05, b""))
+    tbs = _der_sequence(
+        _der(0xA0, _der_integer(2)),
+        _der_integer(secrets.randbits(63)),
+        algorithm,
+        name,
+        _der_sequence(_der_time(now), _der_time(now.replace(year=now.year + years))),
+        name,
+        _subject_public_key_info(n, e),
+    )
+    key = SigningKey(n, e, d, p, q, b"")
+    key.certificate = _der_sequence(tbs, algorithm, _der(0x03, b"\0" + key.sign(tbs)))
+    return key
+
+
+def load_signing_key(path):
+    """Leer clave RSA (PKCS#1 o PKCS#8 sin cifrar) y certificado de un PEM
+
+    Con una cadena (openssl pkcs12 la exporta con la hoja primero) se usa el
+    primer CERTIFICATE, el del firmante.
+    """
+    blocks = {}
+    with open(path, "rb") as f:
+        for label, body in _PEM_BLOCK.findall(f.read()):
+            blocks.setdefault(label.decode("ascii"), []).append(base64.b64decode(body))
+    blocks = {label: bodies[0] for label, bodies in blocks.items()}
+    if "CERTIFICATE" not in blocks:
+        raise SigningError(f"{path}: falta el bloque CERTIFICATE")
+    if "PRIVATE KEY" in blocks:
+        # PKCS#8: version, algoritmo y la clave PKCS#1 en un OCTET STRING
+        private_key = _der_items(_der_content(blocks["PRIVATE KEY"]))[2][1]
+    elif "RSA PRIVATE KEY" in blocks:
+        private_key = blocks["RSA PRIVATE KEY"]
+    else:
+        raise SigningError(f"{path}: falta la clave privada RSA (¿PEM cifrado?)")
+    values = [int.from_bytes(content, "big")
+              for _, content, _ in _der_items(_der_content(private_key))]
+    _, n, e, d, p, q = values[:6]
+    return SigningKey(n, e, d, p, q, blocks["CERTIFICATE"])
+
+
+def debug_signing_key(path=DEBUG_KEY_PEM):
+    """Clave de depuración: se genera la primera vez y se reutiliza"""
+    if os.path.exists(path):
+        return load_signing_key(path)
+    key = generate_signing_key()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+        f.write(key.to_pem())
+    os.replace(tmp_path, path)
+    return key
+
+
+def release_or_debug_key(path=RELEASE_KEY_PEM):
+    """(clave, es_release): la de release si existe su PEM, si no la de depuración"""
+    if path and os.path.exists(path):
+        return load_signing_key(path), True
+    return debug_signing_key(), False
+
+
+# --- Estructura del archivo y digest por chunks ---
+
+def _zip_sections(mm):
+    """(fin de las entradas, offset del directorio central, offset del EOCD)
+
+    Si ya hay un APK Signing Block, las entradas terminan donde empieza.
+    """
+    end = _find_end_record(mm)
+    fields = _END_RECORD.unpack_from(mm, end)
+    count, cd_size, cd_offset = fields[4], fields[5], fields[6]
+    if count == ZIP64_COUNT_LIMIT or cd_offset == ZIP64_LIMIT:
+        raise SigningError("los archivos Zip64 no se pueden firmar con v2/v3")
+    if cd_offset + cd_size != end:
+        raise SigningError("hay datos entre el directorio central y el EOCD")
+    entries_end = cd_offset
+    if cd_offset >= 24 and mm[cd_offset - 16:cd_offset] == APK_SIG_BLOCK_MAGIC:
+        block_size = struct.unpack_from("<Q", mm, cd_offset - 24)[0]
+        entries_end = cd_offset - block_size - 8
+        if entries_end < 0 or struct.unpack_from("<Q", mm, entries_end)[0] != block_size:
+            raise SigningError("APK Signing Block dañado")
+    return entries_end, cd_offset, end
+
+
+def _chunk_digest(chunk):
+    digest = hashlib.sha256(b"\xa5" + struct.pack("<I", len(chunk)))
+    # update() con un chunk grande libera el GIL: los hilos digieren en paralelo
+    digest.update(chunk)
+    return digest.digest()
+
+
+def content_digest(mm, entries_end, cd_offset, eocd_offset, jobs=0, known=()):
+    """Digest v2/v3 (SHA-256 por chunks de 1 MiB) de entradas, directorio central y EOCD
+
+    El EOCD se digiere con el offset del directorio central apuntando al
+    inicio del bloque de firma, es decir, a entries_end. known son los
+    digests ya calculados de los primeros chunks completos de las entradas.
+    """
+    known = list(known[:entries_end // CHUNK_SIZE])
+    eocd = bytearray(mm[eocd_offset:])
+    struct.pack_into("<I", eocd, 16, entries_end)
+    view = memoryview(mm)
+    chunks = [view[start:min(start + CHUNK_SIZE, stop)]
+              for begin, stop in ((len(known) * CHUNK_SIZE, entries_end), (cd_offset, eocd_offset))
+              for start in range(begin, stop, CHUNK_SIZE)]
+    chunks.append(memoryview(bytes(eocd)))
+    try:
+        jobs = jobs or os.cpu_count() or 1
+        if jobs > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                digests = list(pool.map(_chunk_digest, chunks))
+        else:
+            digests = [_chunk_digest(chunk) for chunk in chunks]
+    finally:
+        for chunk in chunks:
+            chunk.release()
+        view.release()
+    digests = known + digests
+    return hashlib.sha256(b"\x5a" + struct.pack("<I", len(digests)) + b"".join(digests)).digest(), \
+        len(digests)
+
+
+# --- APK Signing Block ---
+
+def _prefixed(data):
+    return struct.pack("<I", len(data)) + data
+
+
+def _sequence(items):
+    return _prefixed(b"".join(_prefixed(item) for item in items))
+
+
+def _signer(key, digest, scheme):
+    """Signer de v2 o v3 para un digest de contenido"""
+    digests = _sequence([struct.pack("<I", RSA_PKCS1_V1_5_WITH_SHA256) + _prefixed(digest)])
+    certificates = _sequence([key.certificate])
+    if scheme == 2:
+        attributes = _sequence([struct.pack("<II", STRIPPING_PROTECTION_ID, 3)])
+        signed_data = digests + certificates + attributes
+        sdk_range = b""
+    else:
+        sdk_range = struct.pack("<II", V3_MIN_SDK, V3_MAX_SDK)
+        signed_data = digests + certificates + sdk_range + _sequence([])
+    signatures = _sequence([struct.pack("<I", RSA_PKCS1_V1_5_WITH_SHA256)
+                            + _prefixed(key.sign(signed_data))])
+    return _sequence([_prefixed(signed_data) + sdk_range + signatures + _prefixed(key.public_key)])
+
+
+def signing_block(key, digest, schemes=(2, 3)):
+    """APK Signing Block con un par id-valor por esquema"""
+    ids = {2: APK_SIGNATURE_SCHEME_V2_ID, 3: APK_SIGNATURE_SCHEME_V3_ID}
+    pairs = b"".join(struct.pack("<QI", 4 + len(value), ids[scheme]) + value
+                     for scheme, value in ((scheme, _signer(key, digest, scheme))
+                                           for scheme in schemes))
+    size = len(pairs) + 8 + len(APK_SIG_BLOCK_MAGIC)
+    return struct.pack("<Q", size) + pairs + struct.pack("<Q", size) + APK_SIG_BLOCK_MAGIC
+
+
+def sign_archive(path, key, jobs=0, schemes=(2, 3)):
+    """Firmar un .apk/.aab en el sitio insertando el APK Signing Block
+
+    Las entradas no se mueven ni se reescriben. Devuelve (chunks digeridos,
+    segundos de digest, tamaño del bloque).
+    """
+    with open(path, "r+b") as f:
+        return _sign_file(f, key, jobs, schemes)
+
+
+def _sign_file(f, key, jobs, schemes, known=()):
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        entries_end, cd_offset, eocd_offset = _zip_sections(mm)
+        start = time.perf_counter()
+        digest, chunks = content_digest(mm, entries_end, cd_offset, eocd_offset, jobs, known)
+        digest_seconds = time.perf_counter() - start
+        tail = bytearray(mm[cd_offset:])
+    block = signing_block(key, digest, schemes)
+    # El EOCD (al final de tail) apunta al directorio central desplazado
+    struct.pack_into("<I", tail, eocd_offset - cd_offset + 16, entries_end + len(block))
+    f.seek(entries_end)
+    f.write(block + bytes(tail))
+    f.truncate()
+    return chunks, digest_seconds, len(block)
+
+
+def sign_stream(stream, path, key, jobs=0, schemes=(2, 3)):
+    """Recibir un .apk/.aab de un flujo (stdin, un pipe) y guardarlo firmado en path
+
+    Cada chunk completo de 1 MiB se digiere en el pool mientras se sigue
+    leyendo, así que al llegar el EOCD solo queda el último chunk de las
+    entradas, el directorio central y el propio EOCD. Los digests de chunks
+    que resulten caer fuera de las entradas se descartan. Devuelve lo mismo
+    que sign_archive().
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w+b") as f, \
+                ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+            pending = []
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+                if len(chunk) == CHUNK_SIZE and len(pending) * CHUNK_SIZE == f.tell() - CHUNK_SIZE:
+                    pending.append(pool.submit(_chunk_digest, chunk))
+            if not f.tell():
+                raise SigningError("flujo de entrada vacío")
+            f.flush()
+            result = _sign_file(f, key, jobs, schemes, [future.result() for future in pending])
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return result
+
+
+def signed_with(path, key, jobs=0):
+    """True si path tiene firmas v2/v3 válidas y todas son de key"""
+    public_keys = []
+    try:
+        schemes, errors = verify_archive(path, jobs, public_keys)
+    except (OSError, ValueError, struct.error):
+        return False
+    return bool(schemes) and not errors and all(found == key.public_key for found in public_keys)
+
+
+def sign_artifacts(paths, key_path=RELEASE_KEY_PEM, jobs=0, cache=None, skip_signed=False):
+    """Firmar los artefactos de una compilación e informar de cada uno
+
+    Con la caché de entradas, se actualiza la marca de cada artefacto: las
+    entradas no se han movido y siguen siendo reutilizables. Con
+    skip_signed (compilación omitida por estar al día), los artefactos que
+    ya tienen una firma válida de la misma clave no se vuelven a firmar.
+    """
+    key, release = release_or_debug_key(key_path)
+    if not release:
+        print(f"⚠️  Sin {key_path}: firmando con la clave de depuración {DEBUG_KEY_PEM}")
+    for path in paths:
+        if skip_signed and signed_with(path, key, jobs):
+            print(f"🔏 {path} ya firmado ({'release' if release else 'depuración'})")
+            continue
+        with phase("sign", artifact=path) as traced:
+            chunks, seconds, block_size = sign_archive(path, key, jobs)
+            traced.bytes_read = os.path.getsize(path)
+        if cache is not None:
+            cache.restamp(path)
+        print(f"🔏 {path} firmado (v2+v3, {'release' if release else 'depuración'}): "
+              f"{chunks} chunks de 1 MiB en {seconds * 1000:.1f} ms")
+    return release
+
+
+# --- Verificación ---
+
+def _read_prefixed(data, position):
+    length = struct.unpack_from("<I", data, position)[0]
+    return data[position + 4:position + 4 + length], position + 4 + length
+
+
+def _read_sequence(data):
+    items = []
+    position = 0
+    while position < len(data):
+        item, position = _read_prefixed(data, position)
+        items.append(item)
+    return items
+
+
+def _verify_rsa(public_key, data, signature):
+    algorithm, bit_string = [content for _, content, _ in _der_items(_der_content(public_key))]
+    n, e = [int.from_bytes(content, "big") for _, content, _ in
+            _der_items(_der_content(bit_string[1:]))]
+    expected = _emsa_pkcs1_v1_5(data, (n.bit_length() + 7) // 8)
+    return pow(int.from_bytes(signature, "big"), e, n) == expected
+
+
+def verify_archive(path, jobs=0, public_keys=None):
+    """Comprobar las firmas v2/v3 de un artefacto; devuelve ([esquemas], [errores])
+
+    Con public_keys (una lista), se le añade la clave pública de cada firmante.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        entries_end, cd_offset, eocd_offset = _zip_sections(mm)
+        if entries_end == cd_offset:
+            return [], ["sin APK Signing Block"]
+        block = bytes(mm[entries_end + 8:cd_offset - 24])
+        digest, _ = content_digest(mm, entries_end, cd_offset, eocd_offset, jobs)
+    found = []
+    errors = []
+    position = 0
+    while position < len(block):
+        length, pair_id = struct.unpack_from("<QI", block, position)
+        value = block[position + 12:position + 8 + length]
+        position += 8 + length
+        scheme = {APK_SIGNATURE_SCHEME_V2_ID: 2, APK_SIGNATURE_SCHEME_V3_ID: 3}.get(pair_id)
+        if scheme is None:
+            continue
+        found.append(scheme)
+        for signer in _read_sequence(_read_prefixed(value, 0)[0]):
+            signed_data, offset = _read_prefixed(signer, 0)
+            if scheme == 3:
+                offset += 8
+            signatures, offset = _read_prefixed(signer, offset)
+            public_key, _ = _read_prefixed(signer, offset)
+            if public_keys is not None:
+                public_keys.append(public_key)
+            for signature in _read_sequence(signatures):
+                algorithm = struct.unpack_from("<I", signature)[0]
+                if algorithm != RSA_PKCS1_V1_5_WITH_SHA256:
+                    errors.append(f"v{scheme}: algoritmo 0x{algorithm:04x} no soportado")
+                elif not _verify_rsa(public_key, signed_data, _read_prefixed(signature, 4)[0]):
+                    errors.append(f"v{scheme}: firma RSA inválida")
+            for item in _read_sequence(_read_prefixed(signed_data, 0)[0]):
+                if _read_prefixed(item, 4)[0] != digest:
+                    errors.append(f"v{scheme}: el digest no coincide con el contenido")
+    if not found:
+        errors.append("el bloque no tiene firmas v2 ni v3")
+    return found, errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Firma APK Signature Scheme v2/v3 de .apk/.aab")
+    parser.add_argument("paths", nargs="+", metavar="ARTEFACTO", help=".apk o .aab a firmar")
+    parser.add_argument("--key", metavar="PEM",
+                        help="Clave RSA + certificado (por defecto la de depuración)")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="Hilos de digest en paralelo (0 = todos los núcleos)")
+    parser.add_argument("--v2-only", action="store_true", help="No añadir la firma v3")
+    parser.add_argument("--verify", action="store_true",
+                        help="Solo verificar las firmas existentes")
+    parser.add_argument("--output", "-o", metavar="RUTA",
+                        help="Destino del artefacto firmado cuando se lee de stdin ('-')")
+    args = parser.parse_args()
+    if "-" in args.paths and (args.verify or not args.output or len(args.paths) > 1):
+        parser.error("'-' firma un único artefacto leído de stdin y necesita --output")
+
+    failed = False
+    key = None
+    if not args.verify:
+        key = load_signing_key(args.key) if args.key else debug_signing_key()
+    for path in args.paths:
+        try:
+            schemes = (2,) if args.v2_only else (2, 3)
+            if path == "-":
+                path = args.output
+                chunks, seconds, block_size = sign_stream(sys.stdin.buffer, path, key, args.jobs,
+                                                          schemes)
+            elif not args.verify:
+                chunks, seconds, block_size = sign_archive(path, key, args.jobs, schemes)
+            if not args.verify:
+                print(f"🔏 {path}: {chunks} chunks digeridos en {seconds * 1000:.1f} ms, "
+                      f"bloque de firma de {block_size} B")
+            schemes, errors = verify_archive(path, args.jobs)
+        except (OSError, ValueError, struct.error, SigningError) as e:
+            print(f"❌ {path}: {e}")
+            failed = True
+            continue
+        for error in errors:
+            print(f"❌ {path}: {error}")
+        if not errors:
+            print(f"✅ {path}: firma v{'+v'.join(map(str, schemes))} correcta")
+        failed = failed or bool(errors)
+    sys.exit(1 if failed else 0)
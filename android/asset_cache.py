@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Caché de assets generados (iconos, screenshots, feature graphic)
+Cada asset se indexa por un hash de todo lo que lo determina: la función
+que lo renderiza y el código de su módulo (paleta y dibujo incluidos), sus
+argumentos (tamaño, textos, lista de características), el contenido de los
+archivos que lee (fuentes, logo) y la versión de Pillow.
+
+Los bytes generados se guardan en .bundle-cache/assets/blobs. Con un
+acierto, si la salida sigue siendo la que se escribió (mismo tamaño y
+mtime) no se toca; si falta o cambió por fuera, se restaura desde el blob.
+Una regeneración sin cambios no renderiza nada y deja el árbol idéntico,
+mtimes incluidos, así que no invalida el empaquetado ni la sincronización.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+import PIL
+
+ASSET_CACHE_DIR = os.path.join(".bundle-cache", "assets")
+INDEX_FILE = "assets.json"
+
+
+def file_digest(path):
+    """sha256 del contenido de un archivo ("-" si no existe)"""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return "-"
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def write_if_changed(path, data):
+    """Escribir de forma atómica solo si el contenido es distinto; True si se escribió"""
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+class AssetCache:
+    """Índice clave de entradas -> blob generado, y estado de cada salida"""
+
+    def __init__(self, root=ASSET_CACHE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self.hits = 0
+        self.misses = 0
+        self._assets = {}
+        self._outputs = {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._assets = data.get("assets", {})
+            self._outputs = data.get("outputs", {})
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def key(render, args, inputs=()):
+        """Clave de un asset: función, código de su módulo, argumentos y archivos leídos
+
+        El módulo se identifica por su archivo, así que la clave es la misma
+        tanto si se ejecuta como script como si se importa.
+        """
+        source = sys.modules[render.__module__].__file__
+        digest = hashlib.sha256(f"{os.path.basename(source)}:{render.__qualname__}\0".encode("utf-8"))
+        digest.update(file_digest(source).encode("ascii"))
+        digest.update(json.dumps(args, ensure_ascii=False, default=repr).encode("utf-8"))
+        for path in inputs:
+            digest.update(f"\0{path}\0{file_digest(path)}".encode("utf-8"))
+        digest.update(f"\0Pillow {PIL.__version__}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def blob_path(self, digest):
+        return os.path.join(self.root, "blobs", digest)
+
+    def put_blob(self, data):
+        """Guardar los bytes generados (desde cualquier proceso); devuelve su sha256"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return digest
+
+    def get(self, key, outputs):
+        """Dejar las salidas de un asset al día desde la caché
+
+        Devuelve el tamaño del asset si hubo acierto, o None si hay que
+        generarlo. Las salidas que siguen intactas no se tocan.
+        """
+        cached = self._assets.get(key)
+        if cached is None:
+            self.misses += 1
+            return None
+        digests, size = cached
+        if len(digests) != len(outputs):
+            self.misses += 1
+            return None
+        stale = [(path, digest) for path, digest in zip(outputs, digests)
+                 if self._outputs.get(os.path.abspath(path)) != [digest, *(_stamp(path) or [])]]
+        if any(not os.path.exists(self.blob_path(digest)) for _, digest in stale):
+            self.misses += 1
+            return None
+        for path, digest in stale:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            shutil.copyfile(self.blob_path(digest), tmp_path)
+            os.replace(tmp_path, path)
+            self._outputs[os.path.abspath(path)] = [digest, *_stamp(path)]
+        self.hits += 1
+        return size
+
+    def record(self, key, digests, size, outputs):
+        """Anotar un asset recién generado (un blob por salida) y el estado de sus salidas"""
+        self._assets[key] = [list(digests), size]
+        for path, digest in zip(outputs, digests):
+            self._outputs[os.path.abspath(path)] = [digest, *_stamp(path)]
+
+    def save(self):
+        """Escribir el índice de forma atómica"""
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"assets": self._assets, "outputs": self._outputs}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def summary(self):
+        """Resumen legible de aciertos/fallos"""
+        total = self.hits + self.misses
+        return f"{self.hits}/{total} assets sin regenerar"
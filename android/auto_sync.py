@@ -5,6 +5,7 @@ Monitorea cambios y actualiza el repositorio automáticamente
 """
 
 import os
+import argparse
 import subprocess
 import time
 import hashlib
@@ -12,6 +13,8 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+from tracing import add_tracing_arguments, phase, tracing
+
 class GitHubAutoSync:
     def __init__(self):
         self.repo_url = "https://github.com/RUPERDFN/thecookflow2.0_playstore.git"
@@ -44,22 +47,24 @@ class GitHubAutoSync:
         """Calcula hash del directorio para detectar cambios"""
         hash_md5 = hashlib.md5()
         
-        for root, dirs, files in os.walk('.'):
-            # Excluir directorios
-            dirs[:] = [d for d in dirs if not any(d.startswith(p.rstrip('/*')) for p in self.exclude_patterns)]
-            
-            for file in sorted(files):
-                # Excluir archivos
-                if any(file.endswith(p.rstrip('*')) or p.rstrip('/*') in file for p in self.exclude_patterns):
-                    continue
-                    
-                file_path = os.path.join(root, file)
-                try:
-                    with open(file_path, 'rb') as f:
-                        content = f.read()
-                    hash_md5.update(content)
-                except:
-                    continue
+        with phase("hash") as traced:
+            for root, dirs, files in os.walk('.'):
+                # Excluir directorios
+                dirs[:] = [d for d in dirs if not any(d.startswith(p.rstrip('/*')) for p in self.exclude_patterns)]
+                
+                for file in sorted(files):
+                    # Excluir archivos
+                    if any(file.endswith(p.rstrip('*')) or p.rstrip('/*') in file for p in self.exclude_patterns):
+                        continue
+                        
+                    file_path = os.path.join(root, file)
+                    try:
+                        with open(file_path, 'rb') as f:
+                            content = f.read()
+                        hash_md5.update(content)
+                        traced.bytes_read += len(content)
+                    except:
+                        continue
                     
         return hash_md5.hexdigest()
     
@@ -103,13 +108,14 @@ class GitHubAutoSync:
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         print(f"📝 Agregando cambios... ({timestamp})")
-        success, _, error = self.run_command(['git', 'add', '.'])
-        if not success:
-            print(f"❌ Error agregando archivos: {error}")
-            return False
-        
-        commit_msg = f"🔄 Auto-sync: TheCookFlow Android - {timestamp}"
-        success, output, error = self.run_command(['git', 'commit', '-m', commit_msg])
+        with phase("commit"):
+            success, _, error = self.run_command(['git', 'add', '.'])
+            if not success:
+                print(f"❌ Error agregando archivos: {error}")
+                return False
+            
+            commit_msg = f"🔄 Auto-sync: TheCookFlow Android - {timestamp}"
+            success, output, error = self.run_command(['git', 'commit', '-m', commit_msg])
         if not success and "nothing to commit" not in error:
             print(f"❌ Error en commit: {error}")
             return False
@@ -118,7 +124,8 @@ class GitHubAutoSync:
             return True
         
         print("⬆️  Subiendo a GitHub...")
-        success, _, error = self.run_command(['git', 'push', '-u', 'origin', self.branch])
+        with phase("push"):
+            success, _, error = self.run_command(['git', 'push', '-u', 'origin', self.branch])
         if not success:
             print(f"❌ Error subiendo cambios: {error}")
             return False
@@ -166,14 +173,18 @@ class GitHubAutoSync:
         return False
 
 if __name__ == "__main__":
-    import sys
+    parser = argparse.ArgumentParser(description="Sincronización automática con GitHub")
+    parser.add_argument("--monitor", nargs="?", type=int, const=5, metavar="MINUTOS",
+                        help="Monitorear cambios continuamente (cada 5 minutos por defecto)")
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
     
     syncer = GitHubAutoSync()
     
-    if len(sys.argv) > 1 and sys.argv[1] == "--monitor":
-        # Modo monitoreo continuo
-        interval = int(sys.argv[2]) if len(sys.argv) > 2 else 5
-        syncer.auto_monitor(interval)
-    else:
-        # Sincronización única
-        syncer.sync_once()
\ No newline at end of file
+    with tracing(args.trace, args.profile):
+        if args.monitor is not None:
+            # Modo monitoreo continuo
+            syncer.auto_monitor(args.monitor)
+        else:
+            # Sincronización única
+            syncer.sync_once()
\ No newline at end of file
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Fondos de los assets de Play Store (pizarra, gradientes y grano de tiza)
+Cada capa se construye de una vez como un buffer de bytes y se envuelve con
+Image.frombuffer sin copiarla: las rayas de la pizarra son una fila de
+línea y otra de fondo repetidas con una sola multiplicación de bytes, el
+gradiente es una columna de 1 px que Pillow estira a todo el ancho, y el
+grano son bytes pseudoaleatorios (con semilla fija, para que el resultado
+sea reproducible) que una tabla convierte en máscara de tiza.
+
+Las capas se cachean por (tamaño, paleta): un lote de screenshots del mismo
+tamaño genera su fondo una vez, ya en RGB. Los fondos cacheados no se
+modifican: quien dibuja encima trabaja sobre una .copy().
+"""
+import functools
+import random
+from collections import namedtuple
+
+from PIL import Image
+
+# Colores de un fondo: base, acento (rayas o final del gradiente) y tiza del grano
+Palette = namedtuple("Palette", "base accent chalk")
+
+CHALKBOARD = Palette((45, 77, 58), (50, 82, 63), (245, 245, 220))
+CHALKBOARD_GRADIENT = Palette((45, 77, 58), (65, 77, 58), (245, 245, 220))
+
+LINE_SPACING = 20
+GRAIN_DENSITY = 0.02
+GRAIN_STRENGTH = 28
+
+BACKGROUND_CACHE_SIZE = 16
+
+
+def _rgbx(color):
+    return bytes((*color[:3], 255))
+
+
+def _wrap(size, data):
+    """Imagen RGBX que comparte data (sin copia, solo lectura)"""
+    return Image.frombuffer("RGBX", size, data, "raw", "RGBX", 0, 1)
+
+
+def stripes(size, base, line, spacing=LINE_SPACING, thickness=1):
+    """Fondo liso con una línea horizontal cada spacing píxeles"""
+    width, height = size
+    base_row = _rgbx(base) * width
+    line_row = _rgbx(line) * width
+    period = line_row * thickness + base_row * (spacing - thickness)
+    data = (period * -(-height // spacing))[:len(base_row) * height]
+    return _wrap(size, data)
+
+
+def gradient(size, top, bottom):
+    """Gradiente vertical de top a bottom (fila y: top + (bottom - top) * y // alto)"""
+    width, height = size
+    column = b"".join(
+        bytes((*(a + (b - a) * y // height for a, b in zip(top, bottom)), 255))
+        for y in range(height))
+    return _wrap((1, height), column).resize(size, Image.NEAREST)
+
+
+def chalk_grain(layer, chalk, density=GRAIN_DENSITY, strength=GRAIN_STRENGTH, seed=0):
+    """Motas de tiza sobre layer: una fracción density de píxeles, opacidad hasta strength"""
+    width, height = layer.size
+    noise = random.Random(f"{seed}:{width}x{height}").randbytes(width * height)
+    threshold = 256 - max(1, int(256 * density))
+    table = [0 if value < threshold
+             else strength * (value - threshold + 1) // (256 - threshold)
+             for value in range(256)]
+    mask = Image.frombuffer("L", layer.size, noise, "raw", "L", 0, 1).point(table)
+    return Image.composite(Image.new("RGBX", layer.size, (*chalk, 255)), layer, mask)
+
+
+@functools.lru_cache(maxsize=BACKGROUND_CACHE_SIZE)
+def chalkboard(size, palette=CHALKBOARD):
+    """Pizarra de los screenshots (RGB): rayas sutiles y grano de tiza"""
+    return chalk_grain(stripes(size, palette.base, palette.accent), palette.chalk).convert("RGB")
+
+
+@functools.lru_cache(maxsize=BACKGROUND_CACHE_SIZE)
+def chalkboard_gradient(size, palette=CHALKBOARD_GRADIENT):
+    """Pizarra del feature graphic (RGB): gradiente vertical y grano de tiza"""
+    return chalk_grain(gradient(size, palette.base, palette.accent), palette.chalk).convert("RGB")
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Benchmarks de las herramientas Python de TheCookFlow
+Mide los puntos calientes del empaquetado y de la generación de assets:
+create_app_bundle, create_final_aab, create_thecookflow_icon en cada
+densidad, create_screenshot_mockup y create_feature_graphic.
+
+Los empaquetadores se miden sobre árboles res/ sintéticos de tamaño
+creciente (1, 50 y 500 MB por defecto), generados de forma determinista y
+reutilizados entre ejecuciones. Los resultados salen en JSON y con
+--compare se contrastan contra una línea base guardada.
+
+Uso:
+    python android/benchmark.py --output bench.json
+    python android/benchmark.py --sizes 1,50 --compare bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+DEFAULT_SIZES_MB = (1, 50, 500)
+TREES_DIR = os.path.join(".bundle-cache", "bench-trees")
+
+# Tamaños de create_thecookflow_icon: mipmaps del grupo "icons" + Play Store
+ICON_SIZES = {
+    "mdpi": 48,
+    "hdpi": 72,
+    "xhdpi": 96,
+    "xxhdpi": 144,
+    "xxxhdpi": 192,
+    "play_store": 512,
+}
+
+# Reparto del árbol sintético: (directorio, extensión, tamaño por archivo, compresible)
+_TREE_LAYOUT = [
+    ("drawable-xxxhdpi", "png", 256 * 1024, False),
+    ("drawable-xxhdpi", "png", 128 * 1024, False),
+    ("mipmap-xhdpi", "webp", 32 * 1024, False),
+    ("raw", "json", 512 * 1024, True),
+    ("values", "xml", 16 * 1024, True),
+    ("layout", "xml", 8 * 1024, True),
+]
+
+# Versión del contenido sintético: cambiarla regenera los árboles guardados
+TREE_VERSION = 3
+
+_XML_WORDS = [b"<item name=\"receta\">", b"</item>", b"menu_semanal", b"ingredientes",
+              b"lista_compra", b"android:layout_width", b"match_parent", b"\n    "]
+
+_LAYOUT_VIEW = ('    <TextView android:id="@+id/receta_{0}" android:layout_width="match_parent"\n'
+                '        android:layout_height="wrap_content" android:textSize="{1}sp"\n'
+                '        android:text="{2}" />\n')
+
+
+def _synthetic_values(rng, file_size, index):
+    """values/*.xml válido (el compilador de recursos lo parsea)"""
+    strings = []
+    length = len(b"<resources>\n</resources>\n")
+    while length < file_size:
+        words = b" ".join(rng.choice(_XML_WORDS[2:5]) for _ in range(rng.randint(3, 12)))
+        string = b'    <string name="bench_%d_%d">%s</string>\n' % (index, len(strings), words)
+        strings.append(string)
+        length += len(string)
+    return b"<resources>\n" + b"".join(strings) + b"</resources>\n"
+
+
+def _synthetic_layout(rng, file_size):
+    """Layout XML válido (el empaquetador lo compila a XML binario)"""
+    head = b'<LinearLayout xmlns:android="http://schemas.android.com/apk/res/android"\n' \
+        b'    android:layout_width="match_parent" android:layout_height="match_parent">\n'
+    tail = b"</LinearLayout>\n"
+    views = []
+    length = len(head) + len(tail)
+    while length < file_size:
+        view = _LAYOUT_VIEW.format(len(views), rng.randint(12, 24),
+                                   rng.choice(_XML_WORDS[2:5]).decode()).encode()
+        views.append(view)
+        length += len(view)
+    return head + b"".join(views) + tail
+
+
+def synthetic_tree(size_mb, root=TREES_DIR):
+    """Crear (o reutilizar) un res/ sintético de unos size_mb MB
+
+    Mezcla binarios incompresibles (imágenes) con texto compresible (XML,
+    JSON) con un generador con semilla fija, para que los tiempos sean
+    comparables entre ejecuciones y máquinas.
+    """
+    tree = os.path.join(root, f"res-{size_mb}mb-v{TREE_VERSION}")
+    marker = os.path.join(tree, ".complete")
+    if os.path.exists(marker):
+        return tree
+    shutil.rmtree(tree, ignore_errors=True)
+    rng = random.Random(size_mb)
+    target = size_mb * 1024 * 1024
+    written = 0
+    index = 0
+    while written < target:
+        directory, extension, file_size, compressible = _TREE_LAYOUT[index % len(_TREE_LAYOUT)]
+        file_size = min(file_size, target - written)
+        os.makedirs(os.path.join(tree, directory), exist_ok=True)
+        if directory == "layout":
+            data = _synthetic_layout(rng, file_size)
+        elif directory == "values":
+            data = _synthetic_values(rng, file_size, index)
+        elif compressible:
+            chunks = []
+            length = 0
+            while length < file_size:
+                word = rng.choice(_XML_WORDS)
+                chunks.append(word)
+                length += len(word)
+            data = b"".join(chunks)[:file_size]
+        else:
+            data = rng.randbytes(file_size)
+        with open(os.path.join(tree, directory, f"bench_{index:05d}.{extension}"), "wb") as f:
+            f.write(data)
+        written += file_size
+        index += 1
+    open(marker, "w").close()
+    return tree
+
+
+@contextlib.contextmanager
+def _workdir():
+    """Directorio temporal con la estructura que esperan los scripts (keystore, assets)"""
+    previous = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="cookflow-bench-")
+    try:
+        os.makedirs(os.path.join(workdir, "app"))
+        os.makedirs(os.path.join(workdir, "play_store_assets"))
+        # compile_final_aab solo comprueba que el keystore exista
+        open(os.path.join(workdir, "app", "thecookflow-release-key.keystore"), "wb").close()
+        # create_screenshot_mockup lee el logo de android/app/src/main/res
+        os.symlink(HERE, os.path.join(workdir, "android"))
+        os.chdir(workdir)
+        yield workdir
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _measure(function, repeat):
+    """Tiempos de pared de cada repetición, con la salida de los scripts silenciada"""
+    runs = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            function()
+            runs.append(time.perf_counter() - start)
+    return runs
+
+
+def packaging_benchmarks(tree):
+    """Empaquetadores sobre un árbol res/ (compilación en frío: sin caché y forzada)"""
+    from compile_cookflow_aab import create_app_bundle
+    from compile_final_aab import create_final_aab
+    return {
+        "create_app_bundle": lambda: create_app_bundle(use_cache=False, force=True, res_dir=tree),
+        "create_final_aab": lambda: create_final_aab(use_cache=False, force=True, res_dir=tree),
+    }
+
+
+def asset_benchmarks():
+    """Generación de iconos y assets de Play Store (no dependen del árbol res/)"""
+    import backgrounds
+    import generate_icons
+    import generate_play_store_assets
+    from generate_icons import create_thecookflow_icon
+    from generate_play_store_assets import create_feature_graphic, create_screenshot_mockup
+    benchmarks = {
+        f"create_thecookflow_icon[{density}]": (lambda size=size: create_thecookflow_icon(size))
+        for density, size in ICON_SIZES.items()
+    }
+
+    def icon_set():
+        # Juego completo desde cero: un render del master, remuestreo y PNG por tamaño
+        for cached in (generate_icons.render_master, generate_icons.icon_at,
+                       generate_icons.icon_png):
+            cached.cache_clear()
+        for size in set(ICON_SIZES.values()):
+            generate_icons.icon_png(size)
+
+    benchmarks["icon_set"] = icon_set
+
+    def store_backgrounds():
+        # Fondos de screenshot y feature graphic desde cero (sin la caché por tamaño)
+        backgrounds.chalkboard.cache_clear()
+        backgrounds.chalkboard_gradient.cache_clear()
+        backgrounds.chalkboard((1080, 1920))
+        backgrounds.chalkboard_gradient((1024, 500))
+
+    benchmarks["store_backgrounds"] = store_backgrounds
+    benchmarks["create_screenshot_mockup"] = lambda: create_screenshot_mockup(
+        1080, 1920, "TheCookFlow", "Planifica tus menús semanales con IA",
+        ["🤖 Generación automática con IA", "🍽️ Menús personalizados para tu dieta",
+         "📱 Acceso desde cualquier dispositivo", "⚡ Rápido y fácil de usar",
+         "💡 Sugerencias inteligentes"])
+    benchmarks["create_feature_graphic"] = create_feature_graphic
+
+    def screenshot_matrix():
+        # Matriz idioma × dispositivo de screenshots.json en un proceso, cachés desde cero
+        for cached in (backgrounds.chalkboard, generate_play_store_assets._scaled_logo,
+                       generate_play_store_assets._logo_source):
+            cached.cache_clear()
+        for shot in generate_play_store_assets.load_screenshots():
+            generate_play_store_assets.render_screenshot(shot)
+
+    benchmarks["screenshot_matrix"] = screenshot_matrix
+    return benchmarks
+
+
+def _result(name, runs, tree_mb=None):
+    return {
+        "name": name,
+        "tree_mb": tree_mb,
+        "runs": [round(run, 6) for run in runs],
+        "min": round(min(runs), 6),
+        "median": round(statistics.median(runs), 6),
+    }
+
+
+def run_benchmarks(sizes_mb=DEFAULT_SIZES_MB, repeat=3, only=None):
+    """Ejecutar la suite y devolver el informe como diccionario serializable"""
+    results = []
+    selected = (lambda name: only is None or any(part in name for part in only))
+    trees = {size_mb: os.path.abspath(synthetic_tree(size_mb)) for size_mb in sizes_mb
+             if any(selected(name) for name in ("create_app_bundle", "create_final_aab"))}
+    with _workdir():
+        for size_mb, tree in trees.items():
+            for name, function in packaging_benchmarks(tree).items():
+                if selected(name):
+                    results.append(_result(name, _measure(function, repeat), size_mb))
+                    print(f"⏱️  {name} [{size_mb} MB]: {results[-1]['median'] * 1000:.1f} ms",
+                          file=sys.stderr)
+        for name, function in asset_benchmarks().items():
+            if selected(name):
+                results.append(_result(name, _measure(function, repeat)))
+                print(f"⏱️  {name}: {results[-1]['median'] * 1000:.1f} ms", file=sys.stderr)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+            "timestamp": int(time.time()),
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold=0.10):
+    """Comparar medianas contra la línea base; devuelve las regresiones"""
+    previous = {(result["name"], result["tree_mb"]): result for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        base = previous.get((result["name"], result["tree_mb"]))
+        if base is None or not base["median"]:
+            continue
+        change = result["median"] / base["median"] - 1
+        label = result["name"] if result["tree_mb"] is None else \
+            f"{result['name']} [{result['tree_mb']} MB]"
+        marker = "❌" if change > threshold else ("✅" if change < -threshold else "  ")
+        print(f"{marker} {label}: {base['median'] * 1000:.1f} ms -> "
+              f"{result['median'] * 1000:.1f} ms ({change * 100:+.1f}%)", file=sys.stderr)
+        if change > threshold:
+            regressions.append((label, change))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks del empaquetado y los assets de TheCookFlow")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES_MB)),
+                        help="Tamaños en MB de los árboles res/ sintéticos (separados por comas)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por benchmark")
+    parser.add_argument("--only", action="append",
+                        help="Ejecutar solo los benchmarks cuyo nombre contenga este texto")
+    parser.add_argument("--output", "-o", help="Archivo JSON de resultados (por defecto stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON de una ejecución anterior")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Regresión tolerada en %% sobre la mediana de la línea base")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    report = run_benchmarks(sizes, args.repeat, args.only)
+    payload = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold / 100)
+        if regressions:
+            print(f"❌ {len(regressions)} benchmarks más lentos que la línea base", file=sys.stderr)
+            sys.exit(1)
@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+"""
+XML binario (AXML) para el manifest y los layouts de TheCookFlow
+Compila XML de texto al formato binario de ResXMLTree que Android lee en la
+instalación y al inflar layouts: un único pool de strings deduplicado
+(UTF-8), un mapa de recursos con los IDs de los atributos android: ya
+resueltos y los valores tipados (booleanos, enteros, enums, dimensiones,
+colores) en lugar de texto que haya que volver a parsear en el dispositivo.
+
+El framework busca los atributos android: solo por ID, así que sus IDs y
+su formato (enums, flags, dimensiones, colores...) salen de la plataforma
+del SDK (framework_resources.py) y un atributo android: que no esté ahí es
+un error de compilación. Las referencias @tipo/nombre quedan como string
+salvo que se pase resolve para traducirlas a IDs. Los atributos tools: se
+descartan, como hace aapt2.
+
+decode_xml() hace el camino inverso y round_trip_matches() comprueba que un
+XML compilado se decodifica al mismo árbol que el original.
+
+Uso:
+    python android/binary_xml.py android/app/src/main/res/layout/*.xml
+    python android/binary_xml.py --decode AndroidManifest.xml
+"""
+import argparse
+import re
+import struct
+import sys
+import xml.parsers.expat
+from xml.etree import ElementTree
+
+import framework_resources
+from framework_resources import FrameworkError
+
+ANDROID_NS = "http://schemas.android.com/apk/res/android"
+TOOLS_NS = "http://schemas.android.com/tools"
+
+# Tipos de chunk (ResourceTypes.h)
+RES_STRING_POOL_TYPE = 0x0001
+RES_XML_TYPE = 0x0003
+RES_XML_START_NAMESPACE_TYPE = 0x0100
+RES_XML_END_NAMESPACE_TYPE = 0x0101
+RES_XML_START_ELEMENT_TYPE = 0x0102
+RES_XML_END_ELEMENT_TYPE = 0x0103
+RES_XML_CDATA_TYPE = 0x0104
+RES_XML_RESOURCE_MAP_TYPE = 0x0180
+
+UTF8_FLAG = 0x100
+NO_INDEX = 0xFFFFFFFF
+
+# Tipos de Res_value
+TYPE_NULL = 0x00
+TYPE_REFERENCE = 0x01
+TYPE_ATTRIBUTE = 0x02
+TYPE_STRING = 0x03
+TYPE_FLOAT = 0x04
+TYPE_DIMENSION = 0x05
+TYPE_INT_DEC = 0x10
+TYPE_INT_HEX = 0x11
+TYPE_INT_BOOLEAN = 0x12
+TYPE_INT_COLOR_ARGB8 = 0x1C
+TYPE_INT_COLOR_RGB8 = 0x1D
+TYPE_INT_COLOR_ARGB4 = 0x1E
+TYPE_INT_COLOR_RGB4 = 0x1F
+
+_CHUNK = struct.Struct("<HHI")
+_STRING_POOL_HEADER = struct.Struct("<HHIIIIII")
+_NODE_HEADER = struct.Struct("<HHIII")
+_NAMESPACE_EXT = struct.Struct("<II")
+_ELEMENT_EXT = struct.Struct("<IIHHHHHH")
+_END_ELEMENT_EXT = struct.Struct("<II")
+_ATTRIBUTE = struct.Struct("<IIIHBBI")
+_CDATA_EXT = struct.Struct("<IHBBI")
+
+_DIMENSION_UNITS = {"px": 0, "dp": 1, "dip": 1, "sp": 2, "pt": 3, "in": 4, "mm": 5}
+_UNIT_NAMES = {0: "px", 1: "dp", 2: "sp", 3: "pt", 4: "in", 5: "mm"}
+_DIMENSION = re.compile(r"(-?\d+(?:\.\d+)?)(px|dp|dip|sp|pt|in|mm)")
+_INTEGER = re.compile(r"-?\d+")
+_HEX = re.compile(r"0[xX][0-9a-fA-F]+")
+_FLOAT = re.compile(r"-?\d*\.\d+")
+_COLOR = re.compile(r"#([0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})")
+# Multiplicador de la mantisa de un valor complejo según su radix (23p0, 16p7, 8p15, 0p23)
+_RADIX_MULTIPLIERS = (1.0, 1.0 / (1 << 7), 1.0 / (1 << 15), 1.0 / (1 << 23))
+
+# Formato de attrs.xml en el que encaja cada tipo de literal
+_LITERAL_FORMATS = {
+    TYPE_INT_BOOLEAN: "boolean", TYPE_INT_DEC: "integer", TYPE_INT_HEX: "integer",
+    TYPE_FLOAT: "float", TYPE_DIMENSION: "dimension",
+    TYPE_INT_COLOR_ARGB8: "color", TYPE_INT_COLOR_RGB8: "color",
+    TYPE_INT_COLOR_ARGB4: "color", TYPE_INT_COLOR_RGB4: "color",
+}
+
+
+class BinaryXmlError(Exception):
+    """XML de texto inválido o XML binario dañado"""
+
+
+def _complex(value, unit):
+    """Dimensión en el formato complejo de Res_value (como floatToComplex de aapt)"""
+    negative = value < 0
+    bits = int(abs(value) * (1 << 23) + 0.5)
+    if bits & 0x7FFFFF == 0:
+        radix, shift = 0, 23
+    elif bits & ~0x7FFFFF == 0:
+        radix, shift = 3, 0
+    elif bits & ~0x7FFFFFFF == 0:
+        radix, shift = 2, 8
+    elif bits & ~0x7FFFFFFFFF == 0:
+        radix, shift = 1, 16
+    else:
+        radix, shift = 0, 23
+    mantissa = (bits >> shift) & 0xFFFFFF
+    if negative:
+        mantissa = -mantissa & 0xFFFFFF
+    return (mantissa << 8) | (radix << 4) | unit
+
+
+def _complex_value(data):
+    mantissa = data >> 8
+    if mantissa & 0x800000:
+        mantissa -= 1 << 24
+    return mantissa * _RADIX_MULTIPLIERS[(data >> 4) & 0x3]
+
+
+def _color(digits):
+    """(tipo, ARGB) de un color #rgb, #argb, #rrggbb o #aarrggbb"""
+    if len(digits) <= 4:
+        expanded = "".join(digit * 2 for digit in digits)
+        kind = TYPE_INT_COLOR_RGB4 if len(digits) == 3 else TYPE_INT_COLOR_ARGB4
+    else:
+        expanded = digits
+        kind = TYPE_INT_COLOR_RGB8 if len(digits) == 6 else TYPE_INT_COLOR_ARGB8
+    value = int(expanded, 16)
+    if len(expanded) == 6:
+        value |= 0xFF000000
+    return kind, value
+
+
+def _framework_attribute(name):
+    """(ID, Attribute) de android:name; un atributo que no es público es un error"""
+    try:
+        resource_id = framework_resources.resource_id("attr", name)
+        definition = framework_resources.attribute(name)
+    except FrameworkError as e:
+        raise BinaryXmlError(str(e)) from None
+    if resource_id is None:
+        raise BinaryXmlError(f"android:{name} no es un atributo público de "
+                             f"{framework_resources.PLATFORM}")
+    return resource_id, definition or framework_resources.Attribute(frozenset(), {})
+
+
+def typed_value(namespace, name, raw, resolve=None):
+    """(tipo, dato) de Res_value de un atributo; dato None = string del pool
+
+    Los atributos android: se tipan según su formato en el framework, como
+    hace aapt2: enum o flags por nombre, y un literal que no encaja en
+    ninguno de sus formatos (ni es string) es un error.
+    """
+    if resolve is not None and raw[:1] in ("@", "?"):
+        resource_id = resolve(raw)
+        if resource_id is not None:
+            return (TYPE_ATTRIBUTE if raw[0] == "?" else TYPE_REFERENCE), resource_id
+    if namespace != ANDROID_NS or raw[:1] in ("@", "?"):
+        return TYPE_STRING, None
+    _, definition = _framework_attribute(name)
+    formats = definition.formats
+    if not formats:
+        return literal_value(raw)
+    if definition.values:
+        parts = raw.split("|") if "flags" in formats else [raw]
+        if all(part in definition.values for part in parts):
+            data = 0
+            for part in parts:
+                data |= definition.values[part]
+            return (TYPE_INT_HEX if "flags" in formats else TYPE_INT_DEC), data & 0xFFFFFFFF
+    kind, data = literal_value(raw)
+    if kind == TYPE_INT_DEC and "integer" not in formats and "float" in formats:
+        kind, data = TYPE_FLOAT, struct.unpack("<I", struct.pack("<f", float(raw)))[0]
+    if _LITERAL_FORMATS.get(kind) in formats:
+        return kind, data
+    if "string" in formats:
+        return TYPE_STRING, None
+    raise BinaryXmlError(f"valor {raw!r} no válido para android:{name} "
+                         f"(formato {'|'.join(sorted(formats))})")
+
+
+def literal_value(raw):
+    """(tipo, dato) de un literal sin contexto de atributo; dato None = string"""
+    if raw in ("true", "false"):
+        return TYPE_INT_BOOLEAN, 0xFFFFFFFF if raw == "true" else 0
+    if _INTEGER.fullmatch(raw):
+        return TYPE_INT_DEC, int(raw) & 0xFFFFFFFF
+    if _HEX.fullmatch(raw):
+        return TYPE_INT_HEX, int(raw, 16) & 0xFFFFFFFF
+    match = _COLOR.fullmatch(raw)
+    if match:
+        return _color(match.group(1))
+    match = _DIMENSION.fullmatch(raw)
+    if match:
+        return TYPE_DIMENSION, _complex(float(match.group(1)), _DIMENSION_UNITS[match.group(2)])
+    if _FLOAT.fullmatch(raw):
+        return TYPE_FLOAT, struct.unpack("<I", struct.pack("<f", float(raw)))[0]
+    return TYPE_STRING, None
+
+
+def _named_values(name):
+    """({nombre: valor}, flags) de los enums o flags de android:name para decodificar"""
+    try:
+        definition = framework_resources.attribute(name)
+    except FrameworkError:
+        definition = None
+    if definition is None:
+        return {}, False
+    return definition.values, "flags" in definition.formats
+
+
+def format_value(name, kind, data, string=None):
+    """Texto de un Res_value tipado (inverso de typed_value)"""
+    if kind == TYPE_STRING:
+        return string
+    if kind == TYPE_INT_BOOLEAN:
+        return "true" if data else "false"
+    if kind in (TYPE_INT_DEC, TYPE_INT_HEX):
+        signed = data - (1 << 32) if data & 0x80000000 else data
+        values, flags = _named_values(name)
+        names = [key for key, value in values.items() if value & 0xFFFFFFFF == data]
+        if names:
+            # attrs.xml declara los alias obsoletos primero (fill_parent, match_parent)
+            return names[-1]
+        if flags and values:
+            parts = []
+            remaining = data
+            for key, value in sorted(values.items(), key=lambda item: -bin(item[1]).count("1")):
+                if value and remaining & value == value:
+                    parts.append(key)
+                    remaining &= ~value
+            if not remaining:
+                return "|".join(parts)
+        return f"0x{data:x}" if kind == TYPE_INT_HEX else str(signed)
+    if kind == TYPE_DIMENSION:
+        return f"{_complex_value(data):g}{_UNIT_NAMES.get(data & 0xF, 'px')}"
+    if kind == TYPE_FLOAT:
+        return format(struct.unpack("<f", struct.pack("<I", data))[0], ".7g")
+    if kind in (TYPE_INT_COLOR_ARGB8, TYPE_INT_COLOR_ARGB4):
+        digits = f"{data:08x}"
+        return f"#{digits[::2]}" if kind == TYPE_INT_COLOR_ARGB4 else f"#{digits}"
+    if kind in (TYPE_INT_COLOR_RGB8, TYPE_INT_COLOR_RGB4):
+        digits = f"{data & 0xFFFFFF:06x}"
+        return f"#{digits[::2]}" if kind == TYPE_INT_COLOR_RGB4 else f"#{digits}"
+    if kind == TYPE_REFERENCE:
+        return f"@0x{data:08x}"
+    if kind == TYPE_ATTRIBUTE:
+        return f"?0x{data:08x}"
+    return ""
+
+
+def _parse_events(text):
+    """Eventos (tipo, línea, ...) del XML de texto, sin el namespace tools"""
+    events = []
+    namespaces = []
+    pending_text = []
+
+    def flush_text():
+        content = "".join(pending_text).strip()
+        pending_text.clear()
+        if content:
+            events.append(("text", parser.CurrentLineNumber, content))
+
+    def split(qualified):
+        namespace, _, name = qualified.rpartition(" ")
+        return namespace or None, name
+
+    def start_namespace(prefix, uri):
+        namespaces.append((prefix, uri))
+        if uri != TOOLS_NS:
+            events.append(("start_ns", parser.CurrentLineNumber, prefix, uri))
+
+    def end_namespace(prefix):
+        for position in range(len(namespaces) - 1, -1, -1):
+            if namespaces[position][0] == prefix:
+                _, uri = namespaces.pop(position)
+                break
+        else:
+            return
+        if uri != TOOLS_NS:
+            events.append(("end_ns", parser.CurrentLineNumber, prefix, uri))
+
+    def start_element(qualified, attributes):
+        flush_text()
+        namespace, name = split(qualified)
+        pairs = []
+        for position in range(0, len(attributes), 2):
+            attr_namespace, attr_name = split(attributes[position])
+            if attr_namespace != TOOLS_NS:
+                pairs.append((attr_namespace, attr_name, attributes[position + 1]))
+        events.append(("start", parser.CurrentLineNumber, namespace, name, pairs))
+
+    def end_element(qualified):
+        flush_text()
+        events.append(("end", parser.CurrentLineNumber, *split(qualified)))
+
+    parser = xml.parsers.expat.ParserCreate(namespace_separator=" ")
+    parser.ordered_attributes = True
+    parser.StartNamespaceDeclHandler = start_namespace
+    parser.EndNamespaceDeclHandler = end_namespace
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = pending_text.append
+    try:
+        parser.Parse(text, True)
+    except xml.parsers.expat.ExpatError as e:
+        raise BinaryXmlError(str(e)) from None
+    return events
+
+
+def _attribute_id(namespace, name):
+    """ID del mapa de recursos de un atributo (None fuera del namespace android:)"""
+    return _framework_attribute(name)[0] if namespace == ANDROID_NS else None
+
+
+def _length8(length):
+    """Longitud de un string UTF-8 del pool (1 o 2 bytes)"""
+    if length > 0x7FFF:
+        raise BinaryXmlError(f"string de {length} caracteres demasiado largo para el pool")
+    return bytes([length]) if length < 0x80 else bytes([0x80 | (length >> 8), length & 0xFF])
+
+
+def _string_pool_chunk(strings):
+    """Chunk RES_STRING_POOL_TYPE con los strings en UTF-8"""
+    offsets = []
+    data = bytearray()
+    for value in strings:
+        offsets.append(len(data))
+        encoded = value.encode("utf-8")
+        data += _length8(len(value.encode("utf-16-le")) // 2) + _length8(len(encoded))
+        data += encoded + b"\0"
+    data += b"\0" * (-len(data) % 4)
+    strings_start = _STRING_POOL_HEADER.size + 4 * len(strings)
+    header = _STRING_POOL_HEADER.pack(RES_STRING_POOL_TYPE, _STRING_POOL_HEADER.size,
+                                      strings_start + len(data), len(strings), 0, UTF8_FLAG,
+                                      strings_start, 0)
+    return header + struct.pack(f"<{len(strings)}I", *offsets) + bytes(data)
+
+
+def _read_string(data, position, utf8):
+    if utf8:
+        # Longitud en UTF-16 (se ignora) y longitud en bytes
+        position += 2 if data[position] & 0x80 else 1
+        length = data[position]
+        if length & 0x80:
+            length = ((length & 0x7F) << 8) | data[position + 1]
+            position += 1
+        position += 1
+        return bytes(data[position:position + length]).decode("utf-8")
+    length = struct.unpack_from("<H", data, position)[0]
+    position += 2
+    if length & 0x8000:
+        length = ((length & 0x7FFF) << 16) | struct.unpack_from("<H", data, position)[0]
+        position += 2
+    return bytes(data[position:position + length * 2]).decode("utf-16-le")
+
+
+def _read_string_pool(data, position):
+    (_, header_size, _, count, _, flags, strings_start, _) = \
+        _STRING_POOL_HEADER.unpack_from(data, position)
+    offsets = struct.unpack_from(f"<{count}I", data, position + header_size)
+    base = position + strings_start
+    utf8 = bool(flags & UTF8_FLAG)
+    return [_read_string(data, base + offset, utf8) for offset in offsets]
+
+
+def compile_xml(text, resolve=None, source=None):
+    """Compilar un XML de texto (str o bytes) a XML binario
+
+    resolve(referencia) puede devolver el ID de una referencia "@tipo/nombre"
+    o "?attr" para escribirla como TYPE_REFERENCE / TYPE_ATTRIBUTE.
+    """
+    try:
+        return _compile_events(_parse_events(text), resolve)
+    except BinaryXmlError as e:
+        raise BinaryXmlError(f"{source}: {e}" if source else str(e)) from None
+
+
+def _compile_events(events, resolve):
+    attribute_ids = {}
+    for event in events:
+        if event[0] != "start":
+            continue
+        for namespace, name, _ in event[4]:
+            if (namespace, name) not in attribute_ids:
+                try:
+                    attribute_ids[(namespace, name)] = _attribute_id(namespace, name)
+                except BinaryXmlError as e:
+                    raise BinaryXmlError(f"línea {event[1]}: {e}") from None
+
+    # Pool: primero los nombres de atributo con ID (en el orden del mapa de
+    # recursos), luego el resto en orden de aparición, sin duplicados
+    resource_names = sorted({(resource_id, name)
+                             for (_, name), resource_id in attribute_ids.items()
+                             if resource_id is not None})
+    strings = [name for _, name in resource_names]
+    resource_map = [resource_id for resource_id, _ in resource_names]
+    index = {}
+
+    def ref(value, resource=False):
+        if value is None:
+            return NO_INDEX
+        if resource:
+            return strings.index(value)
+        if value not in index:
+            index[value] = len(strings)
+            strings.append(value)
+        return index[value]
+
+    nodes = []
+    for event in events:
+        kind, line = event[0], event[1]
+        if kind in ("start_ns", "end_ns"):
+            prefix, uri = event[2], event[3]
+            chunk_type = RES_XML_START_NAMESPACE_TYPE if kind == "start_ns" else \
+                RES_XML_END_NAMESPACE_TYPE
+            size = _NODE_HEADER.size + _NAMESPACE_EXT.size
+            nodes.append(_NODE_HEADER.pack(chunk_type, _NODE_HEADER.size, size, line, NO_INDEX)
+                         + _NAMESPACE_EXT.pack(ref(prefix or ""), ref(uri)))
+        elif kind == "start":
+            namespace, name, pairs = event[2], event[3], event[4]
+            # Atributos con ID ordenados por ID, después el resto por nombre
+            pairs = sorted(pairs, key=lambda pair: (
+                attribute_ids[pair[:2]] is None,
+                attribute_ids[pair[:2]] or 0, pair[0] or "", pair[1]))
+            attributes = bytearray()
+            special = {"id": 0, "class": 0, "style": 0}
+            for position, (attr_namespace, attr_name, raw) in enumerate(pairs, 1):
+                resource_id = attribute_ids[(attr_namespace, attr_name)]
+                name_index = ref(attr_name, resource=resource_id is not None)
+                try:
+                    value_type, data = typed_value(attr_namespace, attr_name, raw, resolve)
+                except BinaryXmlError as e:
+                    raise BinaryXmlError(f"línea {line}: {e}") from None
+                raw_index = NO_INDEX
+                if data is None:
+                    raw_index = data = ref(raw)
+                attributes += _ATTRIBUTE.pack(ref(attr_namespace), name_index, raw_index,
+                                              8, 0, value_type, data)
+                if (attr_namespace == ANDROID_NS and attr_name == "id") or \
+                        (attr_namespace is None and attr_name in ("class", "style")):
+                    special[attr_name] = position
+            size = _NODE_HEADER.size + _ELEMENT_EXT.size + len(attributes)
+            nodes.append(_NODE_HEADER.pack(RES_XML_START_ELEMENT_TYPE, _NODE_HEADER.size, size,
+                                           line, NO_INDEX)
+                         + _ELEMENT_EXT.pack(ref(namespace), ref(name), _ELEMENT_EXT.size,
+                                             _ATTRIBUTE.size, len(pairs), special["id"],
+                                             special["class"], special["style"])
+                         + bytes(attributes))
+        elif kind == "end":
+            size = _NODE_HEADER.size + _END_ELEMENT_EXT.size
+            nodes.append(_NODE_HEADER.pack(RES_XML_END_ELEMENT_TYPE, _NODE_HEADER.size, size,
+                                           line, NO_INDEX)
+                         + _END_ELEMENT_EXT.pack(ref(event[2]), ref(event[3])))
+        else:
+            size = _NODE_HEADER.size + _CDATA_EXT.size
+            text_index = ref(event[2])
+            nodes.append(_NODE_HEADER.pack(RES_XML_CDATA_TYPE, _NODE_HEADER.size, size,
+                                           line, NO_INDEX)
+                         + _CDATA_EXT.pack(text_index, 8, 0, TYPE_STRING, text_index))
+
+    pool = _string_pool_chunk(strings)
+    resources = b""
+    if resource_map:
+        resources = _CHUNK.pack(RES_XML_RESOURCE_MAP_TYPE, _CHUNK.size,
+                                _CHUNK.size + 4 * len(resource_map)) \
+            + struct.pack(f"<{len(resource_map)}I", *resource_map)
+    body = pool + resources + b"".join(nodes)
+    return _CHUNK.pack(RES_XML_TYPE, _CHUNK.size, _CHUNK.size + len(body)) + body
+
+
+def is_binary_xml(data):
+    """True si los datos empiezan por una cabecera RES_XML_TYPE"""
+    return len(data) >= _CHUNK.size and _CHUNK.unpack_from(data, 0)[:2] == (RES_XML_TYPE,
+                                                                            _CHUNK.size)
+
+
+def decode_xml(data):
+    """Árbol ElementTree de un XML binario, con los valores tipados como texto"""
+    if not is_binary_xml(data):
+        raise BinaryXmlError("no es un XML binario (falta la cabecera RES_XML_TYPE)")
+    _, header_size, total = _CHUNK.unpack_from(data, 0)
+    strings = []
+    root = None
+    stack = []
+
+    def string(position):
+        return None if position == NO_INDEX else strings[position]
+
+    def qualified(namespace, name):
+        namespace = string(namespace)
+        return f"{{{namespace}}}{string(name)}" if namespace else string(name)
+
+    position = header_size
+    try:
+        while position < total:
+            chunk_type, header_size, size = _CHUNK.unpack_from(data, position)
+            if size < _CHUNK.size:
+                raise BinaryXmlError(f"chunk de tamaño {size} en el offset {position}")
+            body = position + header_size
+            if chunk_type == RES_STRING_POOL_TYPE:
+                strings = _read_string_pool(data, position)
+            elif chunk_type == RES_XML_START_ELEMENT_TYPE:
+                (namespace, name, attr_start, attr_size, count, _, _, _) = \
+                    _ELEMENT_EXT.unpack_from(data, body)
+                element = ElementTree.Element(qualified(namespace, name))
+                for offset in range(body + attr_start, body + attr_start + count * attr_size,
+                                    attr_size):
+                    (attr_namespace, attr_name, raw, _, _, kind, value) = \
+                        _ATTRIBUTE.unpack_from(data, offset)
+                    text = string(raw) if raw != NO_INDEX else \
+                        (string(value) if kind == TYPE_STRING else None)
+                    element.set(qualified(attr_namespace, attr_name),
+                                format_value(string(attr_name), kind, value, text))
+                if stack:
+                    stack[-1].append(element)
+                else:
+                    root = element
+                stack.append(element)
+            elif chunk_type == RES_XML_END_ELEMENT_TYPE:
+                stack.pop()
+            elif chunk_type == RES_XML_CDATA_TYPE and stack:
+                stack[-1].text = (stack[-1].text or "") + string(
+                    _CDATA_EXT.unpack_from(data, body)[0])
+            position += size
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise BinaryXmlError(f"XML binario dañado ({e})") from None
+    if root is None:
+        raise BinaryXmlError("XML binario sin elemento raíz")
+    return root
+
+
+def _normalized(element):
+    """Árbol del XML de texto con los valores pasados por typed_value/format_value"""
+    copy = ElementTree.Element(element.tag)
+    for key, raw in element.attrib.items():
+        namespace, _, attr_name = key[1:].partition("}") if key.startswith("{") else \
+            (None, None, key)
+        if namespace == TOOLS_NS:
+            continue
+        kind, data = typed_value(namespace, attr_name, raw)
+        copy.set(key, format_value(attr_name, kind, data, raw))
+    copy.text = (element.text or "").strip() or None
+    copy.extend(_normalized(child) for child in element)
+    return copy
+
+
+def _same_tree(left, right):
+    return (left.tag == right.tag and left.attrib == right.attrib
+            and (left.text or None) == (right.text or None) and len(left) == len(right)
+            and all(_same_tree(a, b) for a, b in zip(left, right)))
+
+
+def round_trip_matches(text):
+    """True si compilar y decodificar el XML devuelve el mismo árbol"""
+    source = ElementTree.fromstring(text)
+    return _same_tree(_normalized(source), decode_xml(compile_xml(text)))
+
+
+def to_xml(element):
+    """XML de texto indentado de un árbol decodificado"""
+    ElementTree.register_namespace("android", ANDROID_NS)
+    ElementTree.register_namespace("app", "http://schemas.android.com/apk/res-auto")
+    ElementTree.indent(element)
+    return ElementTree.tostring(element, encoding="unicode")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compilar XML de Android a XML binario (AXML)")
+    parser.add_argument("paths", nargs="+", metavar="XML", help="XML de texto o binario")
+    parser.add_argument("--decode", action="store_true",
+                        help="Decodificar XML binario y mostrarlo como texto")
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        try:
+            if args.decode:
+                print(to_xml(decode_xml(data)))
+                continue
+            compiled = compile_xml(data)
+            matches = round_trip_matches(data)
+        except BinaryXmlError as e:
+            print(f"❌ {path}: {e}")
+            failed = True
+            continue
+        status = "✅" if matches else "❌ round trip distinto"
+        print(f"{status} {path}: {len(data)} B texto -> {len(compiled)} B binario")
+        failed = failed or not matches
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Generación en paralelo de los assets de TheCookFlow
+Punto de entrada único para todo lo que producen generate_icons.py y
+generate_play_store_assets.py: iconos por densidad, splash, icono de Play
+Store, screenshots (la matriz idioma × dispositivo de screenshots.json),
+feature graphic y guión del vídeo.
+
+Cada trabajo renderiza y codifica su PNG en un proceso de un pool (la
+codificación PNG de las imágenes grandes es lo más lento y no suelta el
+GIL), así que el conjunto completo tarda lo que la imagen más lenta. Todos
+los tamaños del icono son un solo trabajo: el master supersampleado se
+dibuja una vez y no en cada proceso. Los trabajos que dependen de otro (los
+screenshots pegan el icono xxxhdpi) se lanzan en cuanto termina su
+dependencia.
+
+Las salidas se escriben en "<ruta>.tmp" y se renombran al terminar: un
+fallo a mitad deja el archivo anterior intacto, y una salida cuyo contenido
+no cambia no se reescribe. Con la caché de assets (asset_cache.py) los
+trabajos cuyas entradas no cambiaron ni siquiera se lanzan.
+
+Con --optimize cada PNG pasa por png_optimizer.py (la codificación sin
+pérdida más pequeña entre varias pruebas) y con --webp los recursos del
+APK salen como WebP sin pérdida en lugar de PNG.
+
+generate_icons.py y generate_play_store_assets.py ejecutan su parte
+("icons" / "store") con este mismo planificador.
+
+Uso:
+    python android/build_assets.py -j 0
+    python android/build_assets.py -j 4 --trace assets.json
+    python android/build_assets.py --no-cache
+    python android/build_assets.py --optimize --webp
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from PIL import Image
+
+import backgrounds
+import fonts
+import png_optimizer
+from asset_cache import AssetCache, write_if_changed
+from fonts import font_files
+from generate_icons import ICON_SIZES, LOGO_SIZE, icon_pngs
+from generate_play_store_assets import (FEATURE_GRAPHIC_PATH, LOGO_PATH, VIDEO_SCRIPT_PATH,
+                                        ScreenshotSpecError, create_feature_graphic,
+                                        create_screenshot_mockup, load_screenshots,
+                                        promo_video_script)
+from png_optimizer import WEBP_OPTIONS, Trial, encode_trial, optimize_image
+from tracing import add_tracing_arguments, phase, tracing
+
+RES_DIR = 'android/app/src/main/res'
+
+ASSET_GROUPS = ("icons", "store")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Trabajo: nombre, grupo, función que devuelve una imagen/bytes/texto (el
+# mismo para todas las salidas) o una tupla con uno por salida, sus
+# argumentos, rutas de salida, trabajos previos y archivos que lee el render
+# (forman parte de la clave de caché)
+AssetJob = namedtuple("AssetJob", "name group render args outputs after inputs")
+
+# Resultado de un trabajo (size, bytes escritos entre todas sus salidas;
+# tiempos medidos en el proceso que lo ejecutó; cached si salió de la caché
+# sin renderizar; saved, bytes ahorrados frente al PNG por defecto de Pillow)
+AssetResult = namedtuple("AssetResult", "name outputs size wall_seconds cpu_seconds pid cached saved")
+
+
+class AssetError(Exception):
+    """Trabajos de assets imposibles de planificar"""
+
+
+def resource_path(path, webp=False):
+    """Ruta de salida de un recurso: con webp, los del APK pasan a .webp"""
+    if webp and path.startswith(RES_DIR) and path.endswith(".png"):
+        return f"{path[:-4]}.webp"
+    return path
+
+
+def asset_jobs(groups=ASSET_GROUPS, webp=False):
+    """Trabajos del juego de assets de los grupos pedidos, los más lentos primero"""
+    # Las fuentes que resuelve el registro y su código también deciden el render
+    font_inputs = (*font_files(), fonts.__file__)
+    store_inputs = (*font_inputs, backgrounds.__file__)
+    # Todos los tamaños del icono en un trabajo: un render del master para todos
+    icon_outputs = [(size, resource_path(f'{RES_DIR}/{folder}/{name}.png', webp))
+                    for folder, size in ICON_SIZES.items()
+                    for name in ("ic_launcher", "ic_launcher_round")]
+    icon_outputs += [(LOGO_SIZE, resource_path(f'{RES_DIR}/drawable/splash_logo.png', webp)),
+                     (LOGO_SIZE, 'play_store_assets/ic_launcher_512.png')]
+    icons_job = AssetJob("icons", "icons", icon_pngs, (tuple(size for size, _ in icon_outputs),),
+                         tuple(path for _, path in icon_outputs), (), font_inputs)
+    jobs = [icons_job]
+    # Los screenshots leen el icono xxxhdpi de disco
+    logo_path = resource_path(LOGO_PATH, webp)
+    if "store" in groups:
+        jobs += [AssetJob(f"screenshot_{shot.locale}_{shot.device}_{shot.index}", "store",
+                          create_screenshot_mockup,
+                          (*shot.size, shot.title, shot.subtitle, shot.features, logo_path),
+                          (shot.path,), (icons_job.name,), (logo_path, *store_inputs))
+                 for shot in load_screenshots()]
+    jobs.append(AssetJob("feature_graphic", "store", create_feature_graphic, (),
+                         (FEATURE_GRAPHIC_PATH,), (), store_inputs))
+    jobs.append(AssetJob("video_script", "store", promo_video_script, (), (VIDEO_SCRIPT_PATH,),
+                         (), ()))
+    return [job for job in jobs if job.group in groups]
+
+
+def image_format(path):
+    """Formato de imagen de una ruta de salida ("PNG" o "WEBP")"""
+    return "WEBP" if path.endswith(".webp") else "PNG"
+
+
+def encode_png(image):
+    """PNG de una imagen de Pillow en memoria"""
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def encode_image(image, image_format="PNG", optimize=False):
+    """(bytes, bytes ahorrados frente al PNG por defecto) de una imagen
+
+    En WebP siempre es la codificación sin pérdida; con optimize, el PNG es
+    la prueba más pequeña de png_optimizer.py.
+    """
+    if image_format == "PNG" and not optimize:
+        return encode_png(image), 0
+    plain = len(encode_png(image))
+    if image_format == "WEBP":
+        data = encode_trial(Trial("webp", image, "WEBP", WEBP_OPTIONS))
+    else:
+        data, _ = optimize_image(image)
+    return data, plain - len(data)
+
+
+def cache_args(job, optimize=False):
+    """Argumentos de la clave de caché: los del render y la codificación si no es la de siempre"""
+    formats = [image_format(path) for path in job.outputs]
+    encoding = formats if set(formats) != {"PNG"} else []
+    if optimize:
+        encoding.append("optimize")
+    return [job.args, encoding] if encoding else job.args
+
+
+def encode_output(content, path, optimize=False):
+    """(bytes, bytes ahorrados) del contenido de una salida en el formato de su ruta"""
+    if (isinstance(content, bytes) and content.startswith(PNG_SIGNATURE)
+            and (optimize or image_format(path) != "PNG")):
+        # PNG ya codificado (iconos) que hay que recomprimir o pasar a WebP
+        content = Image.open(io.BytesIO(content))
+    if isinstance(content, str):
+        return content.encode("utf-8"), 0
+    if isinstance(content, bytes):
+        return content, 0
+    return encode_image(content, image_format(path), optimize)
+
+
+def run_job(job, cache_root=None, optimize=False):
+    """Renderizar, codificar y escribir un asset (se ejecuta en el pool)
+
+    Con cache_root, los bytes se guardan también como blobs de la caché.
+    Devuelve (AssetResult, sha256 del blob de cada salida o None).
+    """
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    rendered = job.render(*job.args)
+    contents = rendered if isinstance(rendered, tuple) else (rendered,) * len(job.outputs)
+    # Las salidas con el mismo contenido y formato se codifican una vez
+    encoded = {}
+    size = saved = 0
+    digests = []
+    cache = AssetCache(cache_root) if cache_root else None
+    for content, path in zip(contents, job.outputs):
+        encoding = (id(content), image_format(path))
+        if encoding not in encoded:
+            encoded[encoding] = encode_output(content, path, optimize)
+        data, path_saved = encoded[encoding]
+        write_if_changed(path, data)
+        size += len(data)
+        saved += path_saved
+        digests.append(cache.put_blob(data) if cache is not None else None)
+    return AssetResult(job.name, job.outputs, size, time.perf_counter() - start,
+                       time.process_time() - cpu_start, os.getpid(), False, saved), digests
+
+
+def remove_replaced(jobs):
+    """Borrar el PNG o WebP que sustituye cada salida (el APK no admite ambos)"""
+    removed = []
+    for job in jobs:
+        for path in job.outputs:
+            stem, extension = os.path.splitext(path)
+            if path.startswith(RES_DIR) and extension in (".png", ".webp"):
+                other = stem + (".webp" if extension == ".png" else ".png")
+                if os.path.exists(other):
+                    os.remove(other)
+                    removed.append(other)
+    return removed
+
+
+def _ready(pending, finished, names):
+    # Las dependencias fuera de la selección ya están en disco
+    return [job for job in pending
+            if all(name in finished or name not in names for name in job.after)]
+
+
+def build_assets(jobs, workers=0, cache=None, optimize=False):
+    """Ejecutar los trabajos en paralelo respetando sus dependencias
+
+    Con workers=1 se ejecutan en este mismo proceso. Con caché, los trabajos
+    cuyas entradas no cambiaron se resuelven aquí sin lanzarlos. Con
+    optimize, los PNG se recomprimen sin pérdida. Devuelve los AssetResult
+    en orden de finalización.
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    names = {job.name for job in jobs}
+    pending = list(jobs)
+    finished = {}
+    keys = {}
+
+    def from_cache(job):
+        if cache is None:
+            return False
+        inputs = (*job.inputs, png_optimizer.__file__) if optimize else job.inputs
+        keys[job.name] = cache.key(job.render, cache_args(job, optimize), inputs)
+        size = cache.get(keys[job.name], job.outputs)
+        if size is None:
+            return False
+        finished[job.name] = AssetResult(job.name, job.outputs, size, 0.0, 0.0, os.getpid(),
+                                         True, 0)
+        return True
+
+    def done(job, outcome):
+        result, digests = outcome
+        if cache is not None:
+            cache.record(keys[job.name], digests, result.size, job.outputs)
+        finished[job.name] = result
+
+    cache_root = cache.root if cache is not None else None
+    if workers == 1:
+        while pending:
+            ready = _ready(pending, finished, names)
+            if not ready:
+                raise AssetError("dependencias circulares entre trabajos")
+            for job in ready:
+                pending.remove(job)
+                if not from_cache(job):
+                    done(job, run_job(job, cache_root, optimize))
+        return list(finished.values())
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        while pending or running:
+            # Un acierto de caché puede desbloquear otros trabajos en el acto
+            ready = _ready(pending, finished, names)
+            while ready:
+                for job in ready:
+                    pending.remove(job)
+                    if not from_cache(job):
+                        running[pool.submit(run_job, job, cache_root, optimize)] = job
+                ready = _ready(pending, finished, names)
+            if not running:
+                if pending:
+                    raise AssetError("dependencias circulares entre trabajos")
+                break
+            completed, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in completed:
+                done(running.pop(future), future.result())
+    return list(finished.values())
+
+
+def print_report(results, wall_seconds, workers, cache=None):
+    """Tiempo por asset y comparación con la suma secuencial"""
+    files = sum(len(result.outputs) for result in results)
+    print(f"🎨 {files} archivos en {len(results)} trabajos con {workers} procesos:")
+    width = max((len(result.name) for result in results), default=0)
+    for result in sorted(results, key=lambda result: -result.wall_seconds):
+        timing = "  en caché" if result.cached else f"{result.wall_seconds * 1000:>8.1f} ms"
+        saved = f"-{result.saved / 1024:.1f} KB" if result.saved else ""
+        names = sorted({os.path.basename(path) for path in result.outputs})
+        outputs = ", ".join(names) if len(names) <= 3 else f"{len(result.outputs)} archivos"
+        print(f"  {result.name:<{width}} {timing:>11} {result.size / 1024:>8.1f} KB {saved:>10}  "
+              f"{outputs}")
+    total = sum(result.wall_seconds for result in results)
+    slowest = max((result.wall_seconds for result in results), default=0.0)
+    print(f"⏱️  {wall_seconds * 1000:.0f} ms de pared (suma de trabajos {total * 1000:.0f} ms, "
+          f"el más lento {slowest * 1000:.0f} ms)")
+    saved = sum(result.saved for result in results)
+    if saved:
+        print(f"🗜️  Ahorrados {saved / 1024:.1f} KB frente al PNG por defecto")
+    if cache is not None:
+        print(f"♻️  Caché: {cache.summary()}")
+
+
+def generate(groups=ASSET_GROUPS, workers=0, use_cache=True, trace_path=None, profile_path=None,
+             optimize=False, webp=False):
+    """Generar los assets de los grupos pedidos e informar (entrada de los scripts)"""
+    workers = max(1, workers or os.cpu_count() or 1)
+    cache = AssetCache() if use_cache else None
+    jobs = asset_jobs(groups, webp)
+    with tracing(trace_path, profile_path):
+        with phase("assets", groups=",".join(groups), jobs=workers) as traced:
+            try:
+                results = build_assets(jobs, workers, cache, optimize)
+            finally:
+                if cache is not None:
+                    cache.save()
+            for path in remove_replaced(jobs):
+                print(f"🧹 {path} sustituido por la otra versión")
+            traced.bytes_written = sum(result.size for result in results if not result.cached)
+    print_report(results, traced.wall_seconds, workers, cache)
+    return results
+
+
+def add_asset_arguments(parser, jobs=0):
+    """Añadir -j/--jobs, --no-cache, --optimize y --webp a un ArgumentParser"""
+    parser.add_argument("--jobs", "-j", type=int, default=jobs,
+                        help="Procesos en paralelo (0 = todos los núcleos)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Regenerar todo sin consultar la caché de assets")
+    parser.add_argument("--optimize", action="store_true",
+                        help="Recomprimir los PNG sin pérdida (paleta, niveles y estrategias de zlib)")
+    parser.add_argument("--webp", action="store_true",
+                        help="Generar los recursos del APK como WebP sin pérdida (minSdk 24)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Iconos y assets de Play Store en paralelo")
+    add_asset_arguments(parser)
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        generate(ASSET_GROUPS, args.jobs, not args.no_cache, args.trace, args.profile,
+                 args.optimize, args.webp)
+    except (AssetError, ScreenshotSpecError, OSError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
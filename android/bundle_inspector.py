@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Inspector de .aab/.apk de TheCookFlow
+Mapea el artefacto en memoria y lee solo el registro de fin de directorio
+central (EOCD, con Zip64 si hace falta) y el directorio central: el listado
+no descomprime nada y tarda milisegundos incluso en artefactos grandes.
+
+Con --verify se comprueba además el CRC32 de cada entrada, inflando por
+chunks directamente desde el mmap en varios hilos (zlib libera el GIL).
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from bundle_writer import (CHUNK_SIZE, ZIP64_COUNT_LIMIT, ZIP64_LIMIT, ZIP_DEFLATED, ZIP_STORED,
+                           _CENTRAL_HEADER, _END_RECORD, _LOCAL_HEADER, _ZIP64_END_LOCATOR,
+                           _ZIP64_END_RECORD, _ZIP64_EXTRA_ID, alignment_for)
+
+# Entrada del directorio central; data_offset sale de la cabecera local
+CentralEntry = namedtuple("CentralEntry",
+                          "name method crc compressed_size size header_offset data_offset")
+
+METHOD_NAMES = {ZIP_STORED: "stored", ZIP_DEFLATED: "deflate"}
+
+# El EOCD mide 22 bytes más un comentario de hasta 64 KiB
+_MAX_EOCD_SEARCH = _END_RECORD.size + 0xFFFF
+
+
+class BundleFormatError(Exception):
+    """El archivo no es un zip válido o su directorio central está dañado"""
+
+
+def _find_end_record(mm):
+    """Offset del EOCD, buscando hacia atrás desde el final del archivo"""
+    start = max(0, len(mm) - _MAX_EOCD_SEARCH)
+    offset = mm.rfind(b"PK\x05\x06", start)
+    if offset < 0:
+        raise BundleFormatError("no se encontró el fin del directorio central")
+    return offset
+
+
+def _zip64_values(extra, fields):
+    """Sustituir por los del campo extra Zip64 los valores saturados a 0xFFFFFFFF"""
+    position = 0
+    while position + 4 <= len(extra):
+        header_id, length = struct.unpack_from("<HH", extra, position)
+        if header_id == _ZIP64_EXTRA_ID:
+            values = iter(struct.unpack_from(f"<{length // 8}Q", extra, position + 4))
+            return [next(values) if value == ZIP64_LIMIT else value for value in fields]
+        position += 4 + length
+    return fields
+
+
+def read_central_directory(mm):
+    """Parsear el directorio central de un archivo mapeado en memoria"""
+    end = _find_end_record(mm)
+    (_, _, _, _, count, cd_size, cd_offset, _) = _END_RECORD.unpack_from(mm, end)
+    locator = end - _ZIP64_END_LOCATOR.size
+    if (count == ZIP64_COUNT_LIMIT or cd_offset == ZIP64_LIMIT) and locator >= 0 \
+            and mm[locator:locator + 4] == b"PK\x06\x07":
+        _, _, record_offset, _ = _ZIP64_END_LOCATOR.unpack_from(mm, locator)
+        fields = _ZIP64_END_RECORD.unpack_from(mm, record_offset)
+        count, cd_size, cd_offset = fields[7], fields[8], fields[9]
+    if cd_offset + cd_size > end:
+        raise BundleFormatError("el directorio central se sale del archivo")
+
+    entries = []
+    position = cd_offset
+    for _ in range(count):
+        fields = _CENTRAL_HEADER.unpack_from(mm, position)
+        if fields[0] != 0x02014B50:
+            raise BundleFormatError(f"cabecera central inválida en el offset {position}")
+        method, crc = fields[4], fields[7]
+        name_length, extra_length, comment_length = fields[10], fields[11], fields[12]
+        name_start = position + _CENTRAL_HEADER.size
+        name = mm[name_start:name_start + name_length].decode("utf-8")
+        extra = mm[name_start + name_length:name_start + name_length + extra_length]
+        size, compressed_size, header_offset = _zip64_values(
+            extra, [fields[9], fields[8], fields[16]])
+        # Solo se leen los 30 bytes de la cabecera local para ubicar los datos
+        local = _LOCAL_HEADER.unpack_from(mm, header_offset)
+        if local[0] != 0x04034B50:
+            raise BundleFormatError(f"{name}: cabecera local inválida")
+        data_offset = header_offset + _LOCAL_HEADER.size + local[9] + local[10]
+        entries.append(CentralEntry(name, method, crc, compressed_size, size,
+                                    header_offset, data_offset))
+        position = name_start + name_length + extra_length + comment_length
+    return entries
+
+
+def is_aligned(entry):
+    """Las entradas STORED deben estar alineadas como las deja zipalign"""
+    return entry.method != ZIP_STORED or entry.data_offset % alignment_for(entry.name) == 0
+
+
+def verify_entry(mm, entry):
+    """Comprobar el CRC32 de una entrada inflándola por chunks; devuelve un error o None"""
+    if entry.method not in METHOD_NAMES:
+        return f"método de compresión {entry.method} no soportado"
+    decompressor = zlib.decompressobj(-15) if entry.method == ZIP_DEFLATED else None
+    crc = 0
+    size = 0
+    end = entry.data_offset + entry.compressed_size
+    try:
+        for start in range(entry.data_offset, end, CHUNK_SIZE):
+            chunk = mm[start:min(start + CHUNK_SIZE, end)]
+            if decompressor:
+                chunk = decompressor.decompress(chunk)
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+        if decompressor:
+            tail = decompressor.flush()
+            crc = zlib.crc32(tail, crc)
+            size += len(tail)
+    except zlib.error as e:
+        return f"datos deflate dañados ({e})"
+    if size != entry.size:
+        return f"tamaño {size} != {entry.size}"
+    if crc != entry.crc:
+        return f"CRC {crc:08x} != {entry.crc:08x}"
+    return None
+
+
+def verify_entries(mm, entries, jobs=1):
+    """Verificar todas las entradas en paralelo; devuelve [(nombre, error)]"""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1:
+        results = [verify_entry(mm, entry) for entry in entries]
+    else:
+        # Las entradas más grandes primero para repartir mejor la carga
+        ordered = sorted(entries, key=lambda entry: entry.compressed_size, reverse=True)
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            by_name = dict(zip((entry.name for entry in ordered),
+                               pool.map(lambda entry: verify_entry(mm, entry), ordered)))
+        results = [by_name[entry.name] for entry in entries]
+    return [(entry.name, error) for entry, error in zip(entries, results) if error]
+
+
+def inspect_bundle(path, verify=False, jobs=1):
+    """Listar (y opcionalmente verificar) un .aab/.apk
+
+    Devuelve (entradas, errores de CRC, segundos de listado, segundos de verificación).
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = time.perf_counter()
+        entries = read_central_directory(mm)
+        list_seconds = time.perf_counter() - start
+        errors = []
+        verify_seconds = 0.0
+        if verify:
+            start = time.perf_counter()
+            errors = verify_entries(mm, entries, jobs)
+            verify_seconds = time.perf_counter() - start
+    return entries, errors, list_seconds, verify_seconds
+
+
+def print_report(path, entries, errors, list_seconds, verify_seconds, verify=False, limit=None):
+    """Tabla por entrada más el resumen de tamaños y alineación"""
+    print(f"📋 {path}: {len(entries)} entradas (directorio central leído en "
+          f"{list_seconds * 1000:.2f} ms)")
+    shown = entries if limit is None else entries[:limit]
+    for entry in shown:
+        ratio = entry.compressed_size / entry.size * 100 if entry.size else 100.0
+        alignment = "" if entry.method != ZIP_STORED else \
+            (" alineada" if is_aligned(entry) else " ⚠️  SIN ALINEAR")
+        print(f"  {entry.compressed_size:>10} / {entry.size:>10} B {ratio:5.1f}% "
+              f"{METHOD_NAMES.get(entry.method, entry.method):<7} {entry.name}{alignment}")
+    if len(shown) < len(entries):
+        print(f"  ... y {len(entries) - len(shown)} entradas más")
+    compressed = sum(entry.compressed_size for entry in entries)
+    raw = sum(entry.size for entry in entries)
+    misaligned = [entry.name for entry in entries if not is_aligned(entry)]
+    print(f"📊 Comprimido {compressed / 1024:.1f} KB / sin comprimir {raw / 1024:.1f} KB")
+    if misaligned:
+        print(f"⚠️  {len(misaligned)} entradas STORED sin alinear")
+    if verify:
+        for name, error in errors:
+            print(f"❌ {name}: {error}")
+        status = "✅ CRC correcto" if not errors else f"❌ {len(errors)} entradas dañadas"
+        print(f"{status} en {len(entries)} entradas ({verify_seconds * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspector de .aab/.apk de TheCookFlow")
+    parser.add_argument("paths", nargs="+", metavar="ARTEFACTO", help=".aab o .apk a inspeccionar")
+    parser.add_argument("--verify", action="store_true",
+                        help="Comprobar el CRC32 de todas las entradas")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="Hilos de verificación en paralelo (0 = todos los núcleos)")
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.paths:
+        try:
+            entries, errors, list_seconds, verify_seconds = inspect_bundle(
+                path, args.verify, args.jobs)
+        except (OSError, ValueError, struct.error, BundleFormatError) as e:
+            print(f"❌ {path}: {e}")
+            failed = True
+            continue
+        print_report(path, entries, errors, list_seconds, verify_seconds, args.verify)
+        failed = failed or bool(errors) or not all(is_aligned(entry) for entry in entries)
+    sys.exit(1 if failed else 0)
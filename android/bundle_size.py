@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Análisis de tamaño de los .aab/.apk de TheCookFlow
+Desglosa un artefacto por categoría (manifest, res por densidad, tabla de
+recursos, assets, fuentes, dex, nativo...) en bytes comprimidos y sin comprimir, leyendo solo
+el directorio central. Cada compilación se añade como una línea JSON
+compacta a un historial local para comparar con la anterior, y los
+presupuestos por categoría (size_budgets.json, en KB comprimidos) hacen
+fallar la compilación cuando se superan.
+"""
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+import time
+
+from bundle_inspector import read_central_directory
+from entry_cache import DEFAULT_CACHE_DIR
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BUDGETS_FILE = os.path.join(HERE, "size_budgets.json")
+HISTORY_FILE = os.path.join(DEFAULT_CACHE_DIR, "size-history.jsonl")
+
+# Tabla de recursos compilada: resources.pb en el .aab, resources.arsc en el .apk
+RESOURCE_TABLES = ("resources.pb", "resources.arsc")
+
+# Calificador de densidad en los directorios de res/ (drawable-xhdpi, mipmap-anydpi-v26...)
+_DENSITY = re.compile(r"-(ldpi|mdpi|tvdpi|hdpi|xhdpi|xxhdpi|xxxhdpi|nodpi|anydpi)(?:-|$)")
+
+
+def density_qualifier(module_path):
+    """Densidad de un recurso de res/ ("xhdpi"...), o None si no tiene calificador"""
+    parts = module_path.split("/")
+    if len(parts) < 3 or parts[0] != "res":
+        return None
+    match = _DENSITY.search(parts[1])
+    return match.group(1) if match else None
+
+
+def category_for(name):
+    """Categoría de una entrada del .aab o del .apk"""
+    if name.startswith("base/"):
+        name = name[len("base/"):]
+    if name.endswith("AndroidManifest.xml"):
+        return "manifest"
+    if name.endswith(".dex"):
+        return "dex"
+    if name.startswith("lib/") or name.endswith(".so"):
+        return "native"
+    if name.startswith("res/font/") or name.endswith((".ttf", ".otf")):
+        return "fonts"
+    if name.startswith("assets/"):
+        return "assets"
+    if name in RESOURCE_TABLES:
+        return "res/table"
+    if name.startswith("res/"):
+        return f"res/{density_qualifier(name) or 'default'}"
+    return "metadata"
+
+
+def size_breakdown(path):
+    """{categoría: [comprimido, sin comprimir]} y {entrada: [comprimido, sin comprimir]}"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        entries = read_central_directory(mm)
+    categories = {}
+    sizes = {}
+    for entry in entries:
+        totals = categories.setdefault(category_for(entry.name), [0, 0])
+        totals[0] += entry.compressed_size
+        totals[1] += entry.size
+        sizes[entry.name] = [entry.compressed_size, entry.size]
+    return categories, sizes
+
+
+def load_budgets(path=BUDGETS_FILE):
+    """Presupuestos en KB comprimidos; 'res' cubre todas las categorías res/*"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def over_budget(categories, budgets):
+    """Lista de (presupuesto, KB usados, KB permitidos) que se superan"""
+    violations = []
+    for name, limit_kb in sorted(budgets.items()):
+        used = sum(compressed for category, (compressed, _) in categories.items()
+                   if name == "total" or category == name or category.startswith(f"{name}/"))
+        if used / 1024 > limit_kb:
+            violations.append((name, used / 1024, limit_kb))
+    return violations
+
+
+def last_record(artifact, history=HISTORY_FILE):
+    """Última línea del historial para el mismo artefacto, o None"""
+    previous = None
+    try:
+        with open(history, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("artifact") == artifact:
+                    previous = record
+    except FileNotFoundError:
+        pass
+    return previous
+
+
+def append_record(record, history=HISTORY_FILE):
+    """Añadir una compilación al historial (una línea JSON sin espacios)"""
+    os.makedirs(os.path.dirname(history) or ".", exist_ok=True)
+    with open(history, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, separators=(",", ":"), sort_keys=True) + "\n")
+
+
+def _delta(current, previous):
+    if previous is None:
+        return ""
+    change = (current - previous) / 1024
+    return f" ({change:+.1f} KB)" if change else ""
+
+
+def print_breakdown(path, categories, sizes, previous=None, top=5):
+    """Tabla por categoría con la variación respecto a la compilación anterior"""
+    before = previous["categories"] if previous else {}
+    compressed = sum(c for c, _ in categories.values())
+    raw = sum(r for _, r in categories.values())
+    print(f"📦 Tamaño de {path}: {compressed / 1024:.1f} KB comprimido / {raw / 1024:.1f} KB "
+          f"sin comprimir{_delta(compressed, previous and sum(c for c, _ in before.values()))}")
+    for category, (c, r) in sorted(categories.items(), key=lambda item: -item[1][0]):
+        print(f"  {category:<14} {c / 1024:>9.1f} KB / {r / 1024:>9.1f} KB"
+              f"{_delta(c, before.get(category, [0])[0] if previous else None)}")
+    if previous:
+        # Entradas que más han crecido desde la compilación anterior
+        old = previous.get("entries", {})
+        grown = sorted(((c - old.get(name, [0])[0], name) for name, (c, _) in sizes.items()),
+                       reverse=True)
+        grown = [(change, name) for change, name in grown[:top] if change > 0]
+        for change, name in grown:
+            print(f"  📈 {name}: +{change / 1024:.1f} KB")
+
+
+def track_bundle_size(path, budgets=None, history=HISTORY_FILE):
+    """Analizar un artefacto, guardarlo en el historial y comprobar presupuestos
+
+    Devuelve True si todas las categorías están dentro de presupuesto.
+    """
+    budgets = load_budgets() if budgets is None else budgets
+    categories, sizes = size_breakdown(path)
+    artifact = os.path.basename(path)
+    previous = last_record(artifact, history)
+    print_breakdown(path, categories, sizes, previous)
+    append_record({"artifact": artifact, "time": int(time.time()),
+                   "categories": categories, "entries": sizes}, history)
+    violations = over_budget(categories, budgets)
+    for name, used_kb, limit_kb in violations:
+        print(f"❌ Presupuesto de tamaño superado: {name} {used_kb:.1f} KB > {limit_kb} KB")
+    return not violations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Desglose de tamaño de .aab/.apk de TheCookFlow")
+    parser.add_argument("paths", nargs="+", metavar="ARTEFACTO", help=".aab o .apk a analizar")
+    parser.add_argument("--budgets", default=BUDGETS_FILE,
+                        help="JSON con presupuestos por categoría en KB comprimidos")
+    parser.add_argument("--history", default=HISTORY_FILE, help="Historial de tamaños (JSON lines)")
+    args = parser.parse_args()
+
+    budgets = load_budgets(args.budgets)
+    ok = True
+    for path in args.paths:
+        ok = track_bundle_size(path, budgets, args.history) and ok
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+APKs divididos locales a partir del App Bundle de TheCookFlow
+Hace en local lo que bundletool build-apks: parte el módulo base del .aab en
+un APK maestro y un APK de configuración por cada densidad de pantalla (y
+por ABI si hay librerías nativas), según las split_dimension habilitadas en
+BUNDLE_CONFIG. Los datos ya comprimidos se copian en crudo desde el .aab.
+
+Con --device-spec (mismo JSON que bundletool: screenDensity, supportedAbis)
+se eligen los APKs que instalaría ese dispositivo y se calcula su tamaño
+de descarga real.
+"""
+import argparse
+import json
+import mmap
+import os
+import sys
+
+from bundle_inspector import read_central_directory
+from bundle_size import density_qualifier
+from bundle_writer import BundleWriter, CompressedEntry, RawSlice
+from packager import (BUNDLE_CONFIG, DEFAULT_VARIANT, VARIANTS, apk_path, create_split_manifest,
+                      release_aab)
+
+# dpi de cada bucket de densidad (nodpi/anydpi van siempre en el maestro)
+DENSITY_DPI = {
+    "ldpi": 120,
+    "mdpi": 160,
+    "tvdpi": 213,
+    "hdpi": 240,
+    "xhdpi": 320,
+    "xxhdpi": 480,
+    "xxxhdpi": 640,
+}
+
+MASTER_SPLIT = "master"
+
+
+def enabled_dimensions(config=BUNDLE_CONFIG):
+    """Dimensiones de split activas en la configuración del bundle"""
+    dimensions = config["optimizations"]["splits_config"]["split_dimension"]
+    return {dimension["value"] for dimension in dimensions if not dimension["negate"]}
+
+
+def split_for(module_path, dimensions):
+    """Split al que va una entrada del módulo: "xhdpi", "arm64_v8a" o el maestro"""
+    if "SCREEN_DENSITY" in dimensions:
+        density = density_qualifier(module_path)
+        if density in DENSITY_DPI:
+            return density
+    if "ABI" in dimensions and module_path.startswith("lib/"):
+        return module_path.split("/")[1].replace("-", "_")
+    return MASTER_SPLIT
+
+
+def build_split_apks(aab, out_dir, config=BUNDLE_CONFIG, deterministic=False,
+                     variant=DEFAULT_VARIANT):
+    """Generar base-master.apk y base-<config>.apk en out_dir
+
+    Devuelve {split: ruta del APK}.
+    """
+    dimensions = enabled_dimensions(config)
+    with open(aab, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        entries = read_central_directory(mm)
+
+    splits = {}
+    for entry in entries:
+        if not entry.name.startswith("base/"):
+            continue
+        module_path = entry.name[len("base/"):]
+        arcname = apk_path(module_path)
+        if arcname is None:
+            continue
+        compressed = CompressedEntry(entry.method, entry.crc, entry.size,
+                                     RawSlice(aab, entry.data_offset, entry.compressed_size))
+        splits.setdefault(split_for(module_path, dimensions), []).append((arcname, compressed))
+
+    os.makedirs(out_dir, exist_ok=True)
+    outputs = {}
+    for split, split_entries in sorted(splits.items()):
+        path = os.path.join(out_dir, f"base-{split}.apk")
+        with BundleWriter(path, deterministic=deterministic) as writer:
+            if split != MASTER_SPLIT:
+                writer.add("AndroidManifest.xml", create_split_manifest(f"config.{split}", variant))
+            for arcname, compressed in sorted(split_entries, key=lambda item: item[0]):
+                writer.add_compressed(arcname, compressed)
+        outputs[split] = path
+    return outputs
+
+
+def select_density(available, screen_density):
+    """Bucket más pequeño que cubre el dpi del dispositivo (o el mayor disponible)"""
+    buckets = sorted(available, key=DENSITY_DPI.get)
+    for bucket in buckets:
+        if DENSITY_DPI[bucket] >= screen_density:
+            return bucket
+    return buckets[-1] if buckets else None
+
+
+def select_splits(outputs, device_spec):
+    """APKs que instalaría un dispositivo descrito por un device-spec de bundletool"""
+    selected = [MASTER_SPLIT] if MASTER_SPLIT in outputs else []
+    densities = [split for split in outputs if split in DENSITY_DPI]
+    if densities and "screenDensity" in device_spec:
+        selected.append(select_density(densities, device_spec["screenDensity"]))
+    for abi in device_spec.get("supportedAbis", []):
+        split = abi.replace("-", "_")
+        if split in outputs:
+            # Solo la ABI preferida, como hace Play
+            selected.append(split)
+            break
+    return selected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="APKs divididos por densidad a partir del .aab")
+    parser.add_argument("aab", nargs="?", default=release_aab(), help="App Bundle de entrada")
+    parser.add_argument("--out", default="splits", help="Directorio de salida de los APKs")
+    parser.add_argument("--device-spec", metavar="JSON",
+                        help="device-spec de bundletool para elegir los APKs de un dispositivo")
+    parser.add_argument("--reproducible", action="store_true",
+                        help="Fechas fijas en las entradas (salida idéntica byte a byte)")
+    parser.add_argument("--variant", choices=sorted(VARIANTS), default=DEFAULT_VARIANT.name,
+                        help="Variante con la que se compiló el .aab (package de los splits)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.aab):
+        print(f"❌ No existe {args.aab}; compilarlo antes con packager.py")
+        sys.exit(1)
+    outputs = build_split_apks(args.aab, args.out, deterministic=args.reproducible,
+                               variant=VARIANTS[args.variant])
+    print(f"✂️  {len(outputs)} APKs generados desde {args.aab}:")
+    for split, path in outputs.items():
+        print(f"  {os.path.basename(path):<24} {os.path.getsize(path) / 1024:>8.1f} KB")
+
+    if args.device_spec:
+        with open(args.device_spec, "r", encoding="utf-8") as f:
+            device_spec = json.load(f)
+        selected = select_splits(outputs, device_spec)
+        total = sum(os.path.getsize(outputs[split]) for split in selected)
+        full = sum(os.path.getsize(path) for path in outputs.values())
+        print(f"📱 Dispositivo ({device_spec.get('screenDensity', '?')} dpi, "
+              f"{', '.join(device_spec.get('supportedAbis', [])) or 'sin ABI'}):")
+        for split in selected:
+            print(f"  - {os.path.basename(outputs[split])}")
+        print(f"📥 Descarga: {total / 1024:.1f} KB de {full / 1024:.1f} KB "
+              f"({(1 - total / full) * 100 if full else 0:.0f}% menos que todas las densidades)")
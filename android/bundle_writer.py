@@ -0,0 +1,703 @@
+#!/usr/bin/env python3
+"""
+Escritor de App Bundles en streaming para TheCookFlow
+Recibe las entradas generadas (manifest, BundleConfig.pb, resources.pb,
+native.pb, metadata...) como buffers en memoria o generadores y las escribe
+directamente en el archivo, sin directorio temporal intermedio.
+
+Las entradas se comprimen aquí mismo (deflate crudo, igual que zipfile), lo
+que permite reutilizar bytes ya comprimidos de compilaciones anteriores
+mediante EntryCache sin volver a comprimirlos.
+
+La política de compresión (CompressionPolicy) decide por entrada si se
+guarda sin comprimir (STORED) según los uncompressed_glob del BundleConfig o
+por entropía; esas entradas se alinean a 4 bytes (4096 para .so) al estilo
+zipalign para que Android pueda mapearlas en memoria sin inflarlas.
+
+Los archivos de entrada grandes (FileSource) nunca se cargan enteros: se leen,
+se calcula su CRC y se comprimen en chunks de tamaño fijo, y los bytes ya
+comprimidos se copian entre artefactos también por chunks (RawSlice), así que
+la memoria pico no depende del tamaño del árbol de entrada. Las entradas o
+archivos de más de 4 GiB se escriben con extensiones Zip64.
+
+StreamingBundleWriter escribe el mismo formato en cualquier destino sin
+seek (stdout, un pipe, un socket): las entradas en streaming llevan data
+descriptor tras los datos en lugar de completar la cabecera local después,
+así que la siguiente etapa (firma, checksum, subida) puede ir consumiendo
+el archivo mientras se comprime.
+"""
+import fnmatch
+import hashlib
+import math
+import os
+import struct
+import time
+import zlib
+from collections import deque, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+# Mismo nivel que zipfile.ZIP_DEFLATED por defecto (Z_DEFAULT_COMPRESSION)
+DEFLATE_LEVEL = 6
+
+# Alineación de datos STORED (zipalign): 4 bytes, página completa para .so
+STORED_ALIGNMENT = 4
+NATIVE_LIB_ALIGNMENT = 4096
+
+# uncompressed_glob que declara create_bundle_config() (optimizations + compression)
+DEFAULT_UNCOMPRESSED_GLOBS = ("*.so", "*.dex", "*.png", "*.jpg", "*.webp")
+
+# Lectura/escritura en streaming: tamaño de chunk y tamaño máximo de archivo
+# que se carga entero en memoria (por encima se procesa chunk a chunk)
+CHUNK_SIZE = 256 * 1024
+SMALL_FILE_LIMIT = 256 * 1024
+
+# Límites del formato zip clásico; por encima se usan registros Zip64
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP64_COUNT_LIMIT = 0xFFFF
+# Margen para la posible expansión de deflate al decidir Zip64 por adelantado
+_ZIP64_STREAM_THRESHOLD = ZIP64_LIMIT - 0x1000000
+
+# Campo extra de alineación de Android (el mismo que usa zipalign/apksigner)
+_ALIGNMENT_EXTRA_ID = 0xD935
+_ZIP64_EXTRA_ID = 0x0001
+_DATA_DESCRIPTOR_SIGNATURE = 0x08074B50
+
+# Entrada ya comprimida: método zip, CRC32, tamaño original y bytes comprimidos
+# (bytes en memoria o un RawSlice dentro de otro archivo)
+CompressedEntry = namedtuple("CompressedEntry", "method crc size data")
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_RECORD = struct.Struct("<IHHHHIIH")
+_ZIP64_END_RECORD = struct.Struct("<IQHHIIQQQQ")
+_ZIP64_END_LOCATOR = struct.Struct("<IIQI")
+
+
+def _as_bytes(data):
+    """Normalizar str/bytes/bytearray/memoryview a bytes"""
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    return bytes(data)
+
+
+class FileSource:
+    """Archivo de entrada que se lee bajo demanda en chunks de tamaño fijo"""
+
+    def __init__(self, path):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self._digest = None
+
+    def chunks(self, chunk_size=CHUNK_SIZE):
+        """Generar el contenido del archivo en chunks"""
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def head(self, size=CHUNK_SIZE):
+        """Primeros bytes del archivo (para decidir el método de compresión)"""
+        with open(self.path, "rb") as f:
+            return f.read(size)
+
+    def read(self):
+        """Contenido completo (solo para archivos pequeños)"""
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def sha256(self):
+        """Hash del contenido calculado en streaming (memoizado)"""
+        if self._digest is None:
+            digest = hashlib.sha256()
+            for chunk in self.chunks():
+                digest.update(chunk)
+            self._digest = digest.hexdigest()
+        return self._digest
+
+
+class RawSlice:
+    """Bytes ya comprimidos dentro de otro archivo, copiados por chunks"""
+
+    def __init__(self, path, offset, length):
+        self.path = path
+        self.offset = offset
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def chunks(self, chunk_size=CHUNK_SIZE):
+        """Generar los bytes del tramo en chunks"""
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise OSError(f"{self.path}: entrada truncada")
+                remaining -= len(chunk)
+                yield chunk
+
+
+def _dos_datetime(timestamp, utc=False):
+    """Convertir un timestamp a la pareja (hora, fecha) de MS-DOS"""
+    t = time.gmtime(timestamp) if utc else time.localtime(timestamp)
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+def reproducible_datetime():
+    """Fecha fija para compilaciones reproducibles
+
+    Usa SOURCE_DATE_EPOCH si está definido; si no, 1980-01-01 00:00 (la
+    fecha mínima representable en zip).
+    """
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return _dos_datetime(max(int(epoch), 315532800), utc=True)
+    return 0, (1 << 5) | 1
+
+
+def compress_bytes(payload, method=ZIP_DEFLATED, level=DEFLATE_LEVEL):
+    """Comprimir un payload y devolver un CompressedEntry"""
+    crc = zlib.crc32(payload)
+    if method == ZIP_DEFLATED:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        data = compressor.compress(payload) + compressor.flush()
+    else:
+        data = payload
+    return CompressedEntry(method, crc, len(payload), data)
+
+
+def shannon_entropy(sample):
+    """Entropía de Shannon en bits por byte (0.0 - 8.0)"""
+    if not sample:
+        return 0.0
+    total = len(sample)
+    entropy = 0.0
+    for value in range(256):
+        count = sample.count(value)
+        if count:
+            p = count / total
+            entropy -= p * math.log2(p)
+    return entropy
+
+
+class CompressionPolicy:
+    """Decide el método zip de cada entrada
+
+    Las entradas que coinciden con algún uncompressed_glob se guardan STORED;
+    el resto también si su contenido ya parece comprimido (entropía alta).
+    """
+
+    ENTROPY_THRESHOLD = 7.5
+    ENTROPY_SAMPLE = 64 * 1024
+    ENTROPY_MIN_SIZE = 1024
+
+    def __init__(self, uncompressed_globs=DEFAULT_UNCOMPRESSED_GLOBS,
+                 entropy_threshold=ENTROPY_THRESHOLD):
+        self.uncompressed_globs = tuple(uncompressed_globs)
+        self.entropy_threshold = entropy_threshold
+
+    @classmethod
+    def from_bundle_config(cls, config):
+        """Construir la política desde el dict de create_bundle_config()"""
+        globs = []
+        globs.extend(config.get("optimizations", {}).get("uncompressed_glob", []))
+        globs.extend(config.get("compression", {}).get("uncompressed_glob", []))
+        return cls(globs)
+
+    def method_for(self, arcname, payload, default=ZIP_DEFLATED):
+        """Método zip para una entrada (payload puede ser solo el primer chunk)"""
+        if default == ZIP_STORED:
+            return ZIP_STORED
+        for pattern in self.uncompressed_globs:
+            if fnmatch.fnmatchcase(arcname, pattern):
+                return ZIP_STORED
+        if self.entropy_threshold is not None and len(payload) >= self.ENTROPY_MIN_SIZE:
+            if shannon_entropy(payload[:self.ENTROPY_SAMPLE]) >= self.entropy_threshold:
+                return ZIP_STORED
+        return default
+
+
+def alignment_for(arcname):
+    """Alineación requerida para los datos STORED de una entrada"""
+    return NATIVE_LIB_ALIGNMENT if arcname.endswith(".so") else STORED_ALIGNMENT
+
+
+def _timed_compress(payload, method, level):
+    """compress_bytes midiendo la CPU del hilo que lo ejecuta y su intervalo de pared
+
+    Devuelve (entrada, segundos de CPU, (inicio, fin) de perf_counter).
+    """
+    cpu_start = time.thread_time()
+    started = time.perf_counter()
+    entry = compress_bytes(payload, method, level)
+    finished = time.perf_counter()
+    return entry, time.thread_time() - cpu_start, (started, finished)
+
+
+def _busy_seconds(intervals):
+    """Tiempo de pared con al menos una compresión en marcha (unión de los intervalos)"""
+    total = 0.0
+    end = None
+    for started, finished in sorted(intervals):
+        if end is None or started > end:
+            total += finished - started
+            end = finished
+        elif finished > end:
+            total += finished - end
+            end = finished
+    return total
+
+
+class EntryCompressor:
+    """Comprime entradas aplicando política, caché y pool de hilos
+
+    Con jobs > 1, compress_all() comprime en un pool de hilos (zlib libera el
+    GIL mientras comprime) y devuelve los resultados en el orden original, así
+    que el archivo final es idéntico byte a byte al de la ruta secuencial.
+    Un mismo compresor puede alimentar varios BundleWriter (AAB y APK) para
+    comprimir cada entrada compartida una sola vez.
+
+    compress_cpu_seconds y compress_wall_seconds miden solo la compresión
+    (no la escritura ni el consumidor de compress_all), igual con un hilo que
+    con varios, así que la aceleración de -j N se compara con la de -j 1.
+    """
+
+    def __init__(self, compression=ZIP_DEFLATED, level=DEFLATE_LEVEL, cache=None, jobs=1,
+                 policy=None):
+        self.compression = compression
+        self.level = level
+        self.cache = cache
+        self.policy = policy
+        self.jobs = max(1, jobs or os.cpu_count() or 1)
+        self.bytes_compressed = 0
+        self.compress_cpu_seconds = 0.0
+        self.compress_wall_seconds = 0.0
+
+    def method_for(self, arcname, payload):
+        """Método zip de una entrada según la política (o el método por defecto)"""
+        if self.policy is None:
+            return self.compression
+        return self.policy.method_for(arcname, payload, self.compression)
+
+    def lookup(self, payload, method):
+        """Buscar un payload en la caché: devuelve (clave o None, entrada o None)"""
+        if self.cache is None or method != ZIP_DEFLATED:
+            return None, None
+        key = self.cache.key(payload, method, self.level)
+        return key, self.cache.get(key)
+
+    def lookup_source(self, arcname, source):
+        """Como lookup() para un FileSource grande, sin cargarlo en memoria
+
+        Devuelve (clave o None, CompressedEntry de la caché o el propio source).
+        """
+        method = self.method_for(arcname, source.head())
+        if self.cache is None or method != ZIP_DEFLATED:
+            return None, source
+        key = self.cache.key_for_digest(source.sha256(), method, self.level)
+        return key, self.cache.get(key) or source
+
+    def compress(self, arcname, payload):
+        """Comprimir un payload, reutilizando la caché si está disponible
+
+        Devuelve (clave de caché o None, CompressedEntry).
+        """
+        method = self.method_for(arcname, payload)
+        key, cached = self.lookup(payload, method)
+        if cached is not None:
+            return key, cached
+        entry, cpu_seconds, (started, finished) = _timed_compress(payload, method, self.level)
+        self.compress_cpu_seconds += cpu_seconds
+        self.compress_wall_seconds += finished - started
+        if method == ZIP_DEFLATED:
+            self.bytes_compressed += entry.size
+        return key, entry
+
+    def compress_all(self, entries):
+        """Generar (arcname, clave, CompressedEntry) en el orden de entrada
+
+        Los FileSource grandes y los generadores de chunks no se comprimen
+        aquí: se devuelven tal cual como tercer elemento para que
+        BundleWriter los escriba en streaming.
+        """
+        if self.jobs <= 1:
+            for arcname, data in entries:
+                data = _small_file_payload(data)
+                if isinstance(data, (str, bytes, bytearray, memoryview)):
+                    yield (arcname, *self.compress(arcname, _as_bytes(data)))
+                elif isinstance(data, FileSource):
+                    yield (arcname, *self.lookup_source(arcname, data))
+                else:
+                    yield arcname, None, data
+            return
+
+        # Ventana acotada de entradas en vuelo para no cargar todo el árbol
+        # de entrada en memoria a la vez
+        window = self.jobs * 4
+        pending = deque()
+        # Intervalos de pared de cada compresión del pool: el tiempo en que
+        # el consumidor escribe sin nada comprimiéndose no cuenta
+        busy = []
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            for arcname, data in entries:
+                data = _small_file_payload(data)
+                if isinstance(data, (str, bytes, bytearray, memoryview)):
+                    payload = _as_bytes(data)
+                    method = self.method_for(arcname, payload)
+                    key, cached = self.lookup(payload, method)
+                    if cached is None:
+                        cached = pool.submit(_timed_compress, payload, method, self.level)
+                    pending.append((arcname, key, cached))
+                elif isinstance(data, FileSource):
+                    pending.append((arcname, *self.lookup_source(arcname, data)))
+                else:
+                    pending.append((arcname, None, data))
+                while len(pending) > window:
+                    yield self._resolve(*pending.popleft(), busy)
+            while pending:
+                yield self._resolve(*pending.popleft(), busy)
+        self.compress_wall_seconds += _busy_seconds(busy)
+
+    def _resolve(self, arcname, key, item, busy):
+        if isinstance(item, Future):
+            entry, cpu_seconds, interval = item.result()
+            self.compress_cpu_seconds += cpu_seconds
+            busy.append(interval)
+            if entry.method == ZIP_DEFLATED:
+                self.bytes_compressed += entry.size
+            return arcname, key, entry
+        return arcname, key, item
+
+    def parallel_speedup(self):
+        """Aceleración de la compresión paralela (CPU total / tiempo de pared)"""
+        if self.compress_wall_seconds <= 0:
+            return 1.0
+        return self.compress_cpu_seconds / self.compress_wall_seconds
+
+
+class BundleWriter:
+    """Escribe entradas en un .aab/.apk directamente desde memoria
+
+    El archivo se escribe en "<path>.tmp" y se renombra al cerrar, de modo
+    que el artefacto anterior sigue legible (para la caché) durante la
+    compilación. La compresión la hace un EntryCompressor, propio o
+    compartido con otros escritores.
+
+    Los permisos de todas las entradas se normalizan a 0644; con
+    deterministic=True la fecha de las entradas también es fija.
+
+    Uso:
+        with BundleWriter("app-release.aab", cache=EntryCache()) as bundle:
+            bundle.add("base/manifest/AndroidManifest.xml", manifest_xml)
+            bundle.add("base/res/raw/data.bin", generador_de_chunks())
+    """
+
+    data_descriptors = False
+
+    def __init__(self, path, compression=ZIP_DEFLATED, level=DEFLATE_LEVEL, cache=None, jobs=1,
+                 policy=None, compressor=None, deterministic=False):
+        self.path = path
+        self.compressor = compressor or EntryCompressor(compression, level, cache, jobs, policy)
+        self.cache = self.compressor.cache
+        self.entries = 0
+        self.bytes_in = 0
+        self.stored_entries = 0
+        self._tmp_path = f"{path}.tmp"
+        self._fp = self._open()
+        self._central = []
+        if deterministic:
+            self._dos_time, self._dos_date = reproducible_datetime()
+        else:
+            self._dos_time, self._dos_date = _dos_datetime(time.time())
+
+    def _open(self):
+        return open(self._tmp_path, "wb")
+
+    def add(self, arcname, data):
+        """Añadir una entrada desde bytes/str, un FileSource o un iterable de chunks"""
+        if isinstance(data, (str, bytes, bytearray, memoryview)):
+            key, entry = self.compressor.compress(arcname, _as_bytes(data))
+            return self.add_compressed(arcname, entry, key)
+        return self.add_all([(arcname, data)])[0]
+
+    def add_all(self, entries):
+        """Añadir todas las entradas de un iterable de (arcname, data)"""
+        return [self.add_item(arcname, key, item)
+                for arcname, key, item in self.compressor.compress_all(entries)]
+
+    def add_item(self, arcname, key, item):
+        """Escribir un elemento producido por EntryCompressor.compress_all()
+
+        Devuelve la entrada reubicada (RawSlice dentro de este artefacto) para
+        poder copiarla en crudo a otros artefactos una vez cerrado este.
+        """
+        if isinstance(item, CompressedEntry):
+            return self.add_compressed(arcname, item, key)
+        if isinstance(item, FileSource):
+            return self._add_stream(arcname, item.chunks(), item.size, key)
+        return self._add_stream(arcname, item)
+
+    def add_compressed(self, arcname, entry, cache_key=None):
+        """Escribir una entrada ya comprimida tal cual, sin recomprimir"""
+        compressed_size = len(entry.data)
+        offset, data_offset, _ = self._write_local_header(
+            arcname, entry.method, entry.crc, compressed_size, entry.size)
+        if isinstance(entry.data, RawSlice):
+            for chunk in entry.data.chunks():
+                self._fp.write(chunk)
+        else:
+            self._fp.write(entry.data)
+        self._record(arcname, entry.method, entry.crc, compressed_size, entry.size, offset)
+        return self._relocated(entry.method, entry.crc, entry.size, data_offset,
+                               compressed_size, cache_key)
+
+    def _relocated(self, method, crc, size, data_offset, compressed_size, cache_key):
+        entry = CompressedEntry(method, crc, size, RawSlice(self.path, data_offset, compressed_size))
+        if self.cache is not None and cache_key is not None:
+            self.cache.record(cache_key, self.path, data_offset, entry)
+        return entry
+
+    def _add_stream(self, arcname, chunks, size_hint=None, cache_key=None):
+        """Escribir un generador de chunks con CRC y compresión incrementales
+
+        Con size_hint (tamaño conocido de un FileSource) se reservan los
+        campos Zip64 en la cabecera local si la entrada puede superar 4 GiB.
+        """
+        chunks = iter(chunks)
+        first = _as_bytes(next(chunks, b""))
+        method = self.compressor.method_for(arcname, first)
+        zip64 = size_hint is not None and size_hint >= _ZIP64_STREAM_THRESHOLD
+        flags = 0x808 if self.data_descriptors else 0x800
+        offset, data_offset, zip64 = self._write_local_header(arcname, method, 0, 0, 0, zip64, flags)
+        compressor = zlib.compressobj(self.compressor.level, zlib.DEFLATED, -15) \
+            if method == ZIP_DEFLATED else None
+        crc = 0
+        size = 0
+        compressed_size = 0
+        for chunk in _chain_first(first, chunks):
+            chunk = _as_bytes(chunk)
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            out = compressor.compress(chunk) if compressor else chunk
+            self._fp.write(out)
+            compressed_size += len(out)
+        if compressor:
+            tail = compressor.flush()
+            self._fp.write(tail)
+            compressed_size += len(tail)
+            self.compressor.bytes_compressed += size
+
+        if not zip64 and max(size, compressed_size) >= ZIP64_LIMIT:
+            raise RuntimeError(f"{arcname}: entrada de más de 4 GiB sin tamaño conocido para Zip64")
+
+        if self.data_descriptors:
+            # CRC y tamaños detrás de los datos (bit 3 de los flags)
+            self._fp.write(struct.pack("<IIQQ" if zip64 else "<IIII", _DATA_DESCRIPTOR_SIGNATURE,
+                                       crc, compressed_size, size))
+        else:
+            # Completar CRC y tamaños en la cabecera local
+            end = self._fp.tell()
+            self._fp.seek(offset + 14)
+            if zip64:
+                self._fp.write(struct.pack("<I", crc))
+                name_length = len(arcname.encode("utf-8"))
+                self._fp.seek(offset + _LOCAL_HEADER.size + name_length + 4)
+                self._fp.write(struct.pack("<QQ", size, compressed_size))
+            else:
+                self._fp.write(struct.pack("<III", crc, compressed_size, size))
+            self._fp.seek(end)
+        self._record(arcname, method, crc, compressed_size, size, offset, flags)
+        return self._relocated(method, crc, size, data_offset, compressed_size, cache_key)
+
+    def _write_local_header(self, arcname, method, crc, compressed_size, size, zip64=False,
+                            flags=0x800):
+        """Escribir la cabecera local; devuelve (offset cabecera, offset datos, zip64)
+
+        Las entradas STORED llevan el campo extra de alineación de Android
+        con el relleno necesario para que los datos queden alineados.
+        """
+        name = arcname.encode("utf-8")
+        offset = self._fp.tell()
+        zip64 = zip64 or max(size, compressed_size) >= ZIP64_LIMIT
+        extra = b""
+        version = 20
+        if zip64:
+            extra = struct.pack("<HHQQ", _ZIP64_EXTRA_ID, 16, size, compressed_size)
+            size = compressed_size = ZIP64_LIMIT
+            version = 45
+        if method == ZIP_STORED:
+            alignment = alignment_for(arcname)
+            unaligned = offset + _LOCAL_HEADER.size + len(name) + len(extra) + 6
+            padding = -unaligned % alignment
+            extra += struct.pack("<HHH", _ALIGNMENT_EXTRA_ID, 2 + padding, alignment) + b"\x00" * padding
+        self._fp.write(_LOCAL_HEADER.pack(
+            0x04034B50, version, flags, method, self._dos_time, self._dos_date,
+            crc, compressed_size, size, len(name), len(extra)))
+        self._fp.write(name)
+        self._fp.write(extra)
+        return offset, offset + _LOCAL_HEADER.size + len(name) + len(extra), zip64
+
+    def _record(self, arcname, method, crc, compressed_size, size, offset, flags=0x800):
+        self._central.append((arcname.encode("utf-8"), method, crc, compressed_size, size, offset,
+                              flags))
+        self.entries += 1
+        self.bytes_in += size
+        if method == ZIP_STORED:
+            self.stored_entries += 1
+
+    def close(self):
+        """Cerrar el archivo escribiendo el directorio central"""
+        if self._fp is None:
+            return
+        start = self._fp.tell()
+        for name, method, crc, compressed_size, size, offset, flags in self._central:
+            # Los valores que no caben en 32 bits van al campo extra Zip64
+            zip64_values = [value for value in (size, compressed_size, offset)
+                            if value >= ZIP64_LIMIT]
+            extra = b""
+            version = 20
+            if zip64_values:
+                extra = struct.pack(f"<HH{len(zip64_values)}Q", _ZIP64_EXTRA_ID,
+                                    8 * len(zip64_values), *zip64_values)
+                version = 45
+            self._fp.write(_CENTRAL_HEADER.pack(
+                0x02014B50, (3 << 8) | version, version, flags, method,
+                self._dos_time, self._dos_date, crc,
+                min(compressed_size, ZIP64_LIMIT), min(size, ZIP64_LIMIT),
+                len(name), len(extra), 0, 0, 0, 0o100644 << 16, min(offset, ZIP64_LIMIT)))
+            self._fp.write(name)
+            self._fp.write(extra)
+        end = self._fp.tell()
+        count = len(self._central)
+        if count >= ZIP64_COUNT_LIMIT or end - start >= ZIP64_LIMIT or start >= ZIP64_LIMIT:
+            self._fp.write(_ZIP64_END_RECORD.pack(
+                0x06064B50, _ZIP64_END_RECORD.size - 12, (3 << 8) | 45, 45, 0, 0,
+                count, count, end - start, start))
+            self._fp.write(_ZIP64_END_LOCATOR.pack(0x07064B50, 0, end, 1))
+        self._fp.write(_END_RECORD.pack(
+            0x06054B50, 0, 0, min(count, ZIP64_COUNT_LIMIT), min(count, ZIP64_COUNT_LIMIT),
+            min(end - start, ZIP64_LIMIT), min(start, ZIP64_LIMIT), 0))
+        self._finish()
+
+    def _finish(self):
+        self._fp.close()
+        self._fp = None
+        os.replace(self._tmp_path, self.path)
+        if self.cache is not None:
+            self.cache.commit(self.path)
+
+    def abort(self):
+        """Descartar el archivo a medio escribir"""
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+            os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class _OffsetSink:
+    """Destino de solo escritura que lleva la cuenta de los bytes escritos
+
+    Sustituye a tell() en destinos sin seek (pipes, sockets, stdout).
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.position = 0
+
+    def write(self, data):
+        self.sink.write(data)
+        self.position += len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        self.sink.flush()
+
+
+class StreamingBundleWriter(BundleWriter):
+    """Escribe un .aab/.apk como flujo en un destino sin seek
+
+    Mismo formato que BundleWriter salvo que las entradas en streaming
+    llevan data descriptor. El destino no se cierra al terminar (es del
+    llamante) y, como los bytes ya escritos no se pueden releer, las
+    entradas no se registran en la caché ni se devuelven reubicadas.
+
+    Uso:
+        with StreamingBundleWriter(sys.stdout.buffer, compressor=compressor) as bundle:
+            bundle.add_all(entradas)
+    """
+
+    data_descriptors = True
+
+    def __init__(self, sink, compression=ZIP_DEFLATED, level=DEFLATE_LEVEL, cache=None, jobs=1,
+                 policy=None, compressor=None, deterministic=False):
+        self._sink = _OffsetSink(sink)
+        super().__init__(getattr(sink, "name", "<stream>"), compression, level, cache, jobs,
+                         policy, compressor, deterministic)
+
+    @property
+    def bytes_written(self):
+        """Bytes enviados al destino hasta ahora"""
+        return self._sink.position
+
+    def _open(self):
+        return self._sink
+
+    def _relocated(self, method, crc, size, data_offset, compressed_size, cache_key):
+        return None
+
+    def _finish(self):
+        self._fp.flush()
+        self._fp = None
+
+    def abort(self):
+        """Dejar de escribir: el consumidor recibe un archivo sin directorio central"""
+        self._fp = None
+
+
+def _small_file_payload(data):
+    """Los FileSource pequeños se leen enteros; el resto se deja como está"""
+    if isinstance(data, FileSource) and data.size <= SMALL_FILE_LIMIT:
+        return data.read()
+    return data
+
+
+def _chain_first(first, rest):
+    """Volver a anteponer el primer chunk ya consumido de un generador"""
+    if first:
+        yield first
+    yield from rest
+
+
+def write_bundle(path, entries, compression=ZIP_DEFLATED, cache=None, jobs=1, policy=None):
+    """Escribir un bundle completo desde un iterable de (arcname, data)"""
+    with BundleWriter(path, compression, cache=cache, jobs=jobs, policy=policy) as bundle:
+        bundle.add_all(entries)
+    return bundle
+
+
+def parallel_summary(compressor):
+    """Línea de resumen de la compresión (paralela o no) para el informe final"""
+    return (f"{compressor.jobs} {'hilo' if compressor.jobs == 1 else 'hilos'}, {compressor.parallel_speedup():.1f}x "
+            f"(CPU {compressor.compress_cpu_seconds:.2f}s / "
+            f"pared {compressor.compress_wall_seconds:.2f}s)")
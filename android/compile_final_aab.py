@@ -4,119 +4,22 @@ Script final para crear App Bundle (.aab) con configuración actualizada
 Incluye product ID "suscripcion" y todas las configuraciones premium
 """
 import os
-import zipfile
-import struct
-import json
+import argparse
 
-def create_updated_manifest():
-    """Crear AndroidManifest.xml con configuración actualizada"""
-    manifest = '''<?xml version="1.0" encoding="utf-8"?>
-<manifest xmlns:android="http://schemas.android.com/apk/res/android"
-    package="com.thecookflow.app"
-    android:versionCode="1"
-    android:versionName="1.0.0"
-    android:installLocation="auto">
-    
-    <uses-sdk android:minSdkVersion="24" android:targetSdkVersion="34" />
-    
-    <!-- Permisos principales -->
-    <uses-permission android:name="android.permission.INTERNET" />
-    <uses-permission android:name="android.permission.ACCESS_NETWORK_STATE" />
-    <uses-permission android:name="android.permission.CAMERA" />
-    <uses-permission android:name="android.permission.WRITE_EXTERNAL_STORAGE" android:maxSdkVersion="28" />
-    <uses-permission android:name="android.permission.READ_EXTERNAL_STORAGE" android:maxSdkVersion="32" />
-    
-    <!-- Google Play Billing -->
-    <uses-permission android:name="com.android.vending.BILLING" />
-    <uses-permission android:name="com.android.vending.CHECK_LICENSE" />
-    
-    <!-- Características opcionales -->
-    <uses-feature android:name="android.hardware.camera" android:required="false" />
-    <uses-feature android:name="android.hardware.camera.autofocus" android:required="false" />
-    
-    <application
-        android:allowBackup="true"
-        android:icon="@mipmap/ic_launcher"
-        android:roundIcon="@mipmap/ic_launcher_round"
-        android:label="TheCookFlow"
-        android:theme="@android:style/Theme.Material.Light.NoActionBar"
-        android:usesCleartextTraffic="true"
-        android:hardwareAccelerated="true"
-        android:largeHeap="true">
-        
-        <!-- Actividad principal -->
-        <activity
-            android:name=".MainActivity"
-            android:exported="true"
-            android:screenOrientation="portrait"
-            android:launchMode="singleTask"
-            android:configChanges="orientation|keyboardHidden|screenSize">
-            
-            <intent-filter android:autoVerify="true">
-                <action android:name="android.intent.action.MAIN" />
-                <category android:name="android.intent.category.LAUNCHER" />
-            </intent-filter>
-            
-            <!-- Deep links para web app -->
-            <intent-filter android:autoVerify="true">
-                <action android:name="android.intent.action.VIEW" />
-                <category android:name="android.intent.category.DEFAULT" />
-                <category android:name="android.intent.category.BROWSABLE" />
-                <data android:scheme="https" 
-                      android:host="*.replit.dev" />
-            </intent-filter>
-        </activity>
-        
-        <!-- Google Play Billing Service -->
-        <service android:name="com.android.vending.billing.IInAppBillingService" />
-        
-        <!-- Metadata Google Play -->
-        <meta-data android:name="com.google.android.play.billingclient.version" 
-                   android:value="8.0.0" />
-        
-    </application>
-</manifest>'''
-    
-    os.makedirs("build/bundle/base/manifest", exist_ok=True)
-    with open("build/bundle/base/manifest/AndroidManifest.xml", "w") as f:
-        f.write(manifest)
-    return True
+from apk_signer import sign_artifacts
+from bundle_size import track_bundle_size
+from bundle_writer import parallel_summary
+from entry_cache import EntryCache
+from packager import (RES_DIR, VARIANTS, build_artifacts, peak_memory_mb, release_aab,
+                      variant_path, within_memory_budget)
+from tracing import add_tracing_arguments, tracing
 
-def create_bundle_config():
-    """Crear BundleConfig.pb con configuración optimizada"""
-    # Protocol Buffer básico para App Bundle
-    config_data = bytes([
-        0x08, 0x01,  # Version
-        0x12, 0x06,  # Optimizations
-        0x08, 0x01, 0x10, 0x01, 0x18, 0x01  # Enable splits
-    ])
-    
-    with open("build/bundle/BundleConfig.pb", "wb") as f:
-        f.write(config_data)
-
-def create_resources():
-    """Crear recursos básicos para el App Bundle"""
-    os.makedirs("build/bundle/base/res", exist_ok=True)
-    os.makedirs("build/bundle/base/assets", exist_ok=True)
-    os.makedirs("build/bundle/base/lib", exist_ok=True)
-    
-    # Resources.pb (tabla de recursos compilados)
-    resources_data = bytes([
-        0x02, 0x00, 0x0C, 0x00,  # Magic + Header size
-        0x01, 0x00, 0x00, 0x00,  # Version
-        0x00, 0x00, 0x00, 0x00   # Flags
-    ])
-    
-    with open("build/bundle/base/resources.pb", "wb") as f:
-        f.write(resources_data)
-    
-    # Native.pb (configuración nativa)
-    native_data = bytes([0x08, 0x01, 0x12, 0x00])
-    with open("build/bundle/base/native.pb", "wb") as f:
-        f.write(native_data)
+# Este script compila el sabor com.thecookflow.app
+FINAL_VARIANT = VARIANTS["thecookflow"]
 
-def create_final_aab():
-    """Crear el App Bundle final"""
+def create_final_aab(use_cache=True, jobs=1, apk_filename=None, reproducible=False, force=False,
+                     res_dir=RES_DIR, variant=FINAL_VARIANT):
+    """Crear el App Bundle final (y opcionalmente el APK en la misma pasada)"""
     print("🚀 Creando App Bundle final para TheCookFlow...")
     print("📱 Configuración: Product ID 'suscripcion' - €1.99/mes")
     
@@ -128,35 +31,46 @@ def create_final_aab():
     
     print("✅ Keystore de producción encontrado")
     
-    # Crear estructura del bundle
-    create_updated_manifest()
-    print("✅ AndroidManifest.xml actualizado con permisos Google Play")
-    
-    create_bundle_config()
-    print("✅ BundleConfig.pb creado")
-    
-    create_resources()
-    print("✅ Recursos y configuración nativa creados")
-    
-    # Crear App Bundle como ZIP
-    with zipfile.ZipFile("app-release.aab", "w", zipfile.ZIP_DEFLATED) as aab:
-        # Agregar todos los archivos del bundle
-        for root, dirs, files in os.walk("build/bundle"):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arc_path = file_path.replace("build/bundle/", "")
-                aab.write(file_path, arc_path)
+    # Crear App Bundle con el motor de empaquetado compartido
+    aab_filename = release_aab(variant)
+    if apk_filename:
+        apk_filename = variant_path(apk_filename, variant)
+    cache = EntryCache() if use_cache else None
+    compressor, artifacts = build_artifacts(aab_filename, apk_filename, cache, jobs,
+                                            res_dir=res_dir, deterministic=reproducible, force=force,
+                                            variant=variant)
+    if not artifacts:
+        print(f"⏭️  {aab_filename} ya está al día (huella de entradas sin cambios)")
+        # packager.py no firma: un artefacto al día puede estar sin firmar
+        # o firmado con otra clave
+        sign_artifacts([aab_filename] + ([apk_filename] if apk_filename else []),
+                       jobs=jobs, cache=cache, skip_signed=True)
+        return True
+    print("✅ AndroidManifest.xml, BundleConfig.pb y recursos generados")
+    release_signed = sign_artifacts(list(artifacts), jobs=jobs, cache=cache)
     
-    if os.path.exists("app-release.aab"):
-        size = os.path.getsize("app-release.aab")
+    if os.path.exists(aab_filename):
+        size = os.path.getsize(aab_filename)
         size_kb = size / 1024
         
         print(f"")
         print(f"🎉 ¡APP BUNDLE FINAL CREADO!")
-        print(f"📁 Archivo: android/app-release.aab")
+        print(f"📁 Archivo: android/{aab_filename}")
         print(f"📊 Tamaño: {size_kb:.1f} KB")
-        print(f"📱 Package: com.thecookflow.app")
-        print(f"🔢 Versión: 1.0.0 (código 1)")
+        if apk_filename:
+            print(f"📦 APK: android/{apk_filename} (misma pasada)")
+        if cache is not None:
+            print(f"♻️  Caché: {cache.summary()}")
+        if compressor.compress_wall_seconds > 0:
+            print(f"⚡ Compresión: {parallel_summary(compressor)}")
+        peak = peak_memory_mb()
+        if peak is not None:
+            print(f"🧠 Memoria pico: {peak:.1f} MB")
+        if not track_bundle_size(aab_filename):
+            print("❌ El App Bundle supera el presupuesto de tamaño (android/size_budgets.json)")
+            return False
+        print(f"📱 Package: {variant.package}")
+        print(f"🔢 Versión: {variant.version_name} (código {variant.version_code})")
         print(f"💳 Suscripción: suscripcion (€1.99/mes)")
         print(f"")
         print(f"✅ CONFIGURACIÓN FINAL:")
@@ -164,11 +78,11 @@ def create_final_aab():
         print(f"• Google Play Billing habilitado ✅")  
         print(f"• Permisos de cámara para food recognition ✅")
         print(f"• Deep links configurados ✅")
-        print(f"• Keystore de producción aplicado ✅")
+        print(f"• Firma v2/v3 con clave de producción {'✅' if release_signed else '❌ (depuración)'}")
         print(f"")
         print(f"🏪 LISTO PARA GOOGLE PLAY STORE:")
         print(f"1. Ir a: https://play.google.com/console")
-        print(f"2. Subir: app-release.aab")
+        print(f"2. Subir: {aab_filename}")
         print(f"3. Configurar suscripción: ID 'suscripcion'")
         print(f"4. Precio: €1.99/mes con 7 días gratis")
         print(f"5. Enviar para revisión")
@@ -184,6 +98,29 @@ def create_final_aab():
         return False
 
 if __name__ == "__main__":
-    success = create_final_aab()
+    parser = argparse.ArgumentParser(description="App Bundle final de TheCookFlow")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Recomprimir todas las entradas sin usar la caché incremental")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Hilos de compresión en paralelo (0 = todos los núcleos)")
+    parser.add_argument("--apk", metavar="RUTA",
+                        help="Generar también el APK en la misma pasada "
+                             "({variant} se sustituye por la variante)")
+    parser.add_argument("--reproducible", action="store_true",
+                        help="Fechas fijas y orden de entradas estable (salida idéntica byte a byte)")
+    parser.add_argument("--force", action="store_true",
+                        help="Empaquetar aunque la huella de entradas no haya cambiado")
+    parser.add_argument("--memory-budget", type=float, metavar="MB",
+                        help="Fallar si la memoria pico del empaquetado supera este presupuesto")
+    parser.add_argument("--variant", choices=sorted(VARIANTS), default=FINAL_VARIANT.name,
+                        help="Variante a compilar (package, versión, product id)")
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    
+    with tracing(args.trace, args.profile):
+        success = create_final_aab(use_cache=not args.no_cache, jobs=args.jobs,
+                                   apk_filename=args.apk, reproducible=args.reproducible,
+                                   force=args.force, variant=VARIANTS[args.variant])
+    success = within_memory_budget(args.memory_budget) and success
     if success:
         print("🎯 Tu App Bundle está listo para generar ingresos recurrentes!")
\ No newline at end of file
@@ -4,55 +4,16 @@ Script simplificado para crear un APK sin Android Studio
 Genera un APK básico que Google Play Console puede aceptar
 """
 import os
-import zipfile
-import struct
+import argparse
 import subprocess
 
-def create_manifest():
-    """Crear AndroidManifest.xml optimizado"""
-    manifest = '''<?xml version="1.0" encoding="utf-8"?>
-<manifest xmlns:android="http://schemas.android.com/apk/res/android"
-    package="com.thecookflow.app"
-    android:versionCode="1"
-    android:versionName="1.0.0">
-    
-    <uses-sdk android:minSdkVersion="24" android:targetSdkVersion="34" />
-    
-    <uses-permission android:name="android.permission.INTERNET" />
-    <uses-permission android:name="android.permission.CAMERA" />
-    <uses-permission android:name="android.permission.ACCESS_NETWORK_STATE" />
-    <uses-permission android:name="com.android.vending.BILLING" />
-    
-    <application
-        android:allowBackup="true"
-        android:icon="@mipmap/ic_launcher"
-        android:label="TheCookFlow"
-        android:theme="@android:style/Theme.Material.Light.NoActionBar"
-        android:usesCleartextTraffic="true">
-        
-        <activity
-            android:name=".MainActivity"
-            android:exported="true"
-            android:screenOrientation="portrait"
-            android:launchMode="singleTask">
-            <intent-filter android:autoVerify="true">
-                <action android:name="android.intent.action.MAIN" />
-                <category android:name="android.intent.category.LAUNCHER" />
-            </intent-filter>
-        </activity>
-        
-        <service android:name="com.android.billingclient.api.ProxyBillingActivity"
-                 android:theme="@android:style/Theme.Translucent.NoTitleBar" />
-        
-    </application>
-</manifest>'''
-    
-    os.makedirs("build/apk", exist_ok=True)
-    with open("build/apk/AndroidManifest.xml", "w") as f:
-        f.write(manifest)
-    return True
+from apk_signer import sign_artifacts
+from bundle_inspector import inspect_bundle, print_report
+from bundle_writer import parallel_summary
+from packager import PACKAGE_NAME, VERSION_CODE, VERSION_NAME, build_artifacts
+from tracing import add_tracing_arguments, tracing
 
-def create_basic_apk():
+def create_basic_apk(jobs=1):
     """Crear APK básico funcional"""
     print("🚀 Creando APK básico para TheCookFlow...")
     
@@ -64,38 +25,15 @@ def create_basic_apk():
     
     print("✅ Keystore encontrado")
     
-    # Crear manifest
-    create_manifest()
-    print("✅ AndroidManifest.xml creado")
-    
-    # Crear estructura APK
-    os.makedirs("build/apk/META-INF", exist_ok=True)
-    os.makedirs("build/apk/res", exist_ok=True)
-    os.makedirs("build/apk/assets", exist_ok=True)
-    
-    # Crear archivo resources.arsc básico (tabla de recursos)
-    resources_data = b'\x02\x00\x0c\x00\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
-    with open("build/apk/resources.arsc", "wb") as f:
-        f.write(resources_data)
-    
-    print("✅ Recursos básicos creados")
-    
-    # Crear classes.dex básico (código Java/Kotlin compilado)
-    # DEX magic number + estructura mínima
-    dex_header = b'dex\n037\x00' + b'\x00' * 90
-    with open("build/apk/classes.dex", "wb") as f:
-        f.write(dex_header)
-    
-    print("✅ Classes.dex creado")
-    
-    # Crear APK como ZIP
-    with zipfile.ZipFile("app-debug.apk", "w", zipfile.ZIP_DEFLATED) as apk:
-        # Agregar archivos esenciales
-        for root, dirs, files in os.walk("build/apk"):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arc_path = file_path.replace("build/apk/", "")
-                apk.write(file_path, arc_path)
+    # Crear APK con el motor de empaquetado compartido
+    compressor, artifacts = build_artifacts(None, "app-debug.apk", jobs=jobs)
+    if not artifacts:
+        print("⏭️  app-debug.apk ya está al día (huella de entradas sin cambios)")
+        # packager.py no firma: comprobar la firma del APK existente
+        sign_artifacts(["app-debug.apk"], jobs=jobs, skip_signed=True)
+        return True
+    print("✅ AndroidManifest.xml, resources.arsc y classes.dex generados")
+    sign_artifacts(["app-debug.apk"], jobs=jobs)
     
     if os.path.exists("app-debug.apk"):
         size = os.path.getsize("app-debug.apk")
@@ -105,8 +43,10 @@ def create_basic_apk():
         print(f"🎉 ¡APK CREADO EXITOSAMENTE!")
         print(f"📁 Archivo: android/app-debug.apk")
         print(f"📊 Tamaño: {size_kb:.1f} KB")
-        print(f"📱 Package: com.thecookflow.app")
-        print(f"🔢 Versión: 1.0.0 (código 1)")
+        if compressor.compress_wall_seconds > 0:
+            print(f"⚡ Compresión: {parallel_summary(compressor)}")
+        print(f"📱 Package: {PACKAGE_NAME}")
+        print(f"🔢 Versión: {VERSION_NAME} (código {VERSION_CODE})")
         print(f"")
         print(f"⚠️  NOTA: Este es un APK básico para pruebas")
         print(f"Para producción, usar Android Studio con el proyecto completo")
@@ -131,21 +71,27 @@ def test_apk():
         except:
             print("Tipo: ZIP archive (APK)")
         
-        # Listar contenido
+        # Listar contenido desde el directorio central y verificar los CRC
         try:
-            with zipfile.ZipFile("app-debug.apk", "r") as apk:
-                files = apk.namelist()
-                print(f"Archivos incluidos: {len(files)}")
-                for file in sorted(files)[:10]:  # Mostrar primeros 10
-                    print(f"  - {file}")
-                if len(files) > 10:
-                    print(f"  ... y {len(files) - 10} archivos más")
+            entries, errors, list_seconds, verify_seconds = inspect_bundle(
+                "app-debug.apk", verify=True, jobs=0)
+            print_report("app-debug.apk", entries, errors, list_seconds, verify_seconds,
+                         verify=True, limit=10)
         except Exception as e:
             print(f"Error leyendo APK: {e}")
 
 if __name__ == "__main__":
-    if create_basic_apk():
-        test_apk()
+    parser = argparse.ArgumentParser(description="APK básico de TheCookFlow")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Hilos de compresión en paralelo (0 = todos los núcleos)")
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    
+    with tracing(args.trace, args.profile):
+        built = create_basic_apk(jobs=args.jobs)
+        if built:
+            test_apk()
+    if built:
         print(f"")
         print(f"✅ APK básico listo para pruebas")
         print(f"💡 Para el App Bundle oficial, usar Android Studio")
@@ -3,8 +3,10 @@
 Script para crear un App Bundle básico para TheCookFlow
 """
 import os
-import zipfile
-import struct
+import argparse
+
+from packager import DEFAULT_VARIANT, build_artifacts, release_aab
+from tracing import add_tracing_arguments, tracing
 
 def create_app_bundle():
     print("🚀 Creando App Bundle para TheCookFlow...")
@@ -16,89 +18,26 @@ def create_app_bundle():
     
     print("✅ Keystore encontrado")
     
-    # Crear directorios
-    os.makedirs("build/bundle/base/manifest", exist_ok=True)
-    os.makedirs("build/bundle/base/dex", exist_ok=True)
-    os.makedirs("build/bundle/base/res", exist_ok=True)
-    os.makedirs("build/bundle/base/assets", exist_ok=True)
-    os.makedirs("build/bundle/base/lib", exist_ok=True)
-    
-    # Crear AndroidManifest.xml
-    manifest_content = '''<?xml version="1.0" encoding="utf-8"?>
-<manifest xmlns:android="http://schemas.android.com/apk/res/android"
-    package="com.thecookflow.app"
-    android:versionCode="1"
-    android:versionName="1.0.0">
-    
-    <uses-sdk android:minSdkVersion="24" android:targetSdkVersion="34" />
-    
-    <uses-permission android:name="android.permission.INTERNET" />
-    <uses-permission android:name="android.permission.CAMERA" />
-    <uses-permission android:name="android.permission.WRITE_EXTERNAL_STORAGE" />
-    <uses-permission android:name="com.android.vending.BILLING" />
-    
-    <application
-        android:allowBackup="true"
-        android:icon="@mipmap/ic_launcher"
-        android:label="TheCookFlow"
-        android:theme="@android:style/Theme.Material.Light.NoActionBar">
-        
-        <activity
-            android:name=".MainActivity"
-            android:exported="true"
-            android:screenOrientation="portrait">
-            <intent-filter>
-                <action android:name="android.intent.action.MAIN" />
-                <category android:name="android.intent.category.LAUNCHER" />
-            </intent-filter>
-        </activity>
-        
-    </application>
-</manifest>'''
-    
-    with open("build/bundle/base/manifest/AndroidManifest.xml", "w") as f:
-        f.write(manifest_content)
-    
-    print("✅ AndroidManifest.xml creado")
-    
-    # Crear BundleConfig.pb (Protocol Buffer básico)
-    bundle_config = b'\x08\x01\x12\x00'  # Configuración mínima
-    with open("build/bundle/BundleConfig.pb", "wb") as f:
-        f.write(bundle_config)
-    
-    print("✅ BundleConfig.pb creado")
-    
-    # Crear resources.pb (Resources básico)
-    with open("build/bundle/base/resources.pb", "wb") as f:
-        f.write(b'\x08\x7f')  # Resource table mínimo
-    
-    # Crear native.pb
-    with open("build/bundle/base/native.pb", "wb") as f:
-        f.write(b'\x08\x01')  # Native libs config mínimo
-    
-    print("✅ Archivos de configuración creados")
-    
-    # Crear el ZIP (App Bundle)
-    with zipfile.ZipFile("app-release.aab", "w", zipfile.ZIP_DEFLATED) as aab:
-        # Agregar todos los archivos
-        for root, dirs, files in os.walk("build/bundle"):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arc_path = file_path.replace("build/bundle/", "")
-                aab.write(file_path, arc_path)
+    # Crear App Bundle con el motor de empaquetado compartido
+    aab_filename = release_aab(DEFAULT_VARIANT)
+    compressor, artifacts = build_artifacts(aab_filename, None, variant=DEFAULT_VARIANT)
+    if not artifacts:
+        print(f"⏭️  {aab_filename} ya está al día (huella de entradas sin cambios)")
+        return True
+    print("✅ AndroidManifest.xml, BundleConfig.pb y archivos de configuración creados")
     
-    if os.path.exists("app-release.aab"):
-        size = os.path.getsize("app-release.aab")
+    if os.path.exists(aab_filename):
+        size = os.path.getsize(aab_filename)
         size_kb = size / 1024
         print(f"")
         print(f"🎉 ¡APP BUNDLE CREADO EXITOSAMENTE!")
-        print(f"📁 Archivo: android/app-release.aab")
+        print(f"📁 Archivo: android/{aab_filename}")
         print(f"📊 Tamaño: {size_kb:.1f} KB")
         print(f"")
         print(f"🎯 PRÓXIMOS PASOS:")
         print(f"1. Ir a Google Play Console: https://play.google.com/console")
         print(f"2. Crear nueva aplicación: 'TheCookFlow - Planificador de Menús IA'")
-        print(f"3. Subir el archivo: app-release.aab")
+        print(f"3. Subir el archivo: {aab_filename}")
         print(f"4. Configurar suscripciones:")
         print(f"   - premium_monthly: €1.99/mes (7 días gratis)")
         print(f"   - premium_yearly: €19.99/año (7 días gratis)")
@@ -112,4 +51,9 @@ def create_app_bundle():
         return False
 
 if __name__ == "__main__":
-    create_app_bundle()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="App Bundle básico de TheCookFlow")
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    
+    with tracing(args.trace, args.profile):
+        create_app_bundle()
\ No newline at end of file
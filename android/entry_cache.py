@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Caché incremental de entradas comprimidas para los empaquetadores
+Indexa cada entrada por hash de contenido + ajustes de compresión y apunta a
+los bytes ya comprimidos dentro del artefacto anterior (.aab/.apk), de modo
+que las entradas sin cambios se copian en crudo, con su CRC, sin recomprimir.
+"""
+import hashlib
+import json
+import os
+import threading
+
+from bundle_writer import CompressedEntry, RawSlice
+
+DEFAULT_CACHE_DIR = ".bundle-cache"
+INDEX_FILE = "entries.json"
+
+
+def _archive_stamp(path):
+    """Tamaño y mtime del artefacto, para detectar si cambió por fuera"""
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+class EntryCache:
+    """Índice persistente clave -> (artefacto, offset, tamaños, CRC)"""
+
+    def __init__(self, root=DEFAULT_CACHE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self.hits = 0
+        self.misses = 0
+        self.bytes_reused = 0
+        self._archives = {}
+        self._entries = {}
+        self._pending = {}
+        # Varios artefactos pueden escribirse a la vez (variantes en paralelo)
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._archives = data.get("archives", {})
+            self._entries = data.get("entries", {})
+        except (OSError, ValueError):
+            self._archives = {}
+            self._entries = {}
+
+    @staticmethod
+    def key(payload, method, level):
+        """Clave de caché: hash del contenido + método + nivel de compresión"""
+        return EntryCache.key_for_digest(hashlib.sha256(payload).hexdigest(), method, level)
+
+    @staticmethod
+    def key_for_digest(digest, method, level):
+        """Clave de caché a partir de un sha256 ya calculado (archivos grandes)"""
+        return f"{digest}-{method}-{level}"
+
+    def get(self, key):
+        """Devolver el CompressedEntry guardado para la clave, o None
+
+        Los bytes no se leen aquí: se devuelve un RawSlice que el escritor
+        copia por chunks, así que un acierto no carga la entrada en memoria.
+        """
+        location = self._entries.get(key)
+        if location is None:
+            self.misses += 1
+            return None
+        archive, offset, compressed_size, crc, size, method = location
+        try:
+            stamp = _archive_stamp(archive)
+        except OSError:
+            stamp = None
+        if stamp is None or self._archives.get(archive) != stamp or offset + compressed_size > stamp[0]:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.bytes_reused += size
+        return CompressedEntry(method, crc, size, RawSlice(archive, offset, compressed_size))
+
+    def record(self, key, archive, offset, entry):
+        """Anotar dónde queda una entrada dentro del artefacto en escritura"""
+        archive = os.path.abspath(archive)
+        with self._lock:
+            self._pending.setdefault(archive, {})[key] = [
+                archive, offset, len(entry.data), entry.crc, entry.size, entry.method]
+
+    def commit(self, archive):
+        """Confirmar las entradas de un artefacto ya escrito y guardar el índice"""
+        archive = os.path.abspath(archive)
+        with self._lock:
+            # Las entradas antiguas de este artefacto ya no son válidas
+            self._entries = {k: v for k, v in self._entries.items() if v[0] != archive}
+            self._entries.update(self._pending.pop(archive, {}))
+            self._archives[archive] = _archive_stamp(archive)
+            self.save()
+
+    def restamp(self, archive):
+        """Aceptar el tamaño y mtime actuales de un artefacto modificado en el sitio
+
+        Para cuando se añaden datos sin mover las entradas (p. ej. al firmar).
+        """
+        archive = os.path.abspath(archive)
+        with self._lock:
+            if archive in self._archives:
+                self._archives[archive] = _archive_stamp(archive)
+                self.save()
+
+    def save(self):
+        """Escribir el índice de forma atómica"""
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"archives": self._archives, "entries": self._entries}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def reset_counters(self):
+        """Poner a cero aciertos y fallos (entre compilaciones de un mismo proceso)"""
+        self.hits = 0
+        self.misses = 0
+        self.bytes_reused = 0
+
+    def summary(self):
+        """Resumen legible de aciertos/fallos para el informe de compilación"""
+        total = self.hits + self.misses
+        return (f"{self.hits}/{total} entradas reutilizadas "
+                f"({self.bytes_reused / 1024:.1f} KB sin recomprimir)")
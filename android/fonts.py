@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Registro de fuentes y métricas de texto para los renderers de Pillow
+Resuelve una sola vez por proceso la fuente de cada papel (título, texto,
+manuscrita): primero las fuentes de la app en res/font (kalam_*.ttf,
+caveat.ttf), después fuentes del sistema habituales y por último la fuente
+escalable por defecto de Pillow. Los candidatos que no existen o no son
+TrueType válidos se descartan una vez, no en cada llamada.
+
+Los FreeTypeFont se cachean por (ruta, tamaño) y las medidas de cada texto
+por (fuente, texto), así que los lotes de screenshots que repiten títulos
+y características no vuelven a medir las mismas cadenas. fit_font() y
+wrap_text() ajustan tamaño y saltos de línea usando esas medidas.
+
+Uso:
+    python android/fonts.py
+"""
+import argparse
+import functools
+import os
+
+from PIL import ImageFont
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FONT_DIR = os.path.join(HERE, "app", "src", "main", "res", "font")
+
+# Fuentes del sistema que se prueban si las de la app no sirven
+_SYSTEM_REGULAR = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+    "/System/Library/Fonts/Arial.ttf",
+    "/Library/Fonts/Arial.ttf",
+    "C:\\Windows\\Fonts\\arial.ttf",
+]
+_SYSTEM_BOLD = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+    "/Library/Fonts/Arial Bold.ttf",
+    "C:\\Windows\\Fonts\\arialbd.ttf",
+]
+
+# Papel -> candidatos en orden de preferencia (los mismos que usa la app)
+FONT_ROLES = {
+    "title": [os.path.join(FONT_DIR, "kalam_bold.ttf")] + _SYSTEM_BOLD + _SYSTEM_REGULAR,
+    "body": [os.path.join(FONT_DIR, "kalam_regular.ttf")] + _SYSTEM_REGULAR,
+    "hand": [os.path.join(FONT_DIR, "caveat.ttf"),
+             os.path.join(FONT_DIR, "kalam_regular.ttf")] + _SYSTEM_REGULAR,
+}
+
+FONT_CACHE_SIZE = 64
+METRICS_CACHE_SIZE = 4096
+
+
+class FontError(Exception):
+    """Papel de fuente desconocido"""
+
+
+@functools.lru_cache(maxsize=None)
+def _is_truetype(path):
+    try:
+        ImageFont.truetype(path, 12)
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_font(role):
+    """Ruta de la fuente de un papel, o None para la fuente por defecto de Pillow"""
+    if role not in FONT_ROLES:
+        raise FontError(f"papel de fuente desconocido: {role}")
+    for path in FONT_ROLES[role]:
+        if os.path.isfile(path) and _is_truetype(path):
+            return path
+    return None
+
+
+@functools.lru_cache(maxsize=FONT_CACHE_SIZE)
+def load_font(path, size):
+    """FreeTypeFont de una ruta y tamaño (None = fuente escalable de Pillow)"""
+    if path is None:
+        return ImageFont.load_default(size)
+    return ImageFont.truetype(path, size)
+
+
+def get_font(role, size):
+    """Fuente de un papel ("title", "body", "hand") a un tamaño en píxeles"""
+    return load_font(resolve_font(role), max(1, int(size)))
+
+
+def font_files():
+    """Archivos de fuente que usan los renderers (para las claves de caché)"""
+    return sorted({path for path in map(resolve_font, FONT_ROLES) if path})
+
+
+@functools.lru_cache(maxsize=METRICS_CACHE_SIZE)
+def text_bbox(font, text):
+    """Caja (izq, arriba, der, abajo) de un texto de una línea en el origen
+
+    Igual que ImageDraw.textbbox((0, 0), text, font=font), memoizada.
+    """
+    return font.getbbox(text)
+
+
+def text_size(font, text):
+    """(ancho, alto) de un texto de una línea"""
+    left, top, right, bottom = text_bbox(font, text)
+    return right - left, bottom - top
+
+
+def fit_font(text, role, max_width, max_size, min_size=8):
+    """Fuente más grande (hasta max_size) con la que text cabe en max_width"""
+    low, high = min_size, max_size
+    while low < high:
+        size = (low + high + 1) // 2
+        if text_size(get_font(role, size), text)[0] <= max_width:
+            low = size
+        else:
+            high = size - 1
+    return get_font(role, low)
+
+
+def wrap_text(text, font, max_width):
+    """Partir text en líneas que quepan en max_width (por palabras)
+
+    Una palabra que no cabe sola va en su propia línea.
+    """
+    lines = []
+    current = ""
+    for word in text.split():
+        candidate = f"{current} {word}" if current else word
+        if current and text_size(font, candidate)[0] > max_width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    if current:
+        lines.append(current)
+    return lines
+
+
+def cache_summary():
+    """Aciertos de las cachés de fuentes y métricas"""
+    fonts = load_font.cache_info()
+    metrics = text_bbox.cache_info()
+    return (f"fuentes {fonts.hits}/{fonts.hits + fonts.misses}, "
+            f"medidas {metrics.hits}/{metrics.hits + metrics.misses} reutilizadas")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fuentes que usarán los renderers de assets")
+    parser.parse_args()
+
+    for role in FONT_ROLES:
+        path = resolve_font(role)
+        print(f"🔤 {role:<6} {path or 'fuente escalable de Pillow'}")
+    for name in sorted(os.listdir(FONT_DIR)) if os.path.isdir(FONT_DIR) else []:
+        path = os.path.join(FONT_DIR, name)
+        if name.endswith(".ttf") and not _is_truetype(path):
+            print(f"⚠️  {os.path.relpath(path)} no es una fuente TrueType válida: se omite")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Recursos públicos del framework de Android (paquete 0x01)
+Lee de la plataforma del SDK que hay en android/platforms (la de compileSdk)
+los IDs públicos de android.R (public-final.xml) y la definición de cada
+atributo (attrs*.xml): sus formatos (dimension, color, string...) y los
+valores de sus enums y flags. Es lo que aapt2 saca de android.jar para
+resolver "@android:style/...", "?android:attr/..." y los atributos android:
+de los XML compilados.
+
+Las dos tablas se leen una vez por proceso.
+
+Uso:
+    python android/framework_resources.py attr/pathData style/Theme.Material.Light.NoActionBar
+    python android/framework_resources.py --attribute gravity
+"""
+import argparse
+import functools
+import glob
+import os
+import sys
+from collections import namedtuple
+from xml.etree import ElementTree
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# compileSdk de app/build.gradle
+PLATFORM = "android-35"
+PLATFORM_VALUES_DIR = os.path.join(HERE, "platforms", PLATFORM, "data", "res", "values")
+PUBLIC_XML = os.path.join(PLATFORM_VALUES_DIR, "public-final.xml")
+
+# Definición de un atributo: formatos ("enum" y "flags" incluidos si tiene
+# valores con nombre) y {nombre: valor} de sus enums o flags
+Attribute = namedtuple("Attribute", "formats values")
+
+
+class FrameworkError(Exception):
+    """Plataforma del SDK ausente o con recursos ilegibles"""
+
+
+def _parse(path):
+    try:
+        return ElementTree.parse(path).getroot()
+    except (OSError, ElementTree.ParseError) as e:
+        raise FrameworkError(f"{os.path.relpath(path)}: {e}") from None
+
+
+@functools.lru_cache(maxsize=None)
+def public_ids():
+    """{(tipo, nombre): ID} de los recursos públicos del framework"""
+    return {(element.get("type"), element.get("name")): int(element.get("id"), 16)
+            for element in _parse(PUBLIC_XML).iter("public")
+            if element.get("id") and element.get("type")}
+
+
+@functools.lru_cache(maxsize=None)
+def attributes():
+    """{nombre: Attribute} de todos los atributos definidos por el framework
+
+    Un mismo atributo se declara en varios declare-styleable; los formatos y
+    valores de todas sus declaraciones se juntan.
+    """
+    paths = sorted(glob.glob(os.path.join(PLATFORM_VALUES_DIR, "attrs*.xml")))
+    if not paths:
+        raise FrameworkError(f"{os.path.relpath(PLATFORM_VALUES_DIR)}: sin attrs*.xml")
+    formats = {}
+    values = {}
+    for path in paths:
+        for element in _parse(path).iter("attr"):
+            name = element.get("name")
+            if not name or ":" in name:
+                continue
+            found = formats.setdefault(name, set())
+            found.update(part for part in element.get("format", "").split("|") if part)
+            for child in element:
+                if child.tag in ("enum", "flag"):
+                    found.add("enum" if child.tag == "enum" else "flags")
+                    values.setdefault(name, {})[child.get("name")] = int(child.get("value"), 0)
+    return {name: Attribute(frozenset(found), values.get(name, {}))
+            for name, found in formats.items()}
+
+
+def resource_id(kind, name):
+    """ID público de @android:kind/name, o None si no es público"""
+    return public_ids().get((kind, name))
+
+
+def attribute(name):
+    """Attribute de android:name, o None si el framework no lo define"""
+    return attributes().get(name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consultar los recursos públicos del framework")
+    parser.add_argument("references", nargs="*", metavar="TIPO/NOMBRE",
+                        help="Recursos a buscar (attr/pathData, style/Theme.Material...)")
+    parser.add_argument("--attribute", "-a", action="append", default=[], metavar="NOMBRE",
+                        help="Mostrar los formatos y valores de un atributo")
+    args = parser.parse_args()
+
+    failed = False
+    try:
+        for reference in args.references:
+            kind, _, name = reference.partition("/")
+            found = resource_id(kind, name)
+            if found is None:
+                print(f"❌ @android:{reference} no es público en {PLATFORM}")
+                failed = True
+            else:
+                print(f"✅ @android:{reference} = 0x{found:08x}")
+        for name in args.attribute:
+            found = attribute(name)
+            if found is None:
+                print(f"❌ android:{name} no está definido en {PLATFORM}")
+                failed = True
+                continue
+            print(f"🔤 android:{name}: {'|'.join(sorted(found.formats)) or 'sin formato'}")
+            for value_name, value in found.values.items():
+                print(f"  {value_name} = 0x{value & 0xFFFFFFFF:x}")
+        if not args.references and not args.attribute:
+            print(f"📚 {PLATFORM}: {len(public_ids())} recursos públicos, "
+                  f"{len(attributes())} atributos")
+    except FrameworkError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    sys.exit(1 if failed else 0)
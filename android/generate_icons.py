@@ -2,10 +2,38 @@
 """
 Script para generar iconos de la aplicación TheCookFlow
 Genera todos los tamaños necesarios para Android desde un icono base
+
+El icono se dibuja una sola vez a resolución supersampleada (MASTER_SIZE) y
+cada densidad se obtiene remuestreando ese master con Lanczos, así que los
+tamaños pequeños salen con antialiasing real. Las variantes idénticas
+(ic_launcher / ic_launcher_round, splash / icono de Play Store) se
+codifican a PNG una vez y comparten los bytes.
+
+Como script genera el grupo "icons" de build_assets.py (con su caché).
 """
 
-from PIL import Image, ImageDraw, ImageFont
-import os
+from PIL import Image, ImageDraw
+import functools
+import io
+import argparse
+
+from fonts import get_font, text_size
+from tracing import add_tracing_arguments, phase
+
+# Tamaños estándar de iconos para Android
+ICON_SIZES = {
+    'mipmap-mdpi': 48,
+    'mipmap-hdpi': 72,
+    'mipmap-xhdpi': 96,
+    'mipmap-xxhdpi': 144,
+    'mipmap-xxxhdpi': 192,
+}
+
+# Splash y Play Store
+LOGO_SIZE = 512
+
+# Master supersampleado: el doble del mayor tamaño generado
+MASTER_SIZE = 2 * LOGO_SIZE
 
 def create_thecookflow_icon(size):
     """Crea el icono de TheCookFlow con el estilo pizarra"""
@@ -43,21 +71,11 @@ def create_thecookflow_icon(size):
               fill=(245, 245, 220, 255), width=max(1, size // 128))
     
     # Agregar letra "C" estilizada (de CookFlow)
-    font_size = max(size // 8, 8)
-    try:
-        # Intentar usar una fuente del sistema
-        font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", font_size)
-    except:
-        try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except:
-            font = ImageFont.load_default()
+    font = get_font("title", max(size // 8, 8))
     
     # Dibujar "C" en la parte inferior
     text = "C"
-    text_bbox = draw.textbbox((0, 0), text, font=font)
-    text_width = text_bbox[2] - text_bbox[0]
-    text_height = text_bbox[3] - text_bbox[1]
+    text_width, text_height = text_size(font, text)
     text_x = (size - text_width) // 2
     text_y = size - margin - text_height - size // 20
     
@@ -65,54 +83,52 @@ def create_thecookflow_icon(size):
     
     return img
 
-def generate_android_icons():
-    """Genera todos los iconos necesarios para Android"""
-    # Tamaños estándar de iconos para Android
-    icon_sizes = {
-        'mipmap-mdpi': 48,
-        'mipmap-hdpi': 72,
-        'mipmap-xhdpi': 96,
-        'mipmap-xxhdpi': 144,
-        'mipmap-xxxhdpi': 192,
-    }
-    
-    # Crear directorios si no existen
-    for folder in icon_sizes.keys():
-        os.makedirs(f'android/app/src/main/res/{folder}', exist_ok=True)
-    
-    # Generar iconos
-    for folder, size in icon_sizes.items():
-        # Icono principal
-        icon = create_thecookflow_icon(size)
-        icon.save(f'android/app/src/main/res/{folder}/ic_launcher.png')
-        
-        # Icono redondo (mismo diseño)
-        icon_round = create_thecookflow_icon(size)
-        icon_round.save(f'android/app/src/main/res/{folder}/ic_launcher_round.png')
-        
-        print(f"Generated {folder}: {size}x{size}")
+@functools.lru_cache(maxsize=None)
+def render_master(size=MASTER_SIZE):
+    """Único render vectorial del icono, a resolución supersampleada
+
+    La imagen es compartida: no modificarla.
+    """
+    with phase("icon_render", size=size):
+        return create_thecookflow_icon(size)
 
-def generate_splash_logo():
-    """Genera el logo para la pantalla de splash"""
-    size = 512
-    logo = create_thecookflow_icon(size)
-    os.makedirs('android/app/src/main/res/drawable', exist_ok=True)
-    logo.save('android/app/src/main/res/drawable/splash_logo.png')
-    print(f"Generated splash logo: {size}x{size}")
+@functools.lru_cache(maxsize=None)
+def icon_at(size):
+    """Icono a un tamaño dado, remuestreado con Lanczos desde el master"""
+    master = render_master()
+    if size == master.width:
+        return master
+    with phase("icon_resample", size=size):
+        return master.resize((size, size), Image.LANCZOS)
 
-def generate_play_store_icon():
-    """Genera el icono de 512x512 para Play Store"""
-    size = 512
-    icon = create_thecookflow_icon(size)
-    icon.save('play_store_assets/ic_launcher_512.png')
-    print(f"Generated Play Store icon: {size}x{size}")
+@functools.lru_cache(maxsize=None)
+def icon_png(size):
+    """PNG de icon_at(size), codificado una vez para todas sus copias"""
+    with phase("icon_encode", size=size) as traced:
+        buffer = io.BytesIO()
+        icon_at(size).save(buffer, "PNG")
+        traced.bytes_written = buffer.tell()
+    return buffer.getvalue()
+
+def icon_pngs(sizes):
+    """PNG de cada tamaño de sizes, en orden: un único render del master para todos
+
+    Es el trabajo de build_assets.py para el juego completo, así que el
+    master no se vuelve a dibujar en cada proceso del pool.
+    """
+    return tuple(icon_png(size) for size in sizes)
 
 if __name__ == "__main__":
-    # Crear directorios necesarios
-    os.makedirs('play_store_assets', exist_ok=True)
+    from build_assets import add_asset_arguments, generate
+    
+    parser = argparse.ArgumentParser(description="Iconos de TheCookFlow")
+    add_asset_arguments(parser, jobs=1)
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
     
     print("Generando iconos para TheCookFlow...")
-    generate_android_icons()
-    generate_splash_logo()
-    generate_play_store_icon()
-    print("¡Iconos generados exitosamente!")
\ No newline at end of file
+    # Mismo planificador y caché que build_assets.py: sin cambios no se
+    # renderiza nada y los PNG conservan su mtime
+    generate(["icons"], args.jobs, not args.no_cache, args.trace, args.profile,
+             args.optimize, args.webp)
+    print("¡Iconos generados exitosamente!")
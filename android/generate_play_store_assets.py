@@ -1,130 +1,190 @@
 #!/usr/bin/env python3
 """
 Script para generar assets promocionales para Google Play Store
+
+Los textos de los screenshots salen de screenshots.json: título, subtítulo
+y características por idioma, con ajustes opcionales por clase de
+dispositivo (teléfono, tablet de 7" y de 10"). Se genera la matriz completa
+idioma × dispositivo; el fondo, el logo reescalado y las fuentes se cachean
+por tamaño y se comparten entre todas las capturas del mismo proceso.
+
+Como script genera el grupo "store" de build_assets.py (con su caché).
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+from collections import namedtuple
+import functools
+import json
 import os
+import argparse
+
+from backgrounds import CHALKBOARD, CHALKBOARD_GRADIENT, chalkboard, chalkboard_gradient
+from fonts import fit_font, get_font, text_size, wrap_text
+from tracing import add_tracing_arguments, traced
+
+# Tamaño de referencia del diseño de los screenshots (el del teléfono);
+# los demás tamaños escalan márgenes, fuentes y logo por su ancho
+SCREENSHOT_SIZE = (1080, 1920)
+SCREENSHOT_SPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'screenshots.json')
+FEATURE_GRAPHIC_SIZE = (1024, 500)
+FEATURE_GRAPHIC_PATH = 'play_store_assets/feature_graphic.png'
+VIDEO_SCRIPT_PATH = 'play_store_assets/video_script.txt'
+
+# Icono que se pega en la esquina de los screenshots (lo genera generate_icons.py)
+LOGO_PATH = 'android/app/src/main/res/mipmap-xxxhdpi/ic_launcher.png'
+
+# Captura de la matriz: idioma, clase de dispositivo, posición (desde 1),
+# tamaño, textos y ruta de salida
+Screenshot = namedtuple("Screenshot", "locale device index size title subtitle features path")
+
+class ScreenshotSpecError(Exception):
+    """Especificación de screenshots inválida"""
+
+def _spec_screenshot(locale, device, size, index, entry, output):
+    """Screenshot de una entrada de la especificación con los ajustes de su dispositivo"""
+    content = {**entry, **entry.get("devices", {}).get(device, {})}
+    try:
+        title, subtitle, features = content["title"], content["subtitle"], content["features"]
+    except KeyError as e:
+        raise ScreenshotSpecError(f"{locale} #{index}: falta {e.args[0]}")
+    if not all(isinstance(value, str) for value in (title, subtitle, *features)):
+        raise ScreenshotSpecError(f"{locale} #{index}: los textos deben ser cadenas")
+    path = output.format(locale=locale, device=device, index=index)
+    return Screenshot(locale, device, index, size, title, subtitle, tuple(features), path)
+
+def load_screenshots(spec_path=SCREENSHOT_SPEC):
+    """Matriz idioma × dispositivo de la especificación, ordenada por tamaño"""
+    try:
+        with open(spec_path, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+        output, devices, locales = spec["output"], spec["devices"], spec["locales"]
+    except (OSError, ValueError, KeyError) as e:
+        raise ScreenshotSpecError(f"{spec_path}: {e}")
+    sizes = {}
+    for device, size in devices.items():
+        if len(size) != 2 or not all(isinstance(value, int) and value > 0 for value in size):
+            raise ScreenshotSpecError(f"{device}: tamaño inválido {size}")
+        sizes[device] = tuple(size)
+    screenshots = []
+    for locale, entries in locales.items():
+        for index, entry in enumerate(entries, 1):
+            unknown = set(entry.get("devices", {})) - set(sizes)
+            if unknown:
+                raise ScreenshotSpecError(f"{locale} #{index}: dispositivos desconocidos "
+                                          f"{', '.join(sorted(unknown))}")
+            screenshots += [_spec_screenshot(locale, device, size, index, entry, output)
+                            for device, size in sizes.items()]
+    # Las capturas del mismo tamaño seguidas aprovechan el fondo y el logo cacheados
+    return sorted(screenshots, key=lambda shot: (shot.size, shot.locale, shot.index))
+
+@functools.lru_cache(maxsize=4)
+def _logo_source(logo_path, mtime_ns):
+    try:
+        with Image.open(logo_path) as logo:
+            logo.load()
+            return logo
+    except OSError:
+        return None
+
+@functools.lru_cache(maxsize=16)
+def _scaled_logo(logo_path, mtime_ns, size):
+    logo = _logo_source(logo_path, mtime_ns)
+    return logo.resize((size, size)) if logo is not None else None
+
+def scaled_logo(logo_path, size):
+    """Logo reescalado a size x size, una vez por tamaño y versión del archivo (None si no existe)
+
+    Las cachés van por mtime y un logo ausente no se cachea: en un proceso
+    largo el logo se recoge en cuanto aparece o cambia.
+    """
+    try:
+        mtime_ns = os.stat(logo_path).st_mtime_ns
+    except OSError:
+        return None
+    return _scaled_logo(logo_path, mtime_ns, size)
 
-def create_screenshot_mockup(width, height, title, subtitle, features):
+@traced("screenshot_render")
+def create_screenshot_mockup(width, height, title, subtitle, features, logo_path=LOGO_PATH):
     """Crea un mockup de screenshot estilo pizarra"""
-    # Fondo estilo pizarra
-    img = Image.new('RGB', (width, height), (45, 77, 58))  # dark_green
-    draw = ImageDraw.Draw(img)
+    # Medidas del diseño de referencia escaladas al ancho de este tamaño
+    scale = width / SCREENSHOT_SIZE[0]
+    def px(value):
+        return round(value * scale)
     
-    # Añadir textura de pizarra (líneas sutiles)
-    for i in range(0, height, 20):
-        draw.line([(0, i), (width, i)], fill=(50, 82, 63), width=1)
+    # Fondo estilo pizarra (rayas sutiles y grano de tiza, cacheado por tamaño)
+    img = chalkboard((width, height), CHALKBOARD).copy()
+    draw = ImageDraw.Draw(img)
     
-    # Título principal
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 48)
-        subtitle_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 32)
-        feature_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 24)
-    except:
-        title_font = ImageFont.load_default()
-        subtitle_font = ImageFont.load_default()
-        feature_font = ImageFont.load_default()
+    # Título (ajustado al ancho libre junto al logo), subtítulo y
+    # características partidos en líneas con las métricas cacheadas
+    margin = px(160)
+    title_font = fit_font(title, "title", width - 2 * margin, px(48))
+    subtitle_font = get_font("body", px(32))
+    feature_font = get_font("body", px(24))
     
     # Dibujar título
-    title_bbox = draw.textbbox((0, 0), title, font=title_font)
-    title_width = title_bbox[2] - title_bbox[0]
+    title_width = text_size(title_font, title)[0]
     title_x = (width - title_width) // 2
-    draw.text((title_x, 80), title, fill=(245, 245, 220), font=title_font)  # chalk_white
+    draw.text((title_x, px(80)), title, fill=(245, 245, 220), font=title_font)  # chalk_white
     
     # Dibujar subtítulo
-    subtitle_bbox = draw.textbbox((0, 0), subtitle, font=subtitle_font)
-    subtitle_width = subtitle_bbox[2] - subtitle_bbox[0]
-    subtitle_x = (width - subtitle_width) // 2
-    draw.text((subtitle_x, 150), subtitle, fill=(168, 213, 186), font=subtitle_font)  # chalk_green
+    y_offset = px(150)
+    for line in wrap_text(subtitle, subtitle_font, width - 2 * margin):
+        line_width = text_size(subtitle_font, line)[0]
+        draw.text(((width - line_width) // 2, y_offset), line, fill=(168, 213, 186),
+                  font=subtitle_font)  # chalk_green
+        y_offset += px(40)
     
     # Dibujar características
-    y_offset = 220
+    y_offset = max(px(220), y_offset + px(30))
     for i, feature in enumerate(features):
         # Bullet point
-        draw.ellipse([100, y_offset + 5, 110, y_offset + 15], fill=(168, 213, 186))
+        draw.ellipse([px(100), y_offset + px(5), px(110), y_offset + px(15)], fill=(168, 213, 186))
         
         # Texto de la característica
-        draw.text((130, y_offset), feature, fill=(212, 212, 170), font=feature_font)  # chalk
-        y_offset += 50
-    
-    # Agregar logo en la esquina
-    try:
-        logo = Image.open('android/app/src/main/res/mipmap-xxxhdpi/ic_launcher.png')
-        logo_resized = logo.resize((100, 100))
-        img.paste(logo_resized, (width - 150, 50), logo_resized if logo_resized.mode == 'RGBA' else None)
-    except:
+        for line in wrap_text(feature, feature_font, width - px(130) - px(100)):
+            draw.text((px(130), y_offset), line, fill=(212, 212, 170), font=feature_font)  # chalk
+            y_offset += px(32)
+        y_offset += px(18)
+    
+    # Agregar logo en la esquina (leído una vez y reescalado una vez por tamaño)
+    logo_size = px(100)
+    logo = scaled_logo(logo_path, logo_size)
+    if logo is not None:
+        img.paste(logo, (width - px(150), px(50)), logo if logo.mode == 'RGBA' else None)
+    else:
         # Crear logo simple si no existe
-        draw.ellipse([width - 150, 50, width - 50, 150], fill=(168, 213, 186))
-        draw.text((width - 120, 90), "C", fill=(45, 77, 58), font=title_font)
+        draw.ellipse([width - px(150), px(50), width - px(150) + logo_size, px(50) + logo_size],
+                     fill=(168, 213, 186))
+        draw.text((width - px(120), px(90)), "C", fill=(45, 77, 58), font=title_font)
     
     return img
 
-def generate_screenshots():
-    """Genera screenshots principales para Play Store"""
-    os.makedirs('play_store_assets/screenshots', exist_ok=True)
-    
-    # Screenshot 1: Generación de menús
-    screenshot1 = create_screenshot_mockup(
-        1080, 1920,
-        "TheCookFlow",
-        "Planifica tus menús semanales con IA",
-        [
-            "🤖 Generación automática con IA",
-            "🍽️ Menús personalizados para tu dieta",
-            "📱 Acceso desde cualquier dispositivo",
-            "⚡ Rápido y fácil de usar",
-            "💡 Sugerencias inteligentes"
-        ]
-    )
-    screenshot1.save('play_store_assets/screenshots/screenshot_1.png')
-    
-    # Screenshot 2: Lista de compras
-    screenshot2 = create_screenshot_mockup(
-        1080, 1920,
-        "Lista de Compras Inteligente",
-        "Organiza tu compra automáticamente",
-        [
-            "📋 Listas organizadas por categorías",
-            "💰 Precios estimados en tiempo real",
-            "🛒 Integración con Amazon Fresh",
-            "✅ Marca ingredientes comprados",
-            "📊 Control de presupuesto"
-        ]
-    )
-    screenshot2.save('play_store_assets/screenshots/screenshot_2.png')
-    
-    print("Screenshots generados: 1080x1920")
+def render_screenshot(shot, logo_path=LOGO_PATH):
+    """Imagen de un Screenshot de la especificación"""
+    return create_screenshot_mockup(*shot.size, shot.title, shot.subtitle, shot.features, logo_path)
 
-def generate_feature_graphic():
-    """Genera el banner de cabecera (1024x500)"""
-    width, height = 1024, 500
-    img = Image.new('RGB', (width, height), (45, 77, 58))
+@traced("feature_graphic_render")
+def create_feature_graphic():
+    """Crea el banner de cabecera (1024x500)"""
+    width, height = FEATURE_GRAPHIC_SIZE
+    # Gradiente sutil con grano de tiza
+    img = chalkboard_gradient((width, height), CHALKBOARD_GRADIENT).copy()
     draw = ImageDraw.Draw(img)
     
-    # Gradiente sutil
-    for y in range(height):
-        shade = int(45 + (y / height) * 20)
-        draw.line([(0, y), (width, y)], fill=(shade, 77, 58))
-    
-    try:
-        main_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 72)
-        sub_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 36)
-    except:
-        main_font = ImageFont.load_default()
-        sub_font = ImageFont.load_default()
+    margin = 60
     
     # Título principal
     title = "TheCookFlow"
-    title_bbox = draw.textbbox((0, 0), title, font=main_font)
-    title_width = title_bbox[2] - title_bbox[0]
+    main_font = fit_font(title, "title", width - 2 * margin, 72)
+    title_width = text_size(main_font, title)[0]
     title_x = (width - title_width) // 2
     draw.text((title_x, 150), title, fill=(245, 245, 220), font=main_font)
     
     # Subtítulo
     subtitle = "Tu planificador de menús semanales con IA"
-    subtitle_bbox = draw.textbbox((0, 0), subtitle, font=sub_font)
-    subtitle_width = subtitle_bbox[2] - subtitle_bbox[0]
+    sub_font = fit_font(subtitle, "body", width - 2 * margin, 36)
+    subtitle_width = text_size(sub_font, subtitle)[0]
     subtitle_x = (width - subtitle_width) // 2
     draw.text((subtitle_x, 250), subtitle, fill=(168, 213, 186), font=sub_font)
     
@@ -133,12 +193,11 @@ def generate_feature_graphic():
         x = 100 + i * 200
         draw.text((x, 350), icon, fill=(168, 213, 186), font=sub_font)
     
-    img.save('play_store_assets/feature_graphic.png')
-    print("Feature graphic generado: 1024x500")
+    return img
 
-def generate_promo_video_script():
-    """Genera el guión para el video promocional"""
-    script = """
+def promo_video_script():
+    """Guión para el video promocional"""
+    return """
 # GUIÓN VIDEO PROMOCIONAL THECOOKFLOW (30 segundos)
 
 ## Escena 1 (0-5s): Problema
@@ -172,14 +231,17 @@ def generate_promo_video_script():
 ## Música: Upbeat, familiar, cocina/hogar
 ## Colores: Verde pizarra (#2d4d3a), Tiza (#a8d5ba), Blanco tiza (#f5f5dc)
 """
-    
-    with open('play_store_assets/video_script.txt', 'w', encoding='utf-8') as f:
-        f.write(script)
-    print("Guión de video generado")
 
 if __name__ == "__main__":
+    from build_assets import add_asset_arguments, generate
+    
+    parser = argparse.ArgumentParser(description="Assets promocionales de TheCookFlow para Play Store")
+    add_asset_arguments(parser, jobs=1)
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    
     print("Generando assets promocionales para Google Play Store...")
-    generate_screenshots()
-    generate_feature_graphic()
-    generate_promo_video_script()
-    print("¡Assets promocionales generados exitosamente!")
\ No newline at end of file
+    # Screenshots, feature graphic y guión con el planificador y la caché de build_assets.py
+    generate(["store"], args.jobs, not args.no_cache, args.trace, args.profile,
+             args.optimize, args.webp)
+    print("¡Assets promocionales generados exitosamente!")
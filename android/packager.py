@@ -0,0 +1,714 @@
+#!/usr/bin/env python3
+"""
+Motor de empaquetado único para TheCookFlow
+Lee y comprime una sola vez las entradas compartidas del módulo base
+(manifest, tabla de recursos, dex, res/) y genera a partir de las mismas
+entradas comprimidas tanto el App Bundle (layout base/) como el APK (layout
+plano). Una compilación de release con los dos artefactos cuesta una sola
+pasada de compresión. El manifest y los XML de res/ (layouts, drawables,
+xml/...) se empaquetan compilados a XML binario (binary_xml.py); los de
+values/ solo van en la tabla de recursos, como hace aapt2.
+
+Junto a cada artefacto se guarda "<artefacto>.fingerprint" con la huella de
+sus entradas; si no cambió nada desde la última compilación, se omite.
+
+Las variantes (VARIANTS: package, versionCode/versionName, product id y host
+de deep links) comparten todo salvo el manifest, que se comprime por
+variante; el resto se copia ya comprimido a los artefactos de cada una.
+
+Con --watch se queda vigilando android/app/src/main y la plantilla del
+manifest y recompila de forma incremental en cuanto se guarda un cambio.
+
+Con "-" como ruta de artefacto (--aab - o --apk -) el archivo se escribe en
+stdout como flujo, sin temporal ni seek, para encadenarlo con la firma, un
+checksum o una subida; los mensajes van entonces a stderr.
+
+Uso:
+    python android/packager.py --aab app-release.aab --apk app-debug.apk -j 4
+    python android/packager.py --all-variants --aab "{variant}-release.aab" -j 4
+    python android/packager.py --watch
+    python android/packager.py --aab - --apk "" -j 4 | python android/apk_signer.py - -o app-release.aab
+    python android/packager.py --apk - --aab "" | tee app-debug.apk | sha256sum
+"""
+import os
+import sys
+import json
+import time
+import string
+import hashlib
+import argparse
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from binary_xml import BinaryXmlError, compile_xml
+from bundle_size import track_bundle_size
+from bundle_writer import (DEFLATE_LEVEL, BundleWriter, CompressionPolicy, EntryCompressor,
+                           FileSource, StreamingBundleWriter, parallel_summary)
+from entry_cache import EntryCache
+from resource_table import FlatCache, ResourceError, compile_resources
+from source_watcher import DEBOUNCE_SECONDS, SourceWatcher
+from tracing import add_tracing_arguments, phase, tracing
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC_MAIN = os.path.join(HERE, "app", "src", "main")
+RES_DIR = os.path.join(SRC_MAIN, "res")
+ASSETS_DIR = os.path.join(SRC_MAIN, "assets")
+
+# Sabor de la app: lo único que cambia entre artefactos de una misma release
+Variant = namedtuple("Variant", "name package version_code version_name product_id deep_link_host")
+
+# Matriz de variantes (la primera es la de por defecto)
+VARIANTS = {
+    "cookflow": Variant("cookflow", "com.cookflow.app", 1, "1.0.0", "suscripcion", "*.replit.dev"),
+    "thecookflow": Variant("thecookflow", "com.thecookflow.app", 1, "1.0.0", "suscripcion",
+                           "*.replit.dev"),
+}
+DEFAULT_VARIANT = VARIANTS["cookflow"]
+
+# App Bundle de release de cada variante: uno por package, para que no se
+# pisen el artefacto, su huella ni su historial de tamaño
+RELEASE_AAB = "{variant}-release.aab"
+
+PACKAGE_NAME = DEFAULT_VARIANT.package
+VERSION_CODE = DEFAULT_VARIANT.version_code
+VERSION_NAME = DEFAULT_VARIANT.version_name
+PRODUCT_ID = DEFAULT_VARIANT.product_id
+
+# Plantilla del manifest, compilada una vez y rellenada por variante
+MANIFEST_TEMPLATE = string.Template('''<?xml version="1.0" encoding="utf-8"?>
+<manifest xmlns:android="http://schemas.android.com/apk/res/android"
+    package="${package}"
+    android:versionCode="${version_code}"
+    android:versionName="${version_name}"
+    android:installLocation="auto">
+    
+    <uses-sdk 
+        android:minSdkVersion="24" 
+        android:targetSdkVersion="34" />
+    
+    <!-- Permisos esenciales -->
+    <uses-permission android:name="android.permission.INTERNET" />
+    <uses-permission android:name="android.permission.ACCESS_NETWORK_STATE" />
+    <uses-permission android:name="android.permission.CAMERA" />
+    <uses-permission android:name="android.permission.READ_EXTERNAL_STORAGE" android:maxSdkVersion="32" />
+    
+    <!-- Google Play Billing - Esencial para suscripciones -->
+    <uses-permission android:name="com.android.vending.BILLING" />
+    <uses-permission android:name="com.android.vending.CHECK_LICENSE" />
+    
+    <!-- Características opcionales -->
+    <uses-feature android:name="android.hardware.camera" android:required="false" />
+    <uses-feature android:name="android.hardware.camera.autofocus" android:required="false" />
+    
+    <application
+        android:allowBackup="true"
+        android:icon="@mipmap/ic_launcher"
+        android:roundIcon="@mipmap/ic_launcher_round"
+        android:label="TheCookFlow"
+        android:theme="@android:style/Theme.Material.Light.NoActionBar"
+        android:usesCleartextTraffic="true"
+        android:hardwareAccelerated="true"
+        android:largeHeap="true">
+        
+        <activity
+            android:name=".MainActivity"
+            android:exported="true"
+            android:screenOrientation="portrait"
+            android:launchMode="singleTask"
+            android:configChanges="orientation|keyboardHidden|screenSize">
+            
+            <intent-filter android:autoVerify="true">
+                <action android:name="android.intent.action.MAIN" />
+                <category android:name="android.intent.category.LAUNCHER" />
+            </intent-filter>
+            
+            <!-- Deep links para PWA -->
+            <intent-filter android:autoVerify="true">
+                <action android:name="android.intent.action.VIEW" />
+                <category android:name="android.intent.category.DEFAULT" />
+                <category android:name="android.intent.category.BROWSABLE" />
+                <data android:scheme="https" android:host="${deep_link_host}" />
+            </intent-filter>
+        </activity>
+        
+        <!-- Google Play Billing Service -->
+        <service 
+            android:name="com.android.vending.billing.IInAppBillingService" 
+            android:enabled="true"
+            android:exported="true" />
+        
+        <!-- Metadata Google Play -->
+        <meta-data 
+            android:name="com.google.android.play.billingclient.version" 
+            android:value="8.0.0" />
+        
+        <!-- App metadata -->
+        <meta-data 
+            android:name="com.cookflow.subscription.productid" 
+            android:value="${product_id}" />
+        <meta-data 
+            android:name="com.cookflow.price.monthly" 
+            android:value="1.99" />
+            
+    </application>
+</manifest>''')
+
+def create_manifest_xml(variant=DEFAULT_VARIANT):
+    """Crear AndroidManifest.xml optimizado para una variante (texto fuente)"""
+    return MANIFEST_TEMPLATE.substitute(variant._asdict())
+
+def create_manifest(variant=DEFAULT_VARIANT, table=None):
+    """AndroidManifest.xml de una variante compilado a XML binario
+
+    Con la tabla de recursos, @mipmap/ic_launcher y compañía van como IDs.
+    """
+    resolve = table.resolve if table is not None else None
+    return compile_xml(create_manifest_xml(variant), resolve=resolve, source=MANIFEST_PATH)
+
+def create_split_manifest(split, variant=DEFAULT_VARIANT):
+    """Manifest binario mínimo de un APK de configuración (split="config.xhdpi"...)"""
+    return compile_xml(f'''<?xml version="1.0" encoding="utf-8"?>
+<manifest xmlns:android="http://schemas.android.com/apk/res/android"
+    package="{variant.package}"
+    android:versionCode="{variant.version_code}"
+    android:versionName="{variant.version_name}"
+    split="{split}"
+    android:isFeatureSplit="false">
+    
+    <application android:hasCode="false" />
+</manifest>''', source=f"{split}/AndroidManifest.xml")
+
+# Configuración de App Bundle (la misma que declara BundleConfig.pb)
+BUNDLE_CONFIG = {
+    "optimizations": {
+        "splits_config": {
+            "split_dimension": [
+                {"value": "ABI", "negate": False},
+                {"value": "SCREEN_DENSITY", "negate": False},
+                {"value": "LANGUAGE", "negate": True}  # No dividir por idioma
+            ]
+        },
+        "uncompressed_glob": ["*.so", "*.dex"]
+    },
+    "compression": {
+        "uncompressed_glob": ["*.png", "*.jpg", "*.webp"]
+    }
+}
+
+def create_bundle_config():
+    """Crear BundleConfig.pb optimizado"""
+    # Protocol Buffer para configuración de App Bundle (BUNDLE_CONFIG)
+    # Convertir a bytes (simulación Protocol Buffer)
+    return bytes([
+        0x0A, 0x12,  # Optimization field
+        0x0A, 0x10,  # Splits config
+        0x08, 0x01,  # ABI splits enabled
+        0x10, 0x01,  # Density splits enabled  
+        0x18, 0x00,  # Language splits disabled
+        0x12, 0x08,  # Compression
+        0x0A, 0x06,  # Uncompressed globs
+        0x08, 0x01, 0x10, 0x01
+    ])
+
+def create_native_pb():
+    """Crear native.pb para librerías nativas"""
+    # Configuración nativa básica
+    return bytes([
+        0x08, 0x01,  # Version
+        0x12, 0x00   # No native libraries
+    ])
+
+def create_bundle_metadata():
+    """Crear metadata de herramientas de compilación"""
+    metadata = {
+        "com.android.tools.build.bundletool": {
+            "version": "1.15.6"
+        },
+        "com.android.tools.build.gradle": {
+            "version": "8.2.1"
+        }
+    }
+    return json.dumps(metadata["com.android.tools.build.gradle"])
+
+def create_dex():
+    """Crear classes.dex básico (DEX magic number + estructura mínima)"""
+    return b'dex\n037\x00' + b'\x00' * 90
+
+MANIFEST_PATH = "manifest/AndroidManifest.xml"
+
+# Directorios de res/ cuyos XML se compilan (layout, layout-land, drawable-v24...)
+COMPILED_XML_TYPES = {"anim", "animator", "color", "drawable", "interpolator", "layout", "menu",
+                      "mipmap", "navigation", "transition", "xml"}
+
+# Directorios de res/ que solo existen compilados en la tabla de recursos
+TABLE_ONLY_TYPES = {"values"}
+
+def scan_tree(directory, prefix):
+    """Generar los archivos de un directorio como (ruta en el módulo, FileSource)
+
+    Los archivos no se leen aquí: el escritor los procesa en chunks.
+    """
+    if not directory or not os.path.isdir(directory):
+        return
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, directory).replace(os.sep, "/")
+            yield f"{prefix}/{rel}", FileSource(path)
+
+def _resource_type(module_path):
+    parts = module_path.split("/")
+    return parts[1].split("-")[0] if len(parts) == 3 and parts[0] == "res" else None
+
+def is_compiled_xml(module_path):
+    """True si la entrada es un XML de res/ que se empaqueta como XML binario"""
+    return _resource_type(module_path) in COMPILED_XML_TYPES and module_path.endswith(".xml")
+
+def compile_tree(directory, prefix, table=None):
+    """scan_tree con los XML de COMPILED_XML_TYPES ya compilados a XML binario
+
+    Los archivos de TABLE_ONLY_TYPES (values/) no se empaquetan: su
+    contenido ya está en la tabla de recursos.
+    """
+    resolve = table.resolve if table is not None else None
+    for module_path, source in scan_tree(directory, prefix):
+        if _resource_type(module_path) in TABLE_ONLY_TYPES:
+            continue
+        if is_compiled_xml(module_path):
+            yield module_path, compile_xml(source.read(), resolve=resolve, source=source.path)
+        else:
+            yield module_path, source
+
+def module_inputs(res_dir=RES_DIR, assets_dir=ASSETS_DIR, variant=DEFAULT_VARIANT, table=None):
+    """Entradas del módulo base de una variante como (ruta en el módulo, datos)"""
+    if table is None:
+        table = compile_resources(res_dir)
+    with phase("manifest", variant=variant.name):
+        manifest = create_manifest(variant, table)
+    yield MANIFEST_PATH, manifest
+    yield from shared_inputs(res_dir, assets_dir, table)
+
+def shared_inputs(res_dir=RES_DIR, assets_dir=ASSETS_DIR, table=None):
+    """Entradas del módulo base que no dependen de la variante
+
+    La tabla de recursos compilada (resources.arsc en el APK) va como
+    resources.pb; los XML de res/ se compilan con sus referencias resueltas.
+    """
+    if table is None:
+        table = compile_resources(res_dir)
+    yield "dex/classes.dex", create_dex()
+    yield "resources.pb", table.encode()
+    yield "native.pb", create_native_pb()
+    yield from compile_tree(res_dir, "res", table)
+    yield from scan_tree(assets_dir, "assets")
+
+def bundle_only_entries():
+    """Entradas que solo existen en el App Bundle (fuera del módulo base)"""
+    yield "BundleConfig.pb", create_bundle_config()
+    yield "BUNDLE-METADATA/com.android.tools.build.gradle", create_bundle_metadata()
+
+def aab_path(module_path):
+    """Ruta de una entrada del módulo dentro del .aab"""
+    return f"base/{module_path}"
+
+# Traducción de rutas del módulo al layout plano del APK (None = no va en el APK)
+APK_RENAMES = {
+    MANIFEST_PATH: "AndroidManifest.xml",
+    "dex/classes.dex": "classes.dex",
+    "resources.pb": "resources.arsc",
+    "native.pb": None,
+}
+
+def apk_path(module_path):
+    """Ruta de una entrada del módulo dentro del .apk"""
+    return APK_RENAMES.get(module_path, module_path)
+
+def input_fingerprint(inputs, options):
+    """Huella sha256 de las entradas del empaquetado y de sus opciones
+
+    Cubre la plantilla del manifest, los bytes de configuración y los
+    archivos de android/app/src/main que se empaquetan.
+    """
+    digest = hashlib.sha256(json.dumps(options, sort_keys=True).encode("utf-8"))
+    for path, data in inputs:
+        if isinstance(data, FileSource):
+            # Hash del archivo calculado en streaming (y reutilizado por la caché)
+            digest.update(f"{path}\0{data.size}\0{data.sha256()}".encode("utf-8"))
+            continue
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest.update(f"{path}\0{len(data)}\0".encode("utf-8"))
+        digest.update(data)
+    return digest.hexdigest()
+
+def fingerprint_path(artifact):
+    """Archivo de huella que se guarda junto al artefacto"""
+    return f"{artifact}.fingerprint"
+
+def is_up_to_date(artifacts, fingerprint):
+    """True si todos los artefactos existen y se generaron con esta huella"""
+    for artifact in artifacts:
+        try:
+            with open(fingerprint_path(artifact), "r", encoding="utf-8") as f:
+                if f.read().strip() != fingerprint or not os.path.exists(artifact):
+                    return False
+        except OSError:
+            return False
+    return True
+
+def write_fingerprint(artifact, fingerprint):
+    """Guardar la huella junto al artefacto de forma atómica"""
+    tmp_path = f"{fingerprint_path(artifact)}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(fingerprint + "\n")
+    os.replace(tmp_path, fingerprint_path(artifact))
+
+def layout_path(layout, module_path):
+    """Ruta de una entrada del módulo en el layout 'aab' o 'apk'"""
+    return aab_path(module_path) if layout == "aab" else apk_path(module_path)
+
+def variant_path(pattern, variant, multiple=False):
+    """Ruta de un artefacto para una variante
+
+    "{variant}" en el patrón se sustituye por el nombre de la variante; si no
+    aparece y se compilan varias, se añade "-<variante>" antes de la extensión.
+    """
+    if "{variant}" in pattern:
+        return pattern.replace("{variant}", variant.name)
+    if not multiple:
+        return pattern
+    stem, extension = os.path.splitext(pattern)
+    return f"{stem}-{variant.name}{extension}"
+
+def release_aab(variant=DEFAULT_VARIANT):
+    """Ruta del App Bundle de release de una variante (cookflow-release.aab...)"""
+    return variant_path(RELEASE_AAB, variant)
+
+def prepare_inputs(variants, res_dir=RES_DIR, assets_dir=ASSETS_DIR, cache=None):
+    """Compilar recursos y generar las entradas de una compilación
+
+    Devuelve (entradas compartidas del módulo, entradas de nivel bundle,
+    {variante: manifest compilado}).
+    """
+    with phase("resources", res_dir=res_dir):
+        # Los XML de res/ sin cambios salen de los .flat de la compilación anterior
+        table = compile_resources(res_dir, FlatCache() if cache is not None else None)
+        shared = list(shared_inputs(res_dir, assets_dir, table))
+    with phase("config"):
+        bundle_inputs = list(bundle_only_entries())
+    manifests = {}
+    for variant in variants:
+        with phase("manifest", variant=variant.name):
+            manifests[variant.name] = create_manifest(variant, table)
+    if table.unresolved:
+        # Quedan como string en el artefacto: el dispositivo no las resuelve
+        print(f"⚠️  Referencias sin resolver (se empaquetan como texto): "
+              f"{', '.join(sorted(table.unresolved))}")
+    return shared, bundle_inputs, manifests
+
+def write_inputs(writer, compressor, layout, bundle_inputs, module_entries, deterministic=False):
+    """Comprimir y escribir en writer las entradas de un artefacto con su layout
+
+    Devuelve ([(arcname, clave, entrada)] de nivel bundle, [(ruta de módulo,
+    clave, entrada)]) con las entradas tal como quedaron en el artefacto.
+    """
+    module_entries = [(path, data) for path, data in module_entries
+                      if layout_path(layout, path) is not None]
+    bundle_inputs = list(bundle_inputs) if layout == "aab" else []
+    if deterministic:
+        # En el .aab las entradas de nivel bundle ("BUNDLE-METADATA/...",
+        # "BundleConfig.pb") ordenan antes que "base/...", así que ordenar
+        # cada grupo por separado da el orden global
+        module_entries.sort(key=lambda item: layout_path(layout, item[0]))
+        bundle_inputs.sort(key=lambda item: item[0])
+    bundle_written = [(arcname, key, writer.add_item(arcname, key, item))
+                      for arcname, key, item in compressor.compress_all(bundle_inputs)]
+    written = [(module_path, key, writer.add_item(layout_path(layout, module_path), key, item))
+               for module_path, key, item in compressor.compress_all(module_entries)]
+    return bundle_written, written
+
+def build_artifacts(aab=None, apk=None, cache=None, jobs=1, res_dir=RES_DIR,
+                    deterministic=False, force=False, assets_dir=ASSETS_DIR,
+                    variant=DEFAULT_VARIANT):
+    """Comprimir las entradas una vez y escribir el .aab y/o el .apk de una variante
+
+    Devuelve (compresor, {ruta artefacto: BundleWriter}); el diccionario
+    queda vacío si la compilación se omitió por estar al día.
+    """
+    compressor, built = build_variants([variant], aab, apk, cache, jobs, res_dir,
+                                       deterministic, force, assets_dir)
+    return compressor, built.get(variant.name, {})
+
+def build_variants(variants, aab=None, apk=None, cache=None, jobs=1, res_dir=RES_DIR,
+                   deterministic=False, force=False, assets_dir=ASSETS_DIR):
+    """Compilar varias variantes comprimiendo una sola vez lo que comparten
+
+    Si la huella de entradas de una variante coincide con la de la última
+    compilación de todos sus artefactos (y no se pasa force), se omite. En
+    modo determinista las entradas van ordenadas y con fecha fija, de modo que
+    entradas idénticas producen artefactos idénticos byte a byte.
+
+    La primera variante pendiente se comprime en streaming directamente en
+    su primer artefacto. El resto de artefactos (el APK de esa variante y
+    los de las demás variantes, en paralelo) solo comprimen su manifest y
+    copian en crudo por chunks todo lo demás desde él, así que ninguna fase
+    mantiene el árbol completo en memoria.
+
+    Devuelve (compresor, {variante: {ruta artefacto: BundleWriter}}) con solo
+    las variantes que se han compilado.
+    """
+    multiple = len(variants) > 1
+    layouts = [(layout, pattern) for layout, pattern in (("aab", aab), ("apk", apk)) if pattern]
+    targets = {variant.name: [(layout, variant_path(pattern, variant, multiple))
+                              for layout, pattern in layouts]
+               for variant in variants}
+    shared, bundle_inputs, manifests = prepare_inputs(variants, res_dir, assets_dir, cache)
+    options = {"layouts": sorted(layout for layout, _ in layouts), "deterministic": deterministic,
+               "level": DEFLATE_LEVEL, "config": BUNDLE_CONFIG}
+    with phase("hash") as traced:
+        shared_fingerprint = input_fingerprint(shared + bundle_inputs, options)
+        traced.bytes_read = sum(data.size if isinstance(data, FileSource) else len(data)
+                                for _, data in shared + bundle_inputs)
+    fingerprints = {
+        variant.name: input_fingerprint([(MANIFEST_PATH, manifests[variant.name])],
+                                        {"shared": shared_fingerprint})
+        for variant in variants
+    }
+    
+    compressor = EntryCompressor(cache=cache, jobs=jobs,
+                                 policy=CompressionPolicy.from_bundle_config(BUNDLE_CONFIG))
+    pending = [variant for variant in variants
+               if force or not is_up_to_date([path for _, path in targets[variant.name]],
+                                             fingerprints[variant.name])]
+    if not pending:
+        return compressor, {}
+    
+    # Primer artefacto de la primera variante pendiente: comprime todo
+    seed = pending[0]
+    primary_layout, primary_path = targets[seed.name][0]
+    built = {seed.name: {}}
+    with phase("zip", artifact=primary_path) as traced:
+        with BundleWriter(primary_path, compressor=compressor, deterministic=deterministic) as writer:
+            bundle_written, written = write_inputs(
+                writer, compressor, primary_layout, bundle_inputs,
+                [(MANIFEST_PATH, manifests[seed.name])] + shared, deterministic)
+        traced.bytes_read = writer.bytes_in
+        traced.bytes_written = os.path.getsize(primary_path)
+    write_fingerprint(primary_path, fingerprints[seed.name])
+    built[seed.name][primary_path] = writer
+    
+    shared_written = [item for item in written if item[0] != MANIFEST_PATH]
+    
+    # Manifests del resto de variantes (pequeños: se comprimen aquí mismo)
+    manifest_entries = {seed.name: next(item[1:] for item in written if item[0] == MANIFEST_PATH)}
+    for variant in pending[1:]:
+        manifest_entries[variant.name] = compressor.compress(
+            MANIFEST_PATH, manifests[variant.name])
+    
+    def write_copy(variant, layout, path):
+        """Escribir un artefacto copiando entradas ya comprimidas"""
+        module_entries = [(MANIFEST_PATH, *manifest_entries[variant.name])] + shared_written
+        entries = [(layout_path(layout, module_path), key, entry)
+                   for module_path, key, entry in module_entries
+                   if layout_path(layout, module_path) is not None]
+        if layout == "aab":
+            entries = bundle_written + entries
+        if deterministic:
+            entries.sort(key=lambda item: item[0])
+        with phase("zip", artifact=path, variant=variant.name) as traced:
+            with BundleWriter(path, compressor=compressor, deterministic=deterministic) as writer:
+                for arcname, key, entry in entries:
+                    writer.add_compressed(arcname, entry, key)
+            traced.bytes_read = sum(len(entry.data) for _, _, entry in entries)
+            traced.bytes_written = os.path.getsize(path)
+        write_fingerprint(path, fingerprints[variant.name])
+        return variant, path, writer
+    
+    copies = [(seed, layout, path) for layout, path in targets[seed.name][1:]]
+    copies += [(variant, layout, path) for variant in pending[1:]
+               for layout, path in targets[variant.name]]
+    # Las copias son E/S y CRC ya calculados: varias a la vez en hilos
+    with ThreadPoolExecutor(max_workers=max(1, compressor.jobs)) as pool:
+        for variant, path, writer in pool.map(lambda copy: write_copy(*copy), copies):
+            built.setdefault(variant.name, {})[path] = writer
+    
+    return compressor, built
+
+def stream_artifact(sink, layout="aab", variant=DEFAULT_VARIANT, cache=None, jobs=1,
+                    res_dir=RES_DIR, deterministic=False, assets_dir=ASSETS_DIR):
+    """Empaquetar un único artefacto como flujo en sink (stdout, un pipe...)
+
+    No hay ruta a la que comparar la huella, así que siempre se empaqueta;
+    la caché de entradas solo se consulta. La compresión en hilos, la
+    escritura y el consumidor del otro lado del pipe avanzan a la vez.
+
+    Devuelve (compresor, StreamingBundleWriter).
+    """
+    shared, bundle_inputs, manifests = prepare_inputs([variant], res_dir, assets_dir, cache)
+    compressor = EntryCompressor(cache=cache, jobs=jobs,
+                                 policy=CompressionPolicy.from_bundle_config(BUNDLE_CONFIG))
+    with phase("zip", artifact="-", variant=variant.name) as traced:
+        with StreamingBundleWriter(sink, compressor=compressor, deterministic=deterministic) as writer:
+            write_inputs(writer, compressor, layout, bundle_inputs,
+                         [(MANIFEST_PATH, manifests[variant.name])] + shared, deterministic)
+        traced.bytes_read = writer.bytes_in
+        traced.bytes_written = writer.bytes_written
+    return compressor, writer
+
+def watch_paths(res_dir=RES_DIR, assets_dir=ASSETS_DIR):
+    """Fuentes que afectan a los artefactos: src/main, res/, assets/ y la plantilla del manifest"""
+    return [SRC_MAIN, res_dir, assets_dir, os.path.abspath(__file__)]
+
+def watch(variants, aab=None, apk=None, cache=None, jobs=1, res_dir=RES_DIR,
+          deterministic=False, assets_dir=ASSETS_DIR, debounce=DEBOUNCE_SECONDS):
+    """Recompilar cada vez que cambian las fuentes, hasta Ctrl+C
+
+    Cada ráfaga de cambios se recompila en este mismo proceso: los .flat de
+    res/ y las entradas comprimidas sin cambios salen de la compilación
+    anterior, así que solo se recomprimen las entradas cuyo contenido cambió;
+    si el contenido no cambió (p. ej. un touch) la huella lo omite. Como la
+    plantilla del manifest y VARIANTS viven en este módulo, un cambio en
+    packager.py reinicia el proceso para cargarlos.
+    """
+    template = os.path.abspath(__file__)
+    with SourceWatcher(watch_paths(res_dir, assets_dir)) as watcher:
+        print(f"👀 Vigilando {os.path.relpath(SRC_MAIN)} y la plantilla del manifest "
+              f"({watcher.backend}); Ctrl+C para salir")
+        while True:
+            changed, first = watcher.wait(debounce)
+            if template in changed:
+                print("🔁 Cambió packager.py: reiniciando para cargar la plantilla del manifest")
+                sys.stdout.flush()
+                os.execv(sys.executable, [sys.executable] + sys.argv)
+            names = ", ".join(os.path.relpath(path, SRC_MAIN) for path in changed[:3])
+            print(f"📝 {len(changed)} cambios: {names}{' ...' if len(changed) > 3 else ''}")
+            if cache is not None:
+                cache.reset_counters()
+            try:
+                compressor, built = build_variants(variants, aab, apk, cache, jobs, res_dir,
+                                                   deterministic, assets_dir=assets_dir)
+            except (BinaryXmlError, ResourceError, OSError) as e:
+                # Un XML a medio editar no debe tumbar la vigilancia
+                print(f"❌ {e}")
+                continue
+            print_summary(compressor, {path: writer for outputs in built.values()
+                                       for path, writer in outputs.items()})
+            print(f"⚡ Artefactos al día {(time.perf_counter() - first) * 1000:.0f} ms "
+                  f"después del primer cambio")
+
+def peak_memory_mb():
+    """Memoria residente pico del proceso en MB (None si no se puede medir)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa en KB, macOS en bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def within_memory_budget(budget_mb):
+    """Comprobar la memoria pico contra el presupuesto (None = sin límite)"""
+    peak = peak_memory_mb()
+    if budget_mb is None or peak is None or peak <= budget_mb:
+        return True
+    print(f"❌ Memoria pico {peak:.1f} MB por encima del presupuesto de {budget_mb:.0f} MB")
+    return False
+
+def print_summary(compressor, artifacts):
+    """Resumen de artefactos generados"""
+    if not artifacts:
+        print("⏭️  Sin cambios desde la última compilación: empaquetado omitido")
+        return
+    for path, writer in artifacts.items():
+        size_kb = os.path.getsize(path) / 1024
+        print(f"📁 {path}: {size_kb:.1f} KB ({writer.entries} entradas, "
+              f"{writer.stored_entries} sin comprimir)")
+    if compressor.cache is not None:
+        print(f"♻️  Caché: {compressor.cache.summary()}")
+    if compressor.compress_wall_seconds > 0:
+        print(f"⚡ Compresión: {parallel_summary(compressor)}")
+    peak = peak_memory_mb()
+    if peak is not None:
+        print(f"🧠 Memoria pico: {peak:.1f} MB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Empaquetado AAB + APK de TheCookFlow en una pasada")
+    parser.add_argument("--aab", default="app-release.aab", help="Ruta del App Bundle ('' para omitirlo)")
+    parser.add_argument("--apk", default="app-debug.apk", help="Ruta del APK ('' para omitirlo)")
+    parser.add_argument("--res", default=RES_DIR, help="Directorio res/ a incluir")
+    parser.add_argument("--assets", default=ASSETS_DIR, help="Directorio assets/ a incluir")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Recomprimir todas las entradas sin usar la caché incremental")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Hilos de compresión en paralelo (0 = todos los núcleos)")
+    parser.add_argument("--reproducible", action="store_true",
+                        help="Fechas fijas y orden de entradas estable (salida idéntica byte a byte)")
+    parser.add_argument("--force", action="store_true",
+                        help="Empaquetar aunque la huella de entradas no haya cambiado")
+    parser.add_argument("--memory-budget", type=float, metavar="MB",
+                        help="Fallar si la memoria pico del empaquetado supera este presupuesto")
+    parser.add_argument("--no-size-check", action="store_true",
+                        help="No analizar el tamaño por categoría ni aplicar size_budgets.json")
+    parser.add_argument("--variant", action="append", choices=sorted(VARIANTS),
+                        help="Variante a compilar (repetible; por defecto la principal)")
+    parser.add_argument("--all-variants", action="store_true",
+                        help="Compilar todas las variantes de VARIANTS a la vez")
+    parser.add_argument("--watch", action="store_true",
+                        help="Tras compilar, recompilar de forma incremental con cada cambio")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS, metavar="SEGUNDOS",
+                        help="Silencio que cierra una ráfaga de cambios en --watch")
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    
+    variants = list(VARIANTS.values()) if args.all_variants else \
+        [VARIANTS[name] for name in args.variant or [DEFAULT_VARIANT.name]]
+    streamed = [layout for layout, path in (("aab", args.aab), ("apk", args.apk)) if path == "-"]
+    if streamed:
+        if (args.aab and args.apk) or len(variants) > 1 or args.watch:
+            parser.error("con '-' solo se empaqueta un artefacto de una variante, sin --watch "
+                         "(omitir el otro con --aab '' o --apk '')")
+        if sys.stdout.isatty():
+            parser.error("stdout es una terminal: redirigirlo a un pipe o a un archivo")
+        # El archivo sale por stdout; los mensajes, por stderr
+        sink = sys.stdout.buffer
+        sys.stdout = sys.stderr
+    for variant in variants:
+        print(f"🚀 Empaquetando {variant.package} {variant.version_name} "
+              f"(código {variant.version_code})")
+    cache = None if args.no_cache else EntryCache()
+    if streamed:
+        try:
+            with tracing(args.trace, args.profile):
+                compressor, writer = stream_artifact(
+                    sink, streamed[0], variants[0], cache, args.jobs, args.res,
+                    deterministic=args.reproducible, assets_dir=args.assets)
+        except BrokenPipeError:
+            # Evitar un segundo BrokenPipeError al vaciar stdout en la salida
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sink.fileno())
+            print("❌ El consumidor cerró el pipe antes de recibir el archivo completo")
+            sys.exit(1)
+        print(f"📤 {streamed[0]} enviado por stdout: {writer.bytes_written / 1024:.1f} KB "
+              f"({writer.entries} entradas, {writer.stored_entries} sin comprimir)")
+        if compressor.cache is not None:
+            print(f"♻️  Caché: {compressor.cache.summary()}")
+        sys.exit(0 if within_memory_budget(args.memory_budget) else 1)
+    with tracing(args.trace, args.profile):
+        compressor, built = build_variants(variants, args.aab, args.apk, cache, args.jobs, args.res,
+                                           deterministic=args.reproducible, force=args.force,
+                                           assets_dir=args.assets)
+    artifacts = {path: writer for outputs in built.values() for path, writer in outputs.items()}
+    print_summary(compressor, artifacts)
+    within_size = args.no_size_check or all([track_bundle_size(path) for path in artifacts])
+    within_memory = within_memory_budget(args.memory_budget)
+    if args.watch:
+        try:
+            watch(variants, args.aab, args.apk, cache, args.jobs, args.res,
+                  deterministic=args.reproducible, assets_dir=args.assets, debounce=args.debounce)
+        except KeyboardInterrupt:
+            print("👋 Vigilancia terminada")
+    elif not within_memory or not within_size:
+        sys.exit(1)
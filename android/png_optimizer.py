@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Optimización sin pérdida de los PNG generados (iconos, splash, screenshots)
+Pillow guarda con zlib nivel 6 y la estrategia por defecto. Esta etapa
+prueba, para cada imagen, variantes que decodifican exactamente a los
+mismos píxeles (sin canal alfa si es opaco, escala de grises si R=G=B,
+paleta si tiene 256 colores o menos) combinadas con varios niveles y
+estrategias de zlib, y se queda con el resultado más pequeño. El filtro
+de cada fila lo elige Pillow (adaptativo en color verdadero, ninguno en
+paleta), así que las estrategias de zlib son lo que varía entre pruebas.
+
+Los recursos que van dentro del APK (rutas bajo un directorio res/) pueden
+salir además como WebP sin pérdida (minSdk 24 lo admite): con --webp se
+escribe <nombre>.webp y se borra el PNG si el WebP es más pequeño.
+
+Cada prueba es independiente y se reparte en un pool de procesos. El
+ganador se decodifica y se compara con la imagen original antes de
+escribirlo; un archivo solo se reescribe si el resultado es más pequeño.
+
+Para los assets que genera build_assets.py es mejor su --optimize (y
+--webp): aplica estas mismas pruebas y guarda el resultado en la caché de
+assets, que si no restauraría el PNG original en la siguiente generación.
+
+Uso:
+    python android/png_optimizer.py -j 0
+    python android/png_optimizer.py --webp android/app/src/main/res
+"""
+import argparse
+import io
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from asset_cache import write_if_changed
+
+# Salidas de generate_icons.py y generate_play_store_assets.py
+DEFAULT_PATHS = ['android/app/src/main/res', 'play_store_assets']
+
+# Niveles y estrategias de zlib (Z_DEFAULT_STRATEGY, Z_FILTERED, Z_RLE)
+ZLIB_LEVELS = (6, 9)
+ZLIB_STRATEGIES = {"default": 0, "filtered": 1, "rle": 3}
+
+WEBP_OPTIONS = {"lossless": True, "quality": 100, "method": 6, "exact": True}
+
+# Prueba: variante de la imagen, formato y opciones de Image.save
+Trial = namedtuple("Trial", "label image format options")
+
+# Resultado por archivo: ruta original, ruta escrita, bytes antes y después
+# y la prueba ganadora ("" si se dejó como estaba)
+OptimizeResult = namedtuple("OptimizeResult", "path output original size trial")
+
+
+def in_apk(path):
+    """True si path es un recurso que va dentro del APK (bajo un directorio res/)"""
+    return "res" in os.path.normpath(os.path.abspath(path)).split(os.sep)
+
+
+def lossless_variants(image):
+    """(etiqueta, imagen) con menos datos por píxel que decodifican igual que image"""
+    if image.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+        image = image.convert("RGBA")
+    variants = [(image.mode.lower(), image)]
+    reference = image.convert("RGBA").tobytes()
+    if image.mode == "RGBA" and image.getchannel("A").getextrema() == (255, 255):
+        image = image.convert("RGB")
+        variants.append(("rgb", image))
+    if image.mode == "RGB":
+        red, green, blue = (channel.tobytes() for channel in image.split())
+        if red == green == blue:
+            variants.append(("l", image.getchannel("R")))
+    colors = image.getcolors(256) if image.mode in ("RGB", "RGBA") else None
+    if colors is not None:
+        method = Image.Quantize.FASTOCTREE if image.mode == "RGBA" else Image.Quantize.MEDIANCUT
+        palette = image.quantize(len(colors), method=method, dither=Image.Dither.NONE)
+        if palette.convert("RGBA").tobytes() == reference:
+            variants.append(("p", palette))
+    return variants
+
+
+def trials(image, webp=False):
+    """Pruebas de codificación de una imagen (PNG en todas las combinaciones y WebP)"""
+    result = [Trial(f"{label} zlib{level} {name}", variant, "PNG",
+                    {"compress_level": level, "compress_type": strategy})
+              for label, variant in lossless_variants(image)
+              for level in ZLIB_LEVELS
+              for name, strategy in ZLIB_STRATEGIES.items()]
+    if webp:
+        result.append(Trial("webp sin pérdida", image, "WEBP", WEBP_OPTIONS))
+    return result
+
+
+def encode_trial(trial):
+    """Bytes de una prueba (se ejecuta en el pool)"""
+    buffer = io.BytesIO()
+    trial.image.save(buffer, trial.format, **trial.options)
+    return buffer.getvalue()
+
+
+def _identical(data, reference):
+    with Image.open(io.BytesIO(data)) as decoded:
+        return decoded.convert("RGBA").tobytes() == reference
+
+
+def _smallest(image, candidates, encoded):
+    """Prueba más pequeña que decodifica a los mismos píxeles que image"""
+    reference = image.convert("RGBA").tobytes()
+    for data, trial in sorted(zip(encoded, candidates), key=lambda pair: len(pair[0])):
+        if _identical(data, reference):
+            return data, trial
+    raise ValueError("ninguna prueba reproduce la imagen original")
+
+
+def optimize_image(image, webp=False, pool=None):
+    """(bytes, Trial) de la codificación sin pérdida más pequeña de image
+
+    Con pool, las pruebas se reparten entre sus procesos.
+    """
+    candidates = trials(image, webp)
+    encoded = list((pool.map if pool is not None else map)(encode_trial, candidates))
+    return _smallest(image, candidates, encoded)
+
+
+def png_files(paths):
+    """PNG de las rutas dadas (archivos o directorios, recursivamente), ordenados"""
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                found.update(os.path.join(root, name) for name in files
+                             if name.lower().endswith(".png"))
+        elif path.lower().endswith(".png") and os.path.isfile(path):
+            found.add(path)
+    return sorted(found)
+
+
+def optimize_files(paths, workers=0, webp=False):
+    """Optimizar los PNG en su sitio; devuelve un OptimizeResult por archivo
+
+    Todas las pruebas de todos los archivos van al mismo pool. Con webp, los
+    recursos del APK pasan a .webp si sale más pequeño.
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    images = {}
+    for path in paths:
+        with Image.open(path) as image:
+            image.load()
+            images[path] = image
+    candidates = {path: trials(image, webp and in_apk(path)) for path, image in images.items()}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {path: [pool.submit(encode_trial, trial) for trial in path_trials]
+                   for path, path_trials in candidates.items()}
+        encoded = {path: [future.result() for future in path_futures]
+                   for path, path_futures in futures.items()}
+
+    results = []
+    for path, image in images.items():
+        original = os.path.getsize(path)
+        data, trial = _smallest(image, candidates[path], encoded[path])
+        if len(data) >= original:
+            results.append(OptimizeResult(path, path, original, original, ""))
+            continue
+        output = path
+        if trial.format == "WEBP":
+            output = os.path.splitext(path)[0] + ".webp"
+        write_if_changed(output, data)
+        if output != path:
+            os.remove(path)
+        results.append(OptimizeResult(path, output, original, len(data), trial.label))
+    return results
+
+
+def print_report(results):
+    """Bytes ahorrados por archivo y en total"""
+    original = sum(result.original for result in results)
+    saved = original - sum(result.size for result in results)
+    print(f"🗜️  {len(results)} imágenes:")
+    for result in sorted(results, key=lambda result: result.size - result.original):
+        delta = result.original - result.size
+        percent = delta / result.original * 100 if result.original else 0.0
+        detail = f"{result.trial}" if result.trial else "ya óptima"
+        renamed = f" -> {os.path.basename(result.output)}" if result.output != result.path else ""
+        print(f"  {os.path.relpath(result.path):<60} {result.original / 1024:>8.1f} KB "
+              f"{'-' + format(delta / 1024, '.1f'):>8} KB ({percent:4.1f}%)  {detail}{renamed}")
+    percent = saved / original * 100 if original else 0.0
+    print(f"✅ Ahorrados {saved / 1024:.1f} KB de {original / 1024:.1f} KB ({percent:.1f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recomprimir sin pérdida los PNG generados")
+    parser.add_argument("paths", nargs="*", default=DEFAULT_PATHS, metavar="RUTA",
+                        help="Archivos PNG o directorios (por defecto, los assets generados)")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="Procesos en paralelo (0 = todos los núcleos)")
+    parser.add_argument("--webp", action="store_true",
+                        help="Convertir los recursos del APK a WebP sin pérdida si es más pequeño")
+    args = parser.parse_args()
+
+    files = png_files(args.paths)
+    if not files:
+        print("❌ No hay PNG que optimizar")
+        sys.exit(1)
+    try:
+        print_report(optimize_files(files, args.jobs, args.webp))
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Compilador incremental de la tabla de recursos de TheCookFlow
+Recorre android/app/src/main/res (values/*.xml, drawables, mipmaps, fuentes,
+layouts...) y genera la tabla binaria (ResTable, la de resources.arsc) con
+un pool global de strings deduplicado, pools de tipos y de claves, y un
+índice ordenado por tipo y nombre: los IDs 0x7fTTEEEE son estables mientras
+no cambien los nombres y el dispositivo resuelve cada recurso en O(1).
+
+Como aapt2, va en dos fases:
+  - compilación por archivo: cada XML se parsea a una lista de recursos
+    simbólicos (tipo, nombre, configuración, valor) que se guarda en
+    .bundle-cache/res-flat/<hash>.flat, indexado por el contenido del
+    archivo; solo se recompilan los archivos que cambiaron. Los binarios
+    (PNG, WebP, TTF) no se leen: su recurso sale de la ruta.
+  - enlazado: se asignan IDs a todos los recursos y se codifican valores,
+    estilos y arrays resolviendo las referencias @tipo/nombre. Es barato y
+    se hace siempre.
+
+Uso:
+    python android/resource_table.py
+    python android/resource_table.py --res otro/res --no-cache
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import struct
+import sys
+import time
+from collections import namedtuple
+from xml.etree import ElementTree
+
+from binary_xml import (TYPE_ATTRIBUTE, TYPE_INT_BOOLEAN, TYPE_REFERENCE, TYPE_STRING,
+                        _color, _string_pool_chunk, literal_value)
+from entry_cache import DEFAULT_CACHE_DIR
+from framework_resources import resource_id as framework_id
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RES_DIR = os.path.join(HERE, "app", "src", "main", "res")
+
+# Paquete de recursos: el namespace (clase R), común a todas las variantes
+RESOURCE_PACKAGE_ID = 0x7F
+RESOURCE_NAMESPACE = "com.cookflow.app"
+
+FLAT_DIR = os.path.join(DEFAULT_CACHE_DIR, "res-flat")
+# Cambiarla invalida todos los .flat guardados
+COMPILER_VERSION = 1
+
+# Tipos de chunk de la tabla (ResourceTypes.h)
+RES_TABLE_TYPE = 0x0002
+RES_TABLE_PACKAGE_TYPE = 0x0200
+RES_TABLE_TYPE_TYPE = 0x0201
+RES_TABLE_TYPE_SPEC_TYPE = 0x0202
+
+FLAG_COMPLEX = 0x0001
+NO_ENTRY = 0xFFFFFFFF
+# Nombre de los elementos de un array dentro de su bag (Res_MAKEARRAY)
+ARRAY_INDEX_BASE = 0x02000000
+
+_TABLE_HEADER = struct.Struct("<HHII")
+_PACKAGE_HEADER = struct.Struct("<HHII256sIIIII")
+_TYPE_SPEC_HEADER = struct.Struct("<HHIBBHI")
+_TYPE_HEADER = struct.Struct("<HHIBBHII")
+_ENTRY = struct.Struct("<HHI")
+_MAP_ENTRY = struct.Struct("<HHIII")
+_VALUE = struct.Struct("<HBBI")
+_MAP = struct.Struct("<I")
+CONFIG_SIZE = 64
+
+# Calificadores soportados en los directorios de res/ y su bit de cambio de configuración
+DENSITY_VALUES = {
+    "ldpi": 120, "mdpi": 160, "tvdpi": 213, "hdpi": 240, "xhdpi": 320,
+    "xxhdpi": 480, "xxxhdpi": 640, "anydpi": 0xFFFE, "nodpi": 0xFFFF,
+}
+CONFIG_LOCALE = 0x0004
+CONFIG_DENSITY = 0x0100
+CONFIG_VERSION = 0x0400
+
+# Etiquetas de values/ que dan un recurso simple de su mismo tipo
+_VALUE_TAGS = {"string", "color", "bool", "integer", "dimen", "fraction", "drawable"}
+_ARRAY_TAGS = {"array", "string-array", "integer-array"}
+_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_.]*")
+_NEW_ID = re.compile(rb"@\+id/([A-Za-z_][A-Za-z0-9_.]*)")
+_REFERENCE = re.compile(r"[@?](?:\+)?(?:([\w.]+):)?(?:(\w+)/)?([\w.]+)")
+_ESCAPE = re.compile(r"\\(u[0-9a-fA-F]{4}|.)")
+_ESCAPES = {"n": "\n", "t": "\t"}
+
+# Recurso simbólico de un archivo compilado: value es una lista serializable a JSON
+#   ["value", texto] ["string", texto] ["file", ruta] ["id"]
+#   ["style", padre o None, [[atributo, texto]...]] ["array", [texto...]]
+Resource = namedtuple("Resource", "type name config value")
+
+
+class ResourceError(Exception):
+    """Recurso inválido o duplicado en res/"""
+
+
+def parse_qualifiers(directory):
+    """(tipo, calificadores) de un directorio de res/: "mipmap-xhdpi" -> ("mipmap", "xhdpi")"""
+    kind, _, qualifiers = directory.partition("-")
+    for qualifier in filter(None, qualifiers.split("-")):
+        if not (qualifier in DENSITY_VALUES or re.fullmatch(r"v\d+", qualifier)
+                or re.fullmatch(r"[a-z]{2}", qualifier) or re.fullmatch(r"r[A-Z]{2}", qualifier)):
+            raise ResourceError(f"{directory}: calificador '{qualifier}' no soportado")
+    return kind, qualifiers
+
+
+def config_flags(qualifiers):
+    """Bits de cambio de configuración (ACONFIGURATION_*) de unos calificadores"""
+    flags = 0
+    for qualifier in filter(None, qualifiers.split("-")):
+        if qualifier in DENSITY_VALUES:
+            flags |= CONFIG_DENSITY
+        elif qualifier[0] == "v" and qualifier[1:].isdigit():
+            flags |= CONFIG_VERSION
+        else:
+            flags |= CONFIG_LOCALE
+    return flags
+
+
+def encode_config(qualifiers):
+    """ResTable_config de 64 bytes con idioma, región, densidad y versión de SDK"""
+    config = bytearray(CONFIG_SIZE)
+    struct.pack_into("<I", config, 0, CONFIG_SIZE)
+    for qualifier in filter(None, qualifiers.split("-")):
+        if qualifier in DENSITY_VALUES:
+            struct.pack_into("<H", config, 14, DENSITY_VALUES[qualifier])
+        elif qualifier[0] == "v" and qualifier[1:].isdigit():
+            struct.pack_into("<H", config, 24, int(qualifier[1:]))
+        elif qualifier[0] == "r":
+            config[10:12] = qualifier[1:].encode("ascii")
+        else:
+            config[8:10] = qualifier.encode("ascii")
+    return bytes(config)
+
+
+def _string_value(element):
+    """Texto de un <string> con las reglas de aapt: comillas, espacios y escapes"""
+    text = "".join(element.itertext())
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        text = text[1:-1]
+    else:
+        text = re.sub(r"\s+", " ", text).strip()
+
+    def unescape(match):
+        escaped = match.group(1)
+        if escaped[0] == "u" and len(escaped) == 5:
+            return chr(int(escaped[1:], 16))
+        return _ESCAPES.get(escaped, escaped)
+    return _ESCAPE.sub(unescape, text)
+
+
+def compile_values(data, qualifiers, source):
+    """Recursos y avisos de un XML de values/"""
+    try:
+        root = ElementTree.fromstring(data)
+    except ElementTree.ParseError as e:
+        raise ResourceError(f"{source}: {e}") from None
+    resources = []
+    warnings = []
+    for element in root:
+        tag = element.tag
+        name = element.get("name")
+        if tag in ("eat-comment", "skip"):
+            continue
+        if name is None:
+            warnings.append(f"{source}: <{tag}> sin name")
+            continue
+        if tag == "string":
+            resources.append(Resource("string", name, qualifiers, ["string", _string_value(element)]))
+        elif tag in _VALUE_TAGS or (tag == "item" and element.get("type")):
+            kind = element.get("type", tag)
+            resources.append(Resource(kind, name, qualifiers, ["value", (element.text or "").strip()]))
+        elif tag == "style":
+            parent = element.get("parent")
+            if parent and not parent.startswith("@"):
+                parent = "@style/" + parent
+            elif parent is None and "." in name:
+                # Padre implícito: Theme.TheCookFlow.Splash hereda de Theme.TheCookFlow
+                parent = "@style/" + name.rsplit(".", 1)[0]
+            items = [[item.get("name"), (item.text or "").strip()] for item in element
+                     if item.tag == "item"]
+            resources.append(Resource("style", name, qualifiers, ["style", parent, items]))
+        elif tag in _ARRAY_TAGS:
+            items = [(_string_value(item) if tag == "string-array" else (item.text or "").strip())
+                     for item in element if item.tag == "item"]
+            resources.append(Resource("array", name, qualifiers, ["array", items]))
+        else:
+            warnings.append(f"{source}: <{tag} name=\"{name}\"> no soportado, se omite")
+    return resources, warnings
+
+
+def compile_file(directory, filename, data=None):
+    """Recursos de un archivo de res/ (data solo hace falta para los XML)
+
+    Devuelve (recursos, avisos).
+    """
+    kind, qualifiers = parse_qualifiers(directory)
+    source = f"res/{directory}/{filename}"
+    if kind == "values":
+        return compile_values(data, qualifiers, source)
+    name = filename.split(".", 1)[0]
+    if not _NAME.fullmatch(name):
+        return [], [f"{source}: '{name}' no es un nombre de recurso válido, se omite"]
+    resources = [Resource(kind, name, qualifiers, ["file", source])]
+    if filename.endswith(".xml"):
+        # Los "@+id/..." de layouts y drawables declaran recursos de tipo id
+        for new_id in sorted(set(_NEW_ID.findall(data))):
+            resources.append(Resource("id", new_id.decode("ascii"), "", ["id"]))
+    return resources, []
+
+
+class FlatCache:
+    """Resultado de compilar cada archivo de res/, como los .flat de aapt2"""
+
+    def __init__(self, root=FLAT_DIR):
+        self.root = root
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(source, data):
+        digest = hashlib.sha256(f"{COMPILER_VERSION}\0{source}\0".encode("utf-8"))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.flat")
+
+    def get(self, key):
+        """(recursos, avisos) guardados, o None"""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                flat = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [Resource(*resource) for resource in flat["resources"]], flat["warnings"]
+
+    def put(self, key, resources, warnings):
+        """Guardar un .flat de forma atómica"""
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self._path(key)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"resources": resources, "warnings": warnings}, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(key))
+
+    def summary(self):
+        total = self.hits + self.misses
+        return f"{self.hits}/{total} XML de res/ sin recompilar"
+
+
+def compile_tree(res_dir, cache=None):
+    """Compilar todos los archivos de res/ (con la caché de .flat si se pasa)
+
+    Devuelve (recursos, avisos).
+    """
+    resources = []
+    warnings = []
+    if not res_dir or not os.path.isdir(res_dir):
+        return resources, warnings
+    for directory in sorted(os.listdir(res_dir)):
+        path = os.path.join(res_dir, directory)
+        if not os.path.isdir(path):
+            continue
+        for filename in sorted(os.listdir(path)):
+            if filename.startswith(".") or not os.path.isfile(os.path.join(path, filename)):
+                continue
+            if not filename.endswith(".xml"):
+                compiled = compile_file(directory, filename)
+            else:
+                with open(os.path.join(path, filename), "rb") as f:
+                    data = f.read()
+                key = FlatCache.key(f"{directory}/{filename}", data)
+                compiled = cache.get(key) if cache is not None else None
+                if compiled is None:
+                    compiled = compile_file(directory, filename, data)
+                    if cache is not None:
+                        cache.put(key, *compiled)
+            resources.extend(compiled[0])
+            warnings.extend(compiled[1])
+    return resources, warnings
+
+
+class ResourceTable:
+    """Recursos enlazados: IDs asignados y tabla binaria lista para el APK"""
+
+    def __init__(self, resources, warnings=(), namespace=RESOURCE_NAMESPACE):
+        self.namespace = namespace
+        self.warnings = list(warnings)
+        self.unresolved = set()
+        # {tipo: {nombre: {calificadores: valor}}}
+        self.values = {}
+        for resource in resources:
+            configs = self.values.setdefault(resource.type, {}).setdefault(resource.name, {})
+            if resource.config in configs and resource.value != configs[resource.config]:
+                if resource.type != "id":
+                    raise ResourceError(f"recurso duplicado: @{resource.type}/{resource.name}"
+                                        f"{'-' + resource.config if resource.config else ''}")
+            configs.setdefault(resource.config, resource.value)
+        # IDs por tipo y nombre en orden alfabético (attr primero, como aapt2)
+        self.types = sorted(self.values, key=lambda kind: (kind != "attr", kind))
+        self.names = {kind: sorted(self.values[kind]) for kind in self.types}
+        self.ids = {}
+        for type_index, kind in enumerate(self.types, 1):
+            for entry_index, name in enumerate(self.names[kind]):
+                self.ids[(kind, name)] = (RESOURCE_PACKAGE_ID << 24) | (type_index << 16) | entry_index
+
+    def __len__(self):
+        return len(self.ids)
+
+    def resolve(self, reference):
+        """ID de una referencia "@tipo/nombre", "@+id/nombre", "?android:attr/nombre"...
+
+        "@null" es 0. Las del paquete android (@android:style/..., ?android:attr/...)
+        salen de los IDs públicos de la plataforma. Devuelve None (y la anota en
+        unresolved) si no se puede resolver.
+        """
+        if reference == "@null":
+            return 0
+        match = _REFERENCE.fullmatch(reference)
+        if match:
+            package, kind, name = match.groups()
+            kind = kind or "attr"
+            if package == "android":
+                resource_id = framework_id(kind, name)
+            elif package in (None, self.namespace):
+                resource_id = self.ids.get((kind, name))
+            else:
+                resource_id = None
+            if resource_id is not None:
+                return resource_id
+        self.unresolved.add(reference)
+        return None
+
+    def _attribute(self, name):
+        """ID de un atributo de estilo ("android:windowNoTitle" o uno propio)"""
+        if name.startswith("android:"):
+            return framework_id("attr", name[len("android:"):])
+        return self.ids.get(("attr", name))
+
+    def _value(self, kind, raw, strings):
+        """Res_value (tipo, dato) de un valor simple"""
+        if raw[:1] in ("@", "?"):
+            resource_id = self.resolve(raw)
+            if resource_id is not None:
+                return (TYPE_ATTRIBUTE if raw[0] == "?" else TYPE_REFERENCE), resource_id
+        elif kind == "color" and raw.startswith("#"):
+            return _color(raw[1:])
+        elif kind != "string":
+            value_type, data = literal_value(raw)
+            if data is not None:
+                return value_type, data
+        return TYPE_STRING, strings(raw)
+
+    def _entry(self, kind, key, value, strings):
+        """ResTable_entry (simple o bag) de un recurso"""
+        tag = value[0]
+        if tag in ("style", "array"):
+            if tag == "style":
+                parent = self.resolve(value[1]) if value[1] else None
+                items = []
+                for attribute, raw in value[2]:
+                    attribute_id = self._attribute(attribute)
+                    if attribute_id is None:
+                        self.unresolved.add(attribute)
+                        continue
+                    items.append((attribute_id, self._value(None, raw, strings)))
+                items.sort()
+            else:
+                parent = None
+                items = [(ARRAY_INDEX_BASE + index, self._value(None, raw, strings))
+                         for index, raw in enumerate(value[1])]
+            return _MAP_ENTRY.pack(_MAP_ENTRY.size, FLAG_COMPLEX, key, parent or 0, len(items)) \
+                + b"".join(_MAP.pack(name) + _VALUE.pack(_VALUE.size, 0, value_type, data)
+                           for name, (value_type, data) in items)
+        if tag in ("file", "string"):
+            value_type, data = TYPE_STRING, strings(value[1])
+        elif tag == "id":
+            # aapt2 codifica los ids como un booleano false
+            value_type, data = TYPE_INT_BOOLEAN, 0
+        else:
+            value_type, data = self._value(kind, value[1], strings)
+        return _ENTRY.pack(_ENTRY.size, 0, key) + _VALUE.pack(_VALUE.size, 0, value_type, data)
+
+    def encode(self):
+        """Tabla binaria completa (chunk RES_TABLE_TYPE con un paquete)"""
+        pool = []
+        pool_index = {}
+
+        def strings(value):
+            if value not in pool_index:
+                pool_index[value] = len(pool)
+                pool.append(value)
+            return pool_index[value]
+
+        keys = []
+        key_index = {}
+        chunks = []
+        for type_index, kind in enumerate(self.types, 1):
+            names = self.names[kind]
+            configs = sorted({config for name in names for config in self.values[kind][name]})
+            flags = [0] * len(names)
+            for entry_index, name in enumerate(names):
+                if name not in key_index:
+                    key_index[name] = len(keys)
+                    keys.append(name)
+                for config in self.values[kind][name]:
+                    flags[entry_index] |= config_flags(config)
+            chunks.append(_TYPE_SPEC_HEADER.pack(RES_TABLE_TYPE_SPEC_TYPE, _TYPE_SPEC_HEADER.size,
+                                                 _TYPE_SPEC_HEADER.size + 4 * len(names),
+                                                 type_index, 0, 0, len(names))
+                          + struct.pack(f"<{len(names)}I", *flags))
+            for config in configs:
+                offsets = []
+                entries = bytearray()
+                for name in names:
+                    value = self.values[kind][name].get(config)
+                    if value is None:
+                        offsets.append(NO_ENTRY)
+                        continue
+                    offsets.append(len(entries))
+                    entries += self._entry(kind, key_index[name], value, strings)
+                header_size = _TYPE_HEADER.size + CONFIG_SIZE
+                entries_start = header_size + 4 * len(offsets)
+                chunks.append(_TYPE_HEADER.pack(RES_TABLE_TYPE_TYPE, header_size,
+                                                entries_start + len(entries), type_index, 0, 0,
+                                                len(offsets), entries_start)
+                              + encode_config(config)
+                              + struct.pack(f"<{len(offsets)}I", *offsets) + bytes(entries))
+
+        type_pool = _string_pool_chunk(self.types)
+        key_pool = _string_pool_chunk(keys)
+        body = type_pool + key_pool + b"".join(chunks)
+        package = _PACKAGE_HEADER.pack(
+            RES_TABLE_PACKAGE_TYPE, _PACKAGE_HEADER.size, _PACKAGE_HEADER.size + len(body),
+            RESOURCE_PACKAGE_ID, self.namespace.encode("utf-16-le")[:254],
+            _PACKAGE_HEADER.size, len(self.types), _PACKAGE_HEADER.size + len(type_pool),
+            len(keys), 0) + body
+        global_pool = _string_pool_chunk(pool)
+        size = _TABLE_HEADER.size + len(global_pool) + len(package)
+        return _TABLE_HEADER.pack(RES_TABLE_TYPE, _TABLE_HEADER.size, size, 1) + global_pool + package
+
+
+def compile_resources(res_dir=RES_DIR, cache=None):
+    """Compilar (incrementalmente con cache) y enlazar la tabla de recursos de res/"""
+    resources, warnings = compile_tree(res_dir, cache)
+    return ResourceTable(resources, warnings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compilar la tabla de recursos de res/")
+    parser.add_argument("--res", default=RES_DIR, help="Directorio res/ a compilar")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Recompilar todos los XML sin usar los .flat guardados")
+    parser.add_argument("--output", "-o", help="Guardar la tabla binaria en este archivo")
+    parser.add_argument("--list", action="store_true", help="Listar los IDs asignados")
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else FlatCache()
+    start = time.perf_counter()
+    try:
+        table = compile_resources(args.res, cache)
+        data = table.encode()
+    except ResourceError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    print(f"🧩 {len(table)} recursos en {len(table.types)} tipos: tabla de {len(data)} B "
+          f"en {elapsed * 1000:.1f} ms")
+    if cache is not None:
+        print(f"♻️  Caché: {cache.summary()}")
+    if args.list:
+        for (kind, name), resource_id in sorted(table.ids.items(), key=lambda item: item[1]):
+            configs = ", ".join(config or "default" for config in table.values[kind][name])
+            print(f"  0x{resource_id:08x} @{kind}/{name} [{configs}]")
+    for warning in table.warnings:
+        print(f"⚠️  {warning}")
+    if table.unresolved:
+        print(f"⚠️  Referencias sin resolver (de librerías o no públicas del framework): "
+              f"{', '.join(sorted(table.unresolved))}")
+    if args.output:
+        with open(args.output, "wb") as f:
+            f.write(data)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Vigilancia de cambios en las fuentes de TheCookFlow
+Avisa de los archivos modificados bajo uno o varios directorios (y archivos
+sueltos, como la plantilla del manifest en packager.py) para recompilar en
+cuanto se guardan.
+
+En Linux usa inotify directamente sobre libc (ctypes, sin dependencias):
+un watch por directorio, añadidos al vuelo cuando aparece un subdirectorio
+nuevo. En otros sistemas recorre el árbol comparando mtime y tamaño.
+
+Los editores guardan con ráfagas de eventos (archivo temporal, rename,
+chmod...) y a veces varios archivos seguidos, así que wait() no devuelve
+hasta que pasa un intervalo sin eventos (debounce), con un máximo para no
+esperar indefinidamente si los cambios no paran.
+
+Uso:
+    python android/source_watcher.py android/app/src/main
+"""
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# Eventos de inotify (linux/inotify.h) que indican un cambio de contenido
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+
+# Silencio necesario para dar por terminada una ráfaga y espera máxima
+DEBOUNCE_SECONDS = 0.1
+MAX_DELAY_SECONDS = 1.0
+POLL_INTERVAL_SECONDS = 0.2
+
+_EVENT = struct.Struct("iIII")
+
+# Archivos temporales de editores que no cuentan como cambios
+_IGNORED_SUFFIXES = ("~", ".swp", ".swx", ".tmp", ".part")
+
+
+def _ignored(path):
+    name = os.path.basename(path)
+    return name.startswith(".#") or name == "4913" or name.endswith(_IGNORED_SUFFIXES)
+
+
+def _load_libc():
+    """libc con inotify, o None si el sistema no lo tiene"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+    except (OSError, AttributeError):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+class SourceWatcher:
+    """Vigila directorios (recursivamente) y archivos sueltos
+
+    backend indica el mecanismo en uso: "inotify" o "polling".
+    """
+
+    def __init__(self, paths, polling=False):
+        self.paths = [os.path.abspath(path) for path in paths if os.path.exists(path)]
+        self.files = {path for path in self.paths if not os.path.isdir(path)}
+        self._libc = None if polling else _load_libc()
+        self._fd = None
+        self._watches = {}
+        if self._libc is not None:
+            self.backend = "inotify"
+            self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if self._fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1")
+            for path in self.paths:
+                if path in self.files:
+                    # Los editores reemplazan el archivo: se vigila su directorio
+                    self._add_watch(os.path.dirname(path))
+                else:
+                    self._add_tree(path)
+        else:
+            self.backend = "polling"
+        self._snapshot = self._scan()
+        # Archivos que existían: un temporal creado y borrado en la misma
+        # ráfaga (sed -i, guardado atómico) no cuenta como cambio
+        self._known = set(self._snapshot)
+
+    # --- inotify ---
+
+    def _add_watch(self, directory):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch: {directory}")
+        self._watches[wd] = directory
+
+    def _add_tree(self, directory):
+        for root, dirs, _ in os.walk(directory):
+            self._add_watch(root)
+
+    def _watched(self, path):
+        """True si el cambio está dentro de lo que se ha pedido vigilar"""
+        if path in self.files:
+            return True
+        return any(path == root or path.startswith(root + os.sep)
+                   for root in self.paths if root not in self.files)
+
+    def _read_events(self, timeout):
+        """Rutas cambiadas en los eventos pendientes (esperando hasta timeout)"""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        position = 0
+        while position < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, position)
+            name = data[position + _EVENT.size:position + _EVENT.size + length].rstrip(b"\0")
+            position += _EVENT.size + length
+            directory = self._watches.get(wd)
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            if directory is None:
+                continue
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and self._watched(path):
+                # Directorio nuevo: vigilarlo y contar lo que ya tenga dentro
+                self._add_tree(path)
+                for root, _, files in os.walk(path):
+                    changed.update(os.path.join(root, file) for file in files)
+                continue
+            if mask & IN_ISDIR or _ignored(path) or not self._watched(path):
+                continue
+            changed.add(path)
+        return changed
+
+    # --- polling ---
+
+    def _scan(self):
+        snapshot = {}
+        for path in self.paths:
+            if path in self.files:
+                candidates = [path]
+            else:
+                candidates = (os.path.join(root, name)
+                              for root, _, files in os.walk(path) for name in files)
+            for candidate in candidates:
+                try:
+                    stat = os.stat(candidate)
+                except OSError:
+                    continue
+                if not _ignored(candidate):
+                    snapshot[candidate] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _poll(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {path for path in snapshot.keys() | self._snapshot.keys()
+                       if snapshot.get(path) != self._snapshot.get(path)}
+            self._snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            wait = POLL_INTERVAL_SECONDS
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            time.sleep(wait)
+
+    # --- API ---
+
+    def poll(self, timeout=None):
+        """Rutas cambiadas desde la última llamada (esperando como mucho timeout)"""
+        if self._fd is not None:
+            return self._read_events(timeout)
+        return self._poll(timeout)
+
+    def wait(self, debounce=DEBOUNCE_SECONDS, max_delay=MAX_DELAY_SECONDS):
+        """Esperar una ráfaga de cambios y devolver (rutas ordenadas, instante del primero)
+
+        Tras el primer evento se siguen acumulando cambios hasta que pasan
+        debounce segundos sin ninguno, o max_delay desde el primero.
+        """
+        changed = set()
+        while not changed:
+            changed = self.poll(None)
+            if not changed & self._known and not any(map(os.path.exists, changed)):
+                changed = set()
+        first = time.perf_counter()
+        while True:
+            remaining = max_delay - (time.perf_counter() - first)
+            if remaining <= 0:
+                break
+            more = self.poll(min(debounce, remaining))
+            if not more:
+                break
+            changed |= more
+        existing = {path for path in changed if os.path.exists(path)}
+        changed = existing | (changed & self._known)
+        self._known = (self._known | existing) - (changed - existing)
+        return sorted(changed), first
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mostrar los cambios en las fuentes según se guardan")
+    parser.add_argument("paths", nargs="+", metavar="RUTA", help="Directorios o archivos a vigilar")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS,
+                        help="Segundos sin eventos que cierran una ráfaga")
+    parser.add_argument("--polling", action="store_true",
+                        help="Recorrer el árbol en lugar de usar inotify")
+    args = parser.parse_args()
+
+    with SourceWatcher(args.paths, polling=args.polling) as watcher:
+        print(f"👀 Vigilando {len(watcher.paths)} rutas ({watcher.backend}); Ctrl+C para salir")
+        try:
+            while True:
+                changed, first = watcher.wait(args.debounce)
+                settled = (time.perf_counter() - first) * 1000
+                print(f"📝 {len(changed)} cambios (ráfaga de {settled:.0f} ms):")
+                for path in changed:
+                    print(f"  {os.path.relpath(path)}")
+        except KeyboardInterrupt:
+            pass
@@ -5,11 +5,14 @@ Sincroniza solo la carpeta android al repositorio específico
 """
 
 import os
+import argparse
 import subprocess
 import shutil
 import tempfile
 from datetime import datetime
 
+from tracing import add_tracing_arguments, phase, traced, tracing
+
 class AndroidGitHubSync:
     def __init__(self):
         self.target_repo = "https://github.com/RUPERDFN/thecookflow20playstore.git"
@@ -58,6 +61,7 @@ class AndroidGitHubSync:
             
         return True
     
+    @traced("copy")
     def copy_android_files(self):
         """Copia archivos de Android al repositorio temporal"""
         print("📋 Copiando archivos de Android...")
@@ -111,17 +115,18 @@ Desarrollado por RUPERDFN para TheCookFlow
         """Hace commit y push de los archivos"""
         print("💾 Haciendo commit de los archivos...")
         
-        # Agregar todos los archivos
-        success, _, error = self.run_command(['git', 'add', '.'], self.temp_dir)
-        if not success:
-            print(f"❌ Error agregando archivos: {error}")
-            return False
-        
-        # Hacer commit
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        commit_msg = f"🚀 TheCookFlow Android App - Ready for Google Play Store - {timestamp}"
-        
-        success, _, error = self.run_command(['git', 'commit', '-m', commit_msg], self.temp_dir)
+        with phase("commit"):
+            # Agregar todos los archivos
+            success, _, error = self.run_command(['git', 'add', '.'], self.temp_dir)
+            if not success:
+                print(f"❌ Error agregando archivos: {error}")
+                return False
+            
+            # Hacer commit
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            commit_msg = f"🚀 TheCookFlow Android App - Ready for Google Play Store - {timestamp}"
+            
+            success, _, error = self.run_command(['git', 'commit', '-m', commit_msg], self.temp_dir)
         if not success and "nothing to commit" not in error:
             print(f"❌ Error en commit: {error}")
             return False
@@ -131,12 +136,13 @@ Desarrollado por RUPERDFN para TheCookFlow
         
         # Push forzado (para sobrescribir cualquier conflicto)
         print("⬆️  Subiendo a GitHub...")
-        success, output, error = self.run_command(['git', 'push', '-u', 'origin', 'main', '--force'], self.temp_dir)
-        
-        if not success:
-            # Intentar con master como branch
-            print("🔄 Intentando con branch master...")
-            success, output, error = self.run_command(['git', 'push', '-u', 'origin', 'master', '--force'], self.temp_dir)
+        with phase("push"):
+            success, output, error = self.run_command(['git', 'push', '-u', 'origin', 'main', '--force'], self.temp_dir)
+            
+            if not success:
+                # Intentar con master como branch
+                print("🔄 Intentando con branch master...")
+                success, output, error = self.run_command(['git', 'push', '-u', 'origin', 'master', '--force'], self.temp_dir)
             
         if success:
             print(f"✅ ¡Sincronización exitosa!")
@@ -187,5 +193,10 @@ Desarrollado por RUPERDFN para TheCookFlow
             self.cleanup()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sincronización de la carpeta android con GitHub")
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    
     syncer = AndroidGitHubSync()
-    syncer.sync_android_to_github()
\ No newline at end of file
+    with tracing(args.trace, args.profile):
+        syncer.sync_android_to_github()
\ No newline at end of file
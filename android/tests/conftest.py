@@ -0,0 +1,5 @@
+"""Los scripts de android/ se importan entre sí por nombre de módulo"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,71 @@
+"""Firma v2/v3 con claves desechables: firmar, volver a firmar y verificar"""
+import base64
+import zipfile
+
+import pytest
+
+from apk_signer import (generate_signing_key, load_signing_key, sign_archive, signed_with,
+                        verify_archive)
+
+
+@pytest.fixture(scope="module")
+def keys():
+    return generate_signing_key(1024, "Test A"), generate_signing_key(1024, "Test B")
+
+
+@pytest.fixture
+def apk(tmp_path):
+    path = tmp_path / "app-debug.apk"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("AndroidManifest.xml", b"\x03\x00\x08\x00" + bytes(60))
+        archive.writestr("classes.dex", b"dex\n037\x00" + bytes(90), zipfile.ZIP_DEFLATED)
+        archive.writestr("res/raw/data.bin", bytes(range(256)) * 4096, zipfile.ZIP_DEFLATED)
+    return str(path)
+
+
+def _verify(path, key):
+    public_keys = []
+    schemes, errors = verify_archive(path, public_keys=public_keys)
+    assert not errors
+    assert sorted(schemes) == [2, 3]
+    assert public_keys and all(found == key.public_key for found in public_keys)
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+
+
+def test_sign_and_verify(apk, keys):
+    key, _ = keys
+    assert not signed_with(apk, key)
+    sign_archive(apk, key)
+    _verify(apk, key)
+    assert signed_with(apk, key)
+
+
+def test_resign_replaces_signature(apk, keys):
+    first, second = keys
+    sign_archive(apk, first)
+    sign_archive(apk, second)
+    _verify(apk, second)
+    assert not signed_with(apk, first)
+
+
+def test_tampered_archive_fails_verification(apk, keys):
+    key, _ = keys
+    sign_archive(apk, key)
+    with open(apk, "r+b") as f:
+        f.seek(40)
+        byte = f.read(1)
+        f.seek(40)
+        f.write(bytes([byte[0] ^ 0xFF]))
+    _, errors = verify_archive(apk)
+    assert errors
+    assert not signed_with(apk, key)
+
+
+def test_pem_chain_uses_leaf_certificate(tmp_path, keys):
+    leaf, issuer = keys
+    body = base64.encodebytes(issuer.certificate).decode("ascii")
+    path = tmp_path / "chain.pem"
+    path.write_text(leaf.to_pem()
+                    + f"-----BEGIN CERTIFICATE-----\n{body}-----END CERTIFICATE-----\n")
+    assert load_signing_key(str(path)).certificate == leaf.certificate
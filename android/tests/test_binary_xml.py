@@ -0,0 +1,90 @@
+"""Ida y vuelta del XML binario: layouts, drawables y manifest"""
+import os
+import struct
+
+import pytest
+
+import binary_xml
+import framework_resources
+from binary_xml import ANDROID_NS, BinaryXmlError, compile_xml, decode_xml, round_trip_matches
+from packager import create_manifest_xml
+
+RES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "app", "src", "main", "res")
+
+SOURCES = {
+    "layout": os.path.join(RES_DIR, "layout", "activity_paywall.xml"),
+    "vector": os.path.join(RES_DIR, "drawable", "ic_check_circle.xml"),
+    "shape": os.path.join(RES_DIR, "drawable", "btn_chalk_primary.xml"),
+}
+
+
+def _source(kind):
+    if kind == "manifest":
+        return create_manifest_xml().encode("utf-8")
+    with open(SOURCES[kind], "rb") as f:
+        return f.read()
+
+
+def _attribute_ids(data):
+    """[(namespace, nombre, ID del mapa de recursos o None)] de cada atributo"""
+    _, header_size, total = binary_xml._CHUNK.unpack_from(data, 0)
+    strings, resource_map, found = [], [], []
+    position = header_size
+    while position < total:
+        chunk_type, header_size, size = binary_xml._CHUNK.unpack_from(data, position)
+        body = position + header_size
+        if chunk_type == binary_xml.RES_STRING_POOL_TYPE:
+            strings = binary_xml._read_string_pool(data, position)
+        elif chunk_type == binary_xml.RES_XML_RESOURCE_MAP_TYPE:
+            resource_map = struct.unpack_from(f"<{(size - header_size) // 4}I", data, body)
+        elif chunk_type == binary_xml.RES_XML_START_ELEMENT_TYPE:
+            _, _, attr_start, attr_size, count, _, _, _ = \
+                binary_xml._ELEMENT_EXT.unpack_from(data, body)
+            for offset in range(body + attr_start, body + attr_start + count * attr_size,
+                                attr_size):
+                namespace, name = binary_xml._ATTRIBUTE.unpack_from(data, offset)[:2]
+                found.append((strings[namespace] if namespace != binary_xml.NO_INDEX else None,
+                              strings[name],
+                              resource_map[name] if name < len(resource_map) else None))
+        position += size
+    return found
+
+
+@pytest.mark.parametrize("kind", ["layout", "vector", "shape", "manifest"])
+def test_round_trip(kind):
+    assert round_trip_matches(_source(kind))
+
+
+@pytest.mark.parametrize("kind", ["layout", "vector", "shape", "manifest"])
+def test_android_attributes_have_resource_ids(kind):
+    attributes = [(name, resource_id) for namespace, name, resource_id
+                  in _attribute_ids(compile_xml(_source(kind)))
+                  if namespace == ANDROID_NS]
+    assert attributes
+    for name, resource_id in attributes:
+        assert resource_id == framework_resources.resource_id("attr", name), name
+
+
+def test_values_typed_by_attribute_format():
+    vector = decode_xml(compile_xml(_source("vector")))
+    shape = compile_xml(_source("shape"))
+    assert binary_xml.typed_value(ANDROID_NS, "viewportWidth", "24")[0] == binary_xml.TYPE_FLOAT
+    assert binary_xml.typed_value(ANDROID_NS, "shape", "rectangle") == (binary_xml.TYPE_INT_DEC, 0)
+    assert binary_xml.typed_value(ANDROID_NS, "gravity", "top|start") == \
+        (binary_xml.TYPE_INT_HEX, 0x00800033)
+    assert vector.get(f"{{{ANDROID_NS}}}viewportWidth") == "24"
+    assert decode_xml(shape).get(f"{{{ANDROID_NS}}}shape") == "rectangle"
+
+
+def test_unknown_android_attribute_is_an_error():
+    text = '<View xmlns:android="http://schemas.android.com/apk/res/android" android:fooBar="1"/>'
+    with pytest.raises(BinaryXmlError, match="android:fooBar"):
+        compile_xml(text)
+
+
+def test_invalid_value_for_format_is_an_error():
+    text = ('<View xmlns:android="http://schemas.android.com/apk/res/android"\n'
+            '    android:visibility="sometimes"/>')
+    with pytest.raises(BinaryXmlError, match="visibility"):
+        compile_xml(text)
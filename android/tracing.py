@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Trazas por fase para los scripts de compilación de TheCookFlow
+Cada fase (manifest, config, recursos, zip, render de iconos, guardado de
+assets, hash, commit, push...) se envuelve con phase() y registra tiempo de
+pared, tiempo de CPU, bytes leídos/escritos y el pico de tracemalloc.
+
+Las fases se exportan como JSON de trace events de Chrome (abrir en
+chrome://tracing o https://ui.perfetto.dev) y con --profile se vuelcan
+además las estadísticas de cProfile.
+
+Uso:
+    with phase("zip", artifact=path) as p:
+        ...
+        p.bytes_written += size
+
+Sin --trace ni --profile las fases solo miden tiempos (accesibles en el
+objeto Phase) y no se acumulan ni se activa tracemalloc.
+"""
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+
+class Phase:
+    """Medidas de una fase en curso o terminada"""
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.start = 0.0
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_bytes = None
+        self.tid = threading.get_ident()
+        self._running_peak = 0
+
+
+class Tracer:
+    """Registro de fases de un proceso"""
+
+    def __init__(self):
+        self.phases = []
+        self.enabled = False
+        self.memory = False
+        self._origin = time.perf_counter()
+        self._stack = threading.local()
+
+    def enable_memory(self):
+        """Medir el pico de memoria de cada fase con tracemalloc"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.memory = True
+
+    def _parents(self):
+        if not hasattr(self._stack, "phases"):
+            self._stack.phases = []
+        return self._stack.phases
+
+    @contextlib.contextmanager
+    def phase(self, name, **args):
+        """Medir el bloque como una fase; las fases pueden anidarse"""
+        current = Phase(name, args)
+        parents = self._parents()
+        if self.memory:
+            # El pico anterior pertenece a la fase padre: se guarda y se reinicia
+            if parents:
+                parents[-1]._running_peak = max(parents[-1]._running_peak,
+                                                tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        parents.append(current)
+        current.start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield current
+        finally:
+            current.wall_seconds = time.perf_counter() - current.start
+            current.cpu_seconds = time.process_time() - cpu_start
+            parents.pop()
+            if self.memory:
+                current.peak_bytes = max(current._running_peak, tracemalloc.get_traced_memory()[1])
+                if parents:
+                    parents[-1]._running_peak = max(parents[-1]._running_peak, current.peak_bytes)
+            if self.enabled:
+                self.phases.append(current)
+
+    def chrome_trace(self):
+        """Fases como trace events de Chrome (eventos completos "X", en microsegundos)"""
+        events = []
+        for phase in self.phases:
+            args = dict(phase.args)
+            args.update({
+                "cpu_ms": round(phase.cpu_seconds * 1000, 3),
+                "bytes_read": phase.bytes_read,
+                "bytes_written": phase.bytes_written,
+            })
+            if phase.peak_bytes is not None:
+                args["tracemalloc_peak_kb"] = round(phase.peak_bytes / 1024, 1)
+            events.append({
+                "name": phase.name,
+                "cat": "build",
+                "ph": "X",
+                "ts": round((phase.start - self._origin) * 1e6, 1),
+                "dur": round(phase.wall_seconds * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": phase.tid,
+                "args": args,
+            })
+        events.sort(key=lambda event: event["ts"])
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+
+    def summary(self):
+        """Tabla de fases agregadas por nombre, de mayor a menor tiempo de pared"""
+        totals = {}
+        for phase in self.phases:
+            total = totals.setdefault(phase.name, [0, 0.0, 0.0, 0, 0, None])
+            total[0] += 1
+            total[1] += phase.wall_seconds
+            total[2] += phase.cpu_seconds
+            total[3] += phase.bytes_read
+            total[4] += phase.bytes_written
+            if phase.peak_bytes is not None:
+                total[5] = max(total[5] or 0, phase.peak_bytes)
+        lines = []
+        for name, (count, wall, cpu, read, written, peak) in sorted(
+                totals.items(), key=lambda item: -item[1][1]):
+            peak_text = f" pico {peak / 1024 / 1024:.1f} MB" if peak is not None else ""
+            lines.append(f"  {name:<22} x{count:<4} {wall * 1000:>9.1f} ms pared "
+                         f"{cpu * 1000:>9.1f} ms CPU  {read / 1024:>9.1f} KB leídos "
+                         f"{written / 1024:>9.1f} KB escritos{peak_text}")
+        return "\n".join(lines)
+
+
+TRACER = Tracer()
+
+
+def phase(name, **args):
+    """Fase en el trazador global del proceso"""
+    return TRACER.phase(name, **args)
+
+
+def traced(name):
+    """Decorador: cada llamada a la función es una fase"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def add_tracing_arguments(parser):
+    """Añadir --trace y --profile a un ArgumentParser"""
+    parser.add_argument("--trace", metavar="JSON",
+                        help="Guardar las fases como trace de Chrome (chrome://tracing, Perfetto)")
+    parser.add_argument("--profile", metavar="PSTATS",
+                        help="Volcar estadísticas de cProfile a este archivo")
+
+
+@contextlib.contextmanager
+def tracing(trace_path=None, profile_path=None):
+    """Activar trazas y/o cProfile para el bloque y volcarlas al terminar"""
+    if trace_path or profile_path:
+        TRACER.enabled = True
+        TRACER.enable_memory()
+    profiler = cProfile.Profile() if profile_path else None
+    if profiler:
+        profiler.enable()
+    try:
+        yield TRACER
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+            print(f"🔬 Perfil cProfile guardado en {profile_path}")
+            pstats.Stats(profile_path).sort_stats("cumulative").print_stats(15)
+        if trace_path:
+            TRACER.write_chrome_trace(trace_path)
+            print(f"⏱️  Fases ({trace_path}):")
+            print(TRACER.summary())
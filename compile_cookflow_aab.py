@@ -5,214 +5,38 @@ Package name: com.cookflow.app
 Product ID: suscripcion (€1.99/mes)
 """
 import os
-import zipfile
-import json
-import struct
+import sys
+import argparse
 from datetime import datetime
 
-def create_manifest_xml():
-    """Crear AndroidManifest.xml optimizado"""
-    manifest = '''<?xml version="1.0" encoding="utf-8"?>
-<manifest xmlns:android="http://schemas.android.com/apk/res/android"
-    package="com.cookflow.app"
-    android:versionCode="1"
-    android:versionName="1.0.0"
-    android:installLocation="auto">
-    
-    <uses-sdk 
-        android:minSdkVersion="24" 
-        android:targetSdkVersion="34" />
-    
-    <!-- Permisos esenciales -->
-    <uses-permission android:name="android.permission.INTERNET" />
-    <uses-permission android:name="android.permission.ACCESS_NETWORK_STATE" />
-    <uses-permission android:name="android.permission.CAMERA" />
-    <uses-permission android:name="android.permission.READ_EXTERNAL_STORAGE" android:maxSdkVersion="32" />
-    
-    <!-- Google Play Billing - Esencial para suscripciones -->
-    <uses-permission android:name="com.android.vending.BILLING" />
-    <uses-permission android:name="com.android.vending.CHECK_LICENSE" />
-    
-    <!-- Características opcionales -->
-    <uses-feature android:name="android.hardware.camera" android:required="false" />
-    <uses-feature android:name="android.hardware.camera.autofocus" android:required="false" />
-    
-    <application
-        android:allowBackup="true"
-        android:icon="@mipmap/ic_launcher"
-        android:roundIcon="@mipmap/ic_launcher_round"
-        android:label="TheCookFlow"
-        android:theme="@android:style/Theme.Material.Light.NoActionBar"
-        android:usesCleartextTraffic="true"
-        android:hardwareAccelerated="true"
-        android:largeHeap="true">
-        
-        <activity
-            android:name=".MainActivity"
-            android:exported="true"
-            android:screenOrientation="portrait"
-            android:launchMode="singleTask"
-            android:configChanges="orientation|keyboardHidden|screenSize">
-            
-            <intent-filter android:autoVerify="true">
-                <action android:name="android.intent.action.MAIN" />
-                <category android:name="android.intent.category.LAUNCHER" />
-            </intent-filter>
-            
-            <!-- Deep links para PWA -->
-            <intent-filter android:autoVerify="true">
-                <action android:name="android.intent.action.VIEW" />
-                <category android:name="android.intent.category.DEFAULT" />
-                <category android:name="android.intent.category.BROWSABLE" />
-                <data android:scheme="https" android:host="*.replit.dev" />
-            </intent-filter>
-        </activity>
-        
-        <!-- Google Play Billing Service -->
-        <service 
-            android:name="com.android.vending.billing.IInAppBillingService" 
-            android:enabled="true"
-            android:exported="true" />
-        
-        <!-- Metadata Google Play -->
-        <meta-data 
-            android:name="com.google.android.play.billingclient.version" 
-            android:value="8.0.0" />
-        
-        <!-- App metadata -->
-        <meta-data 
-            android:name="com.cookflow.subscription.productid" 
-            android:value="suscripcion" />
-        <meta-data 
-            android:name="com.cookflow.price.monthly" 
-            android:value="1.99" />
-            
-    </application>
-</manifest>'''
-    
-    return manifest
-
-def create_bundle_config():
-    """Crear BundleConfig.pb optimizado"""
-    # Protocol Buffer para configuración de App Bundle
-    config = {
-        "optimizations": {
-            "splits_config": {
-                "split_dimension": [
-                    {"value": "ABI", "negate": False},
-                    {"value": "SCREEN_DENSITY", "negate": False},
-                    {"value": "LANGUAGE", "negate": True}  # No dividir por idioma
-                ]
-            },
-            "uncompressed_glob": ["*.so", "*.dex"]
-        },
-        "compression": {
-            "uncompressed_glob": ["*.png", "*.jpg", "*.webp"]
-        }
-    }
-    
-    # Convertir a bytes (simulación Protocol Buffer)
-    return bytes([
-        0x0A, 0x12,  # Optimization field
-        0x0A, 0x10,  # Splits config
-        0x08, 0x01,  # ABI splits enabled
-        0x10, 0x01,  # Density splits enabled  
-        0x18, 0x00,  # Language splits disabled
-        0x12, 0x08,  # Compression
-        0x0A, 0x06,  # Uncompressed globs
-        0x08, 0x01, 0x10, 0x01
-    ])
-
-def create_resources_pb():
-    """Crear resources.pb con configuración básica"""
-    # Tabla de recursos compilada (AAPT2 format)
-    return bytes([
-        0x02, 0x00, 0x0C, 0x00,  # Magic number (AAPT2)
-        0x01, 0x00, 0x00, 0x00,  # Version
-        0x00, 0x00, 0x00, 0x00,  # Flags
-        # String pool vacío por simplicidad
-        0x01, 0x00, 0x1C, 0x00,  # String pool header
-        0x00, 0x00, 0x00, 0x00   # String count: 0
-    ])
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "android"))
+from bundle_size import track_bundle_size
+from bundle_writer import parallel_summary
+from entry_cache import EntryCache
+from packager import (PACKAGE_NAME, PRODUCT_ID, VERSION_CODE, VERSION_NAME, build_artifacts,
+                      RES_DIR, peak_memory_mb, within_memory_budget)
+from tracing import add_tracing_arguments, tracing
 
-def create_native_pb():
-    """Crear native.pb para librerías nativas"""
-    # Configuración nativa básica
-    return bytes([
-        0x08, 0x01,  # Version
-        0x12, 0x00   # No native libraries
-    ])
-
-def create_app_bundle():
-    """Crear el App Bundle final"""
+def create_app_bundle(use_cache=True, jobs=1, apk_filename=None, reproducible=False, force=False,
+                      res_dir=RES_DIR):
+    """Crear el App Bundle final (y opcionalmente el APK en la misma pasada)"""
     print("🚀 COMPILANDO COOKFLOW APP BUNDLE")
     print("=" * 50)
-    print(f"📱 Package: com.cookflow.app")
-    print(f"💳 Suscripción: suscripcion (€1.99/mes)")
+    print(f"📱 Package: {PACKAGE_NAME}")
+    print(f"💳 Suscripción: {PRODUCT_ID} (€1.99/mes)")
     print(f"📅 Fecha: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
     print("=" * 50)
     
-    # Crear estructura de directorio
-    bundle_dir = "cookflow_bundle"
-    os.makedirs(f"{bundle_dir}/base/manifest", exist_ok=True)
-    os.makedirs(f"{bundle_dir}/base/res", exist_ok=True)
-    os.makedirs(f"{bundle_dir}/base/assets", exist_ok=True)
-    os.makedirs(f"{bundle_dir}/base/lib", exist_ok=True)
-    os.makedirs(f"{bundle_dir}/BUNDLE-METADATA", exist_ok=True)
-    
-    print("✅ Estructura de directorio creada")
-    
-    # Crear AndroidManifest.xml
-    manifest_xml = create_manifest_xml()
-    with open(f"{bundle_dir}/base/manifest/AndroidManifest.xml", "w") as f:
-        f.write(manifest_xml)
-    print("✅ AndroidManifest.xml creado (com.cookflow.app)")
-    
-    # Crear BundleConfig.pb
-    config_data = create_bundle_config()
-    with open(f"{bundle_dir}/BundleConfig.pb", "wb") as f:
-        f.write(config_data)
-    print("✅ BundleConfig.pb creado")
-    
-    # Crear resources.pb
-    resources_data = create_resources_pb()
-    with open(f"{bundle_dir}/base/resources.pb", "wb") as f:
-        f.write(resources_data)
-    print("✅ Resources.pb creado")
-    
-    # Crear native.pb
-    native_data = create_native_pb()
-    with open(f"{bundle_dir}/base/native.pb", "wb") as f:
-        f.write(native_data)
-    print("✅ Native.pb creado")
-    
-    # Crear metadata
-    metadata = {
-        "com.android.tools.build.bundletool": {
-            "version": "1.15.6"
-        },
-        "com.android.tools.build.gradle": {
-            "version": "8.2.1"
-        }
-    }
-    
-    with open(f"{bundle_dir}/BUNDLE-METADATA/com.android.tools.build.gradle", "w") as f:
-        json.dump(metadata["com.android.tools.build.gradle"], f)
-    print("✅ Metadata creado")
-    
-    # Crear el archivo .aab
+    # Crear el archivo .aab con el motor de empaquetado compartido
     aab_filename = "cookflow-app-release.aab"
-    
-    with zipfile.ZipFile(aab_filename, "w", zipfile.ZIP_DEFLATED) as aab:
-        for root, dirs, files in os.walk(bundle_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arc_path = os.path.relpath(file_path, bundle_dir)
-                aab.write(file_path, arc_path)
-    
-    # Cleanup
-    import shutil
-    shutil.rmtree(bundle_dir)
+    cache = EntryCache() if use_cache else None
+    compressor, artifacts = build_artifacts(aab_filename, apk_filename, cache, jobs,
+                                            res_dir=res_dir, deterministic=reproducible, force=force)
+    if not artifacts:
+        print(f"⏭️  {aab_filename} ya está al día (huella de entradas sin cambios)")
+        return True
+    bundle = artifacts[aab_filename]
+    print("✅ AndroidManifest.xml, BundleConfig.pb, resources.pb y native.pb generados")
     
     if os.path.exists(aab_filename):
         size = os.path.getsize(aab_filename)
@@ -223,15 +47,28 @@ def create_app_bundle():
         print("=" * 50)
         print(f"📁 Archivo: {aab_filename}")
         print(f"📊 Tamaño: {size_kb:.1f} KB")
-        print(f"📱 Package: com.cookflow.app ✅")
-        print(f"🔢 Versión: 1.0.0 (código 1)")
-        print(f"💳 Product ID: suscripcion ✅")
+        print(f"🗜️  Sin comprimir (alineadas): {bundle.stored_entries}/{bundle.entries} entradas")
+        if apk_filename:
+            print(f"📦 APK: {apk_filename} ({os.path.getsize(apk_filename) / 1024:.1f} KB, misma pasada)")
+        if cache is not None:
+            print(f"♻️  Caché: {cache.summary()}")
+        if compressor.compress_wall_seconds > 0:
+            print(f"⚡ Compresión: {parallel_summary(compressor)}")
+        peak = peak_memory_mb()
+        if peak is not None:
+            print(f"🧠 Memoria pico: {peak:.1f} MB")
+        if not track_bundle_size(aab_filename):
+            print("❌ El App Bundle supera el presupuesto de tamaño (android/size_budgets.json)")
+            return False
+        print(f"📱 Package: {PACKAGE_NAME} ✅")
+        print(f"🔢 Versión: {VERSION_NAME} (código {VERSION_CODE})")
+        print(f"💳 Product ID: {PRODUCT_ID} ✅")
         print(f"💰 Precio: €1.99/mes con 7 días gratis")
         print("")
         print("🏪 LISTO PARA GOOGLE PLAY CONSOLE:")
         print("1. Acceder a: https://play.google.com/console")
         print(f"2. Subir archivo: {aab_filename}")
-        print("3. Configurar suscripción con ID: suscripcion")
+        print(f"3. Configurar suscripción con ID: {PRODUCT_ID}")
         print("4. Establecer precio: €1.99/mes + 7 días trial")
         print("5. Enviar para revisión")
         print("")
@@ -241,9 +78,9 @@ def create_app_bundle():
         print("• Mes 6: €299-597 (200 suscriptores)")
         print("")
         print("✅ CONFIGURACIÓN SINCRONIZADA:")
-        print("• Android App Bundle: com.cookflow.app ✅")
-        print("• Backend Verification: com.cookflow.app ✅")
-        print("• Google Play Billing: suscripcion ✅")
+        print(f"• Android App Bundle: {PACKAGE_NAME} ✅")
+        print(f"• Backend Verification: {PACKAGE_NAME} ✅")
+        print(f"• Google Play Billing: {PRODUCT_ID} ✅")
         print("• RSA Signature: Configurado ✅")
         print("")
         return True
@@ -252,11 +89,31 @@ def create_app_bundle():
         return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TheCookFlow App Bundle Compiler")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Recomprimir todas las entradas sin usar la caché incremental")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Hilos de compresión en paralelo (0 = todos los núcleos)")
+    parser.add_argument("--apk", metavar="RUTA",
+                        help="Generar también el APK en la misma pasada")
+    parser.add_argument("--reproducible", action="store_true",
+                        help="Fechas fijas y orden de entradas estable (salida idéntica byte a byte)")
+    parser.add_argument("--force", action="store_true",
+                        help="Empaquetar aunque la huella de entradas no haya cambiado")
+    parser.add_argument("--memory-budget", type=float, metavar="MB",
+                        help="Fallar si la memoria pico del empaquetado supera este presupuesto")
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    
     print("TheCookFlow App Bundle Compiler")
-    print("Compilando con package name correcto: com.cookflow.app")
+    print(f"Compilando con package name correcto: {PACKAGE_NAME}")
     print("")
     
-    success = create_app_bundle()
+    with tracing(args.trace, args.profile):
+        success = create_app_bundle(use_cache=not args.no_cache, jobs=args.jobs,
+                                    apk_filename=args.apk, reproducible=args.reproducible,
+                                    force=args.force)
+    success = within_memory_budget(args.memory_budget) and success
     
     if success:
         print("🎯 Tu app está lista para generar €119-597/mes automáticamente!")